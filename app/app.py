@@ -1,5 +1,10 @@
 import os
 import json
+from startup import StartupTimer, get_secret_cache
+
+# Created before the heavyweight imports below so they are included in the timing
+startup_timer = StartupTimer()
+
 import identity.web
 import msal
 from redis import Redis
@@ -18,14 +23,15 @@ from redis_entraid.cred_provider import (
 )
 from urllib.parse import urlparse
 import secrets
+import socket
 import requests
 from flask import Flask, render_template, request, redirect, url_for, session
 from flask_session import Session
 from flask_wtf.csrf import CSRFProtect
-from recommendation_engine import RecommendationEngine
 from tab import Tab
 from priority import Priority
 from context_processors import inject_current_date
+from todo_io import CONTENT_TYPES, FORMATS, detect_format, iter_export, iter_import_rows
 from utils import (
     validate_todo_name,
     validate_priority,
@@ -33,18 +39,34 @@ from utils import (
     validate_notes,
     validate_todo_id,
     sanitize_string,
+    tokens_match,
 )
 from azure.identity import DefaultAzureCredential
 from azure.identity import ManagedIdentityCredential
 from azure.core.credentials import TokenCredential
-from azure.keyvault.secrets import SecretClient
-from azure.monitor.opentelemetry import configure_azure_monitor
-from opentelemetry import trace
+from opentelemetry import trace, metrics
 from logging import INFO, getLogger
 import logging
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 from datetime import datetime
-from flask import send_from_directory
+from flask import send_from_directory, jsonify, abort, Response, g, make_response, stream_with_context
+from markupsafe import Markup
+from functools import wraps
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import io
+import hashlib
+import time
+from diagnostics.profiler import SamplingProfiler, ProfilerMiddleware
+from diagnostics.memory import MemoryDiagnostics
+from health import HealthMonitor
+from reminders import REMINDER_FIELDS, Change, QueueSink, ReminderScheduler, WebhookSink, cancel_change, track_change
+from services.api_client import TODO_FIELD_SETS, TODO_ID_ORDER, Deferred, GraphQLClient, missing_fields, todo_fields
+from services.search import TodoSearchIndex
+from services.views import GroupedView, priority_rank, todo_group
+import threading
+
+startup_timer.mark("imports")
 
 if os.environ.get("IS_LOCALHOST", "false").lower() == "true":
     try:  # optional dependency for local dev convenience
@@ -85,7 +107,15 @@ else:
     else:
         managed_identity_credential = ManagedIdentityCredential()
 
-configure_azure_monitor(logger_name="my_todoapp_logger",connection_string=app_insights_connection_string,credential=managed_identity_credential)
+def _configure_telemetry():
+    # azure.monitor.opentelemetry pulls in every instrumentation package, so it is
+    # imported and configured on a background thread while secrets are resolved.
+    with startup_timer.track("azure_monitor"):
+        from azure.monitor.opentelemetry import configure_azure_monitor
+        configure_azure_monitor(logger_name="my_todoapp_logger",connection_string=app_insights_connection_string,credential=managed_identity_credential)
+
+_telemetry_thread = threading.Thread(target=_configure_telemetry, name="configure-azure-monitor", daemon=True)
+_telemetry_thread.start()
 tracer = trace.get_tracer(__name__)
 
 class SpanLogger:
@@ -205,19 +235,35 @@ try:
 except Exception:
     pass
 
-client = None
+startup_timer.mark("config")
+
+redirect_uri = os.environ.get("REDIRECT_URI")
 if AZURE_CLIENT_ID:
     logger.info('Using Managed Identity to access Key Vault')
-    key_vault_uri = f"https://{key_vault_name}.vault.azure.net"
-    client = SecretClient(vault_url=key_vault_uri, credential=managed_identity_credential)
-    AUTHORITY=client.get_secret("AUTHORITY").value
-    CLIENTID=client.get_secret("CLIENTID").value;
-    CLIENTSECRET=client.get_secret("CLIENTSECRET").value;
+    # Resolve all startup secrets concurrently with one shared client; values are
+    # cached for the process so later lookups (e.g. RecommendationEngine) are free.
+    _secret_names = ["AUTHORITY", "CLIENTID", "CLIENTSECRET"]
+    if not redirect_uri:
+        logger.info('Using Key Vault for REDIRECT-URI')
+        _secret_names.append("REDIRECT-URI")
+    secret_cache = get_secret_cache(
+        cast(str, key_vault_name),
+        managed_identity_credential,
+        timeout=float(os.environ.get("KEY_VAULT_TIMEOUT_SECONDS", "10")),
+    )
+    _startup_secrets = secret_cache.get_many(_secret_names)
+    for _secret_name, _elapsed_ms in secret_cache.timings.items():
+        startup_timer.record(f"key_vault.{_secret_name}", _elapsed_ms)
+    AUTHORITY=_startup_secrets["AUTHORITY"]
+    CLIENTID=_startup_secrets["CLIENTID"]
+    CLIENTSECRET=_startup_secrets["CLIENTSECRET"]
+    redirect_uri = redirect_uri or _startup_secrets.get("REDIRECT-URI")
 else:
     logger.info('Using Environment Variables');
     AUTHORITY=os.environ.get("AUTHORITY");
     CLIENTID=os.environ.get("CLIENTID");
     CLIENTSECRET=os.environ.get("CLIENTSECRET");
+startup_timer.mark("secrets")
 
 if not CLIENTID or not CLIENTSECRET or not AUTHORITY:
     raise ValueError("CLIENTID, CLIENTSECRET, and AUTHORITY must be configured for app-to-API authentication.")
@@ -228,13 +274,8 @@ _api_client_app = msal.ConfidentialClientApplication(
     authority=AUTHORITY,
 )
 
-redirect_uri = os.environ.get("REDIRECT_URI")
 if not redirect_uri:
-    if AZURE_CLIENT_ID and client is not None:
-        logger.info('Using Key Vault for REDIRECT-URI')
-        redirect_uri = client.get_secret("REDIRECT-URI").value
-    if not redirect_uri:
-        raise ValueError("REDIRECT-URI variable not in KeyVault or Environment")
+    raise ValueError("REDIRECT-URI variable not in KeyVault or Environment")
 
 api_url = cast(str, os.environ.get("API_URL"))
 if not api_url:
@@ -278,26 +319,8 @@ def _get_api_access_token() -> str:
         logger.debug("[api-token] acquired app token; expires_in=%s scope=%s", expires_in, API_APP_SCOPE)
         return access_token
 
-# Lightweight startup probe endpoint: returns 200 only when a Managed Identity token can be acquired
-@app.route("/startupz", methods=["GET"]) 
-def startup_probe():
-
-    logger.debug("/startupz: Beginning MI token acquisition attempt")
-    try:
-        redis_scope = "https://redis.azure.com/.default"
-        logger.debug("/startupz: attempting MI token acquisition for redis scope=%s", redis_scope)
-        token = managed_identity_credential.get_token(redis_scope)
-        logger.debug("/startupz: MI token acquisition attempt complete")
-        if token and token.token:
-            logger.info("/startupz: token acquired; expires_on=%s", getattr(token, 'expires_on', None))
-            return "ok", 200
-        return "token not available", 503
-    except Exception as ex:
-        logger.warning("/startupz: MI token acquisition failed: %s: %s", type(ex).__name__, ex)
-        return f"waiting for managed identity: {type(ex).__name__}", 503
-    finally:
-        logger.debug("/startupz: Finished MI token acquisition attempt")
-
+# Shared GraphQL client for the JSON API routes
+api_client = GraphQLClient(api_url, _get_api_access_token)
 
 # --------------------------
 # Redis (Entra ID) support
@@ -368,6 +391,14 @@ logger.info("[init] finalizing session setup")
 Session(app)
 logger.info("[init] session setup complete")
 
+def _shared_redis() -> Optional[Redis]:
+    """The session Redis client, shared by every worker and replica; None with filesystem sessions."""
+    return app.config.get("SESSION_REDIS") if app.config.get("SESSION_TYPE") == "redis" else None
+
+def _process_id() -> str:
+    """Identifies this worker process in Redis leases (read per call, so forked workers differ)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
 #! Custom Redis session backend is always enabled when REDIS_CONNECTION_STRING is present
 if REDIS_CONNECTION_STRING:
     logger.info("[custom-session] Activating custom Redis session interface override")
@@ -381,8 +412,8 @@ if REDIS_CONNECTION_STRING:
             self._data = dict(initial or {})
             self.sid = sid
             self.new = new
-            self.modified = False
             self.permanent = False  # honor Flask expectation
+            self.modified = False
         # Mapping interface
         def __getitem__(self, key):
             return self._data[key]
@@ -471,6 +502,13 @@ if REDIS_CONNECTION_STRING:
             if not getattr(sess, 'sid', None):
                 sess.sid = self.generate_sid()
             ttl_seconds = int(app_ref.permanent_session_lifetime.total_seconds()) if sess.permanent else self.default_ttl
+            if response.status_code == 304 and not sess.modified and not sess.new:
+                # Conditional GET answered without touching the session: only extend its lifetime
+                try:
+                    self.redis.expire(self.get_redis_key(sess.sid), ttl_seconds)
+                except Exception as e:
+                    logger.error(f"[custom-session][save] error {type(e).__name__}: {e}")
+                return
             try:
                 # Support both our custom wrapper (with to_dict) and plain dict-like
                 raw_dict = sess.to_dict() if hasattr(sess, 'to_dict') else dict(sess)
@@ -503,6 +541,7 @@ if REDIS_CONNECTION_STRING:
         logger.error("[custom-session] Failed to install custom session interface: %s", _e_csi)
 
 ## Debug session instrumentation removed for production hardening
+startup_timer.mark("session")
 
 # This section is needed for url_for("foo", _external=True) to automatically
 # generate http scheme when this sample is running on localhost,
@@ -515,6 +554,208 @@ if IS_LOCALHOST:
     except Exception as e:
         logger.warning("ProxyFix not available: %s", e)
 
+# --------------------------------------------------
+# Diagnostics (opt-in, admin-only)
+# Admin endpoints under /admin/ require the X-Diagnostics-Token header to match
+# DIAGNOSTICS_TOKEN; they return 404 when no token is configured.
+#
+# PROFILER_ENABLED=true wraps app.wsgi_app with a sampling profiler that
+# profiles a fraction of requests (PROFILER_SAMPLE_RATE), requests whose path
+# starts with PROFILER_PATHS or whose endpoint is in PROFILER_ENDPOINTS
+# (comma-separated), and requests carrying X-Profile-Request: <DIAGNOSTICS_TOKEN>.
+# --------------------------------------------------
+DIAGNOSTICS_TOKEN = os.environ.get("DIAGNOSTICS_TOKEN", "")
+PROFILER_ENABLED = os.environ.get("PROFILER_ENABLED", "false").lower() == "true"
+
+def _csv_env(name: str) -> list:
+    return [item.strip() for item in os.environ.get(name, "").split(",") if item.strip()]
+
+profiler: Optional[SamplingProfiler] = None
+if PROFILER_ENABLED:
+    profiler = SamplingProfiler(
+        interval_ms=float(os.environ.get("PROFILER_INTERVAL_MS", "10")),
+        max_stacks=int(os.environ.get("PROFILER_MAX_STACKS", "5000")),
+        max_samples=int(os.environ.get("PROFILER_MAX_SAMPLES", "200000")),
+        max_concurrent=int(os.environ.get("PROFILER_MAX_CONCURRENT", "4")),
+        overhead_budget=float(os.environ.get("PROFILER_OVERHEAD_BUDGET", "0.02")),
+    )
+    app.wsgi_app = ProfilerMiddleware(
+        app.wsgi_app,
+        profiler,
+        sample_rate=float(os.environ.get("PROFILER_SAMPLE_RATE", "0.01")),
+        paths=_csv_env("PROFILER_PATHS"),
+        endpoints=_csv_env("PROFILER_ENDPOINTS"),
+        url_map=app.url_map,
+        header_value=DIAGNOSTICS_TOKEN or None,
+    )
+    logger.info("[profiler] Sampling profiler middleware installed")
+
+# Memory diagnostics: tracemalloc is only started on demand via /admin/memory/start
+memory_diagnostics = MemoryDiagnostics(max_snapshots=int(os.environ.get("MEMORY_MAX_SNAPSHOTS", "5")))
+for _module_name in ("services.cache", "recommendation_engine", "azure.identity", "msal"):
+    memory_diagnostics.register_module_group(_module_name)
+if REDIS_CONNECTION_STRING:
+    memory_diagnostics.register_code_group("session_interface", _CustomRedisSessionInterface)
+
+def admin_required(view):
+    """Restrict a view to callers presenting the diagnostics token."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not DIAGNOSTICS_TOKEN:
+            abort(404)
+        supplied = request.headers.get("X-Diagnostics-Token")
+        if not supplied:
+            logger.warning("[admin] diagnostics request without a token for %s", request.path)
+            abort(401)
+        if not tokens_match(supplied, DIAGNOSTICS_TOKEN):
+            logger.warning("[admin] rejected diagnostics request for %s", request.path)
+            abort(403)
+        return view(*args, **kwargs)
+    return wrapper
+
+# --------------------------------------------------
+# Health probes
+# Dependency checks run on a background schedule (HEALTH_CHECK_INTERVAL_SECONDS)
+# and the probes only read their cached results:
+#   /startupz  200 once a managed identity token has been acquired
+#   /readyz    200 while managed identity and Redis checks pass (DAB is
+#              reported but not critical: a backend outage should not pull
+#              every replica out of rotation)
+#   /livez     200 while the check scheduler keeps running
+# Add ?verbose=1 to any probe for per-dependency status.
+# --------------------------------------------------
+health_monitor = HealthMonitor(
+    interval=float(os.environ.get("HEALTH_CHECK_INTERVAL_SECONDS", "15")),
+    timeout=float(os.environ.get("HEALTH_CHECK_TIMEOUT_SECONDS", "5")),
+)
+
+def _check_managed_identity():
+    token = managed_identity_credential.get_token("https://redis.azure.com/.default")
+    if not (token and token.token):
+        return False
+    return f"expires_on={getattr(token, 'expires_on', None)}"
+
+def _check_dab():
+    # Any HTTP answer below 500 means the Data API Builder host is reachable
+    parsed = urlparse(api_url)
+    response = requests.get(f"{parsed.scheme}://{parsed.netloc}/", timeout=health_monitor.timeout)
+    if response.status_code >= 500:
+        return False
+    return f"status={response.status_code}"
+
+health_monitor.register("managed_identity", _check_managed_identity, startup=True)
+if REDIS_CONNECTION_STRING:
+    health_monitor.register("redis", lambda: bool(r.ping()))
+health_monitor.register("dab", _check_dab, critical=False)
+health_monitor.start()
+
+def _probe_response(ok: bool):
+    if request.args.get("verbose"):
+        return jsonify(status="ok" if ok else "unavailable", **health_monitor.status()), (200 if ok else 503)
+    return ("ok", 200) if ok else ("unavailable", 503)
+
+@app.route("/startupz", methods=["GET"])
+def startup_probe():
+    return _probe_response(health_monitor.started())
+
+@app.route("/readyz", methods=["GET"])
+def readiness_probe():
+    return _probe_response(health_monitor.ready())
+
+@app.route("/livez", methods=["GET"])
+def liveness_probe():
+    return _probe_response(health_monitor.alive())
+
+# --------------------------------------------------
+# Due-date reminders (REMINDERS_ENABLED)
+# A ReminderScheduler keeps a heap of open todos with a due date and fires a
+# reminder REMINDER_LEAD_HOURS before the day starts, to REMINDER_WEBHOOK_URL
+# or else an in-process queue. Every write path below reports the todo's new
+# state through _track_reminder/_cancel_reminders.
+# With Redis, only the process holding the REMINDER_LOCK_KEY lease loads and
+# fires: it loads all open dated todos (REMINDER_LOAD_PAGE_SIZE per DAB call)
+# when it takes the lease, and every process pushes its writes onto the
+# REMINDER_CHANGES_KEY list, which the leader drains. Full reloads every
+# REMINDER_RESYNC_SECONDS are opt-in. Without Redis there is one process, and
+# it applies its own writes directly.
+# --------------------------------------------------
+REMINDERS_ENABLED = os.environ.get("REMINDERS_ENABLED", "false").lower() == "true"
+REMINDER_LOAD_PAGE_SIZE = max(1, int(os.environ.get("REMINDER_LOAD_PAGE_SIZE", "1000")))
+REMINDER_LEASE_SECONDS = max(3, int(os.environ.get("REMINDER_LEASE_SECONDS", "60")))
+REMINDER_LOCK_KEY = "reminders:lock"
+REMINDER_CHANGES_KEY = "reminders:changes"
+REMINDER_CHANGES_BATCH = 1000
+reminder_scheduler: Optional[ReminderScheduler] = None
+
+def _load_reminder_page(after: Optional[str]) -> Dict[str, Any]:
+    return api_client.get_open_todos_due_page(
+        inject_current_date()["current_date"], " ".join(REMINDER_FIELDS), first=REMINDER_LOAD_PAGE_SIZE, after=after
+    )
+
+def _claim_reminder_lease() -> bool:
+    """Take or renew the lease that makes this process the one firing reminders.
+
+    SET NX takes a free lease; the holder renews it with EXPIRE. If the holder
+    dies, the lease expires within REMINDER_LEASE_SECONDS and another process
+    takes over. Without Redis this process always leads; if Redis cannot be
+    reached it stops leading until it can.
+    """
+    redis_client = _shared_redis()
+    if redis_client is None:
+        return True
+    me = _process_id()
+    try:
+        if redis_client.set(REMINDER_LOCK_KEY, me, nx=True, ex=REMINDER_LEASE_SECONDS):
+            return True
+        if redis_client.get(REMINDER_LOCK_KEY) == me.encode():
+            redis_client.expire(REMINDER_LOCK_KEY, REMINDER_LEASE_SECONDS)
+            return True
+        return False
+    except Exception as e:
+        logger.warning("[reminders] Could not take the reminder lease: %s", e)
+        return False
+
+def _pull_reminder_changes() -> List[Change]:
+    """Pop the oldest queued changes (every process's writes) for the leader."""
+    redis_client = _shared_redis()
+    if redis_client is None:
+        return []
+    raw = redis_client.lpop(REMINDER_CHANGES_KEY, REMINDER_CHANGES_BATCH)
+    return [json.loads(item) for item in raw or []]
+
+def _publish_reminder_changes(*changes: Change) -> None:
+    """Hand changes to the leading process (one RPUSH) or, without Redis, apply them here."""
+    redis_client = _shared_redis()
+    if redis_client is None:
+        for change in changes:
+            reminder_scheduler.apply(change)
+        return
+    try:
+        redis_client.rpush(REMINDER_CHANGES_KEY, *(json.dumps(change) for change in changes))
+    except Exception as e:
+        logger.warning("[reminders] Could not queue %d reminder changes: %s", len(changes), e)
+        return
+    reminder_scheduler.wake()
+
+if REMINDERS_ENABLED:
+    _reminder_webhook_url = os.environ.get("REMINDER_WEBHOOK_URL")
+    reminder_scheduler = ReminderScheduler(
+        WebhookSink(_reminder_webhook_url) if _reminder_webhook_url else QueueSink(),
+        lead_seconds=float(os.environ.get("REMINDER_LEAD_HOURS", "24")) * 3600,
+        resync_seconds=float(os.environ.get("REMINDER_RESYNC_SECONDS", "0")),
+        claim_seconds=REMINDER_LEASE_SECONDS / 3,
+    )
+    reminder_scheduler.start(_load_reminder_page, claim=_claim_reminder_lease, changes=_pull_reminder_changes)
+
+def _track_reminder(oid: Optional[str], todo: Dict[str, Any]) -> None:
+    """Schedule, move or cancel a todo's reminder after a successful write."""
+    if reminder_scheduler is not None and oid:
+        _publish_reminder_changes(track_change(todo, oid))
+
+def _cancel_reminders(*todo_ids: int) -> None:
+    if reminder_scheduler is not None and todo_ids:
+        _publish_reminder_changes(*(cancel_change(todo_id) for todo_id in todo_ids))
+
 logger.info("[init] setting up MSAL authentication")
 auth = identity.web.Auth(
     session=session,
@@ -523,6 +764,42 @@ auth = identity.web.Auth(
     client_credential=CLIENTSECRET,
 )
 logger.info("[init] MSAL authentication setup complete")
+startup_timer.mark("auth")
+
+# Refresh the signed-in user's token this long before it expires
+USER_TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+def _current_user() -> Optional[Dict[str, Any]]:
+    """The signed-in user's claims, or None; identity.web is asked once per request."""
+    if "current_user" not in g:
+        user = auth.get_user()
+        g.current_user = user if isinstance(user, dict) else None
+    return g.current_user
+
+def _current_oid() -> Optional[str]:
+    """The signed-in user's object ID, or None."""
+    user = _current_user()
+    return user.get("oid") if user else None
+
+def _user_token() -> Optional[str]:
+    """Access token for ``scope`` on behalf of the signed-in user.
+
+    The token is kept in the session with its expiry and only acquired again
+    within USER_TOKEN_REFRESH_MARGIN_SECONDS of expiring.
+
+    Returns:
+        The access token, or None if it could not be acquired
+    """
+    token = session.get("token")
+    if token and time.time() < (session.get("token_expires_at") or 0) - USER_TOKEN_REFRESH_MARGIN_SECONDS:
+        return token
+    result = auth.get_token_for_user(scope)
+    if "access_token" not in result:
+        logger.warning("[auth] Could not acquire user token: %s", result.get("error"))
+        return None
+    session["token"] = result["access_token"]
+    session["token_expires_at"] = time.time() + int(result.get("expires_in") or 0)
+    return session["token"]
 
 @app.context_processor
 def inject_common_variables():
@@ -530,132 +807,298 @@ def inject_common_variables():
     from flask_wtf.csrf import generate_csrf
     context = inject_current_date()
     context['csrf_token'] = generate_csrf
+    context['todo_rows'] = _request_todo_rows
+    context['todo_list_cursor'] = _request_todo_cursor
+    context['todo_group'] = lambda todo: todo_group(todo, context['current_date'])
+    context['priority_rank'] = priority_rank
+    context['archive_after_days'] = ARCHIVE_AFTER_DAYS
     return context
 
-@app.before_request
-def load_data_to_session():
-    """Load todos into session, using cache when possible."""
-    logger.debug("[before_request] loading data into session")
-
-    # Avoid touching the session for health/debug/static requests to prevent Redis writes
-    if (
-        request.endpoint in {"startup_probe", "debug_probe"}
-        or request.path in {"/startupz", "/debugz", "/favicon.ico", "/login", "/getAToken"}
-        or request.path.startswith("/static/")
-    ):
-        logger.debug("[before_request] skipping session load for endpoint=%s", request.endpoint)
-        return
+TODO_PAGE_SIZE = max(1, int(os.environ.get("TODO_PAGE_SIZE", "50")))
+TODO_PAGE_SIZE_MAX = 500
+TODO_CACHE_TTL_SECONDS = int(os.environ.get("TODO_CACHE_TTL_SECONDS", "900"))
+TODO_CACHE_REVALIDATE_SECONDS = int(os.environ.get("TODO_CACHE_REVALIDATE_SECONDS", "15"))
 
-    user = auth.get_user()
-    if user is None:
-        logger.debug("[before_request] no authenticated user; clearing session todos")
-        session["todos"] = None
-        return
-    
-    logger.debug("[before_request] authenticated user found; loading todos")
-    oid = user.get("oid") if isinstance(user, dict) else None
-    if not oid:
-        logger.debug("[before_request] authenticated user has no OID; clearing session todos")
-        session["todos"] = None
-        return
-    logger.debug("[before_request] authenticated user OID: %s", oid)
-    
-    # Check cache first
-    from services.cache import get_cache
-    cache = get_cache(ttl_seconds=60)  # Cache for 60 seconds
-    cached_todos = cache.get(oid)
-    
-    if cached_todos is not None:
-        logger.debug("[before_request] Using cached todos for OID: %s", oid)
-        session["todos"] = cached_todos
-        session["todo"] = None
-        session["TabEnum"] = Tab
-        session["PriorityEnum"] = Priority
-        session["selectedTab"] = Tab.NONE
-        return
-       
-    global api_url
-    logger.debug("[before_request] Loading existing ToDo's from API for OID: %s", oid)
+# Create the shared cache here so every later get_cache() call gets these settings
+from services.cache import get_cache
+get_cache(ttl_seconds=TODO_CACHE_TTL_SECONDS, revalidate_seconds=TODO_CACHE_REVALIDATE_SECONDS)
 
-    headers = {
-        "Content-Type" : "application/json",
-        "Authorization" : f"Bearer {_get_api_access_token()}"
-    }
+def _list_version(oid: str) -> Optional[str]:
+    """Current version of the user's list from the ``todo_version`` entity, or None if unavailable."""
+    try:
+        return api_client.get_list_version(oid)
+    except RuntimeError as e:
+        logger.warning("[cache] List version lookup failed for OID %s: %s", oid, e)
+        return None
 
-    query = f"""
-    {{
-        todos(filter: {{ oid: {{ eq: "{oid}" }} }}) {{
-                items {{
-                    id
-                    name
-                    recommendations_json
-                    notes
-                    priority
-                    completed
-                    due_date
-                    oid
-                }}
-            }}
-        }}
+def _written_version(version: Deferred) -> Optional[str]:
+    """List version read in the same batch as (and after) a write, or None if that read failed.
+
+    Passing it to the cache's write methods keeps the patched entry current,
+    so the next revalidation does not throw it away over our own write.
     """
+    try:
+        return version.result()
+    except RuntimeError as e:
+        logger.warning("[cache] List version read after write failed: %s", e)
+        return None
 
-    # The payload for the POST request
-    payload = {"query": query}
+def _revalidate_cached_list(oid: str) -> None:
+    """Drop the user's cached list if it is due a check and the database version moved on.
+
+    Without a version (lookup failed) the entry is dropped, so the cache never
+    serves a list older than TODO_CACHE_REVALIDATE_SECONDS unchecked.
+    """
+    cache = get_cache()
+    if cache.needs_revalidation(oid):
+        cache.revalidate(oid, _list_version(oid))
 
-    # Make the POST request with error handling
+def _list_etag(oid: str, *parts: Any) -> Optional[str]:
+    """Strong ETag for a response built from the user's cached list, or None.
+
+    Combines the cache tag (revalidated first, and read before the response
+    content) with ``parts``, the other inputs the response depends on. None
+    when nothing is cached for the user, i.e. the response must be built fresh.
+    """
+    _revalidate_cached_list(oid)
+    tag = get_cache().tag(oid)
+    if tag is None:
+        return None
+    key = "\x1f".join(str(part) for part in (tag, oid) + parts)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+def _cache_headers(response: Response, etag: Optional[str]) -> Response:
+    """Mark a per-user response as private and revalidated on every use."""
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+def _not_modified(etag: Optional[str]) -> Optional[Response]:
+    """A 304 response if the request's If-None-Match matches ``etag``, else None."""
+    if etag is None or not request.if_none_match.contains(etag):
+        return None
+    return _cache_headers(app.response_class(status=304), etag)
+
+def _group_counts(oid: str, today: str, load: bool = True) -> Optional[Dict[str, int]]:
+    """Number of the user's todos in each list group, across the whole list.
+
+    Taken from the cache (stored with the first page, kept up to date by
+    writes, or counted from a fully cached list); otherwise read with the
+    ``todo_group_counts`` procedure when ``load`` is set.
+
+    Returns:
+        Count per group name, or None when not cached (and not loaded)
+    """
+    cache = get_cache()
+    counts = cache.group_counts(oid, today)
+    if counts is not None or not load:
+        return counts
+    tag = cache.tag(oid)
     try:
-        response = requests.post(api_url, json=payload, headers=headers, timeout=30)
-        logger.debug("[load_data] GraphQL todos response status=%s", response.status_code)
+        counts = api_client.get_group_counts(oid, today)
+    except RuntimeError as e:
+        logger.warning("[load_data] Group count lookup failed for OID %s: %s", oid, e)
+        return None
+    if tag is not None:
+        cache.set_group_counts(oid, today, counts, tag)
+    return counts
+
+def _todo_rows_html(oid: Optional[str], after: Optional[str], todos: List[Dict[str, Any]], cached: bool = True) -> Markup:
+    """Rendered list rows for one page of the user's todos, grouped by due status.
+
+    A page held in the todo cache is rendered from the cache's grouped view
+    once per cache generation and day, and later calls return the stored
+    markup. ``todos`` is grouped and rendered directly when the page is not
+    cached (or ``cached`` is False, e.g. for pages of a non-default size).
+    The first page carries the group headings with each group's count over
+    the whole list (``_group_counts``), so a heading shows even when its
+    rows are on later pages; those rows are placed under it by ``app.js``.
+    Without ``oid`` (the page could not be loaded) nothing is cached or
+    counted.
+    """
+    current_date = inject_current_date()["current_date"]
+    headers = after is None
+    cache = get_cache()
+    if oid and cached:
+        html = cache.get_fragment(oid, after, current_date)
+        if html is not None:
+            return Markup(html)
+        snapshot = cache.grouped_snapshot(oid, after, current_date)
+        if snapshot is not None:
+            groups, tag = snapshot
+            counts = _group_counts(oid, current_date) if headers else None
+            html = render_template(
+                "_todo_rows.html", groups=groups, headers=headers, counts=counts, current_date=current_date
+            )
+            # Headings without counts are not kept, so the next render retries the count
+            if counts is not None or not headers:
+                cache.set_fragment(oid, after, current_date, html, tag)
+            return Markup(html)
+    counts = _group_counts(oid, current_date) if oid and headers else None
+    groups = GroupedView(todos, current_date).groups()
+    return Markup(render_template(
+        "_todo_rows.html", groups=groups, headers=headers, counts=counts, current_date=current_date
+    ))
+
+def _load_todo_page(oid: str, after: Optional[str] = None, first: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Return one page of a user's todos, from the cache when possible.
+
+    Pages of the default size are cached under the cursor they start after;
+    other sizes always go to the API. A first page loaded from the API brings
+    the list's group counts along in the same request.
 
-        if response.status_code == 200:
+    Returns:
+        Dictionary with ``items``, ``end_cursor`` and ``has_next_page``, or
+        None (not cached) when the API call fails
+    """
+    cache = get_cache()
+    first = TODO_PAGE_SIZE if first is None else first
+    cacheable = first == TODO_PAGE_SIZE
+    version = None
+    if cacheable:
+        _revalidate_cached_list(oid)
+        page = cache.get_page(oid, after)
+        if page is not None:
+            return page
+        if after is None:
+            # Read before the page so a change made in between shows up as a newer version
+            version = _list_version(oid)
+
+    logger.debug("[load_data] Loading ToDo page from API for OID: %s (after: %s, first: %s)", oid, after, first)
+    counts = None
+    try:
+        if cacheable and after is None:
+            # The group counts for the headings share the page's query document
+            today = inject_current_date()["current_date"]
+            with api_client.batch() as batch:
+                loaded = batch.todos_page(oid, first)
+                counted = batch.group_counts(oid, today)
+            page = loaded.result()
             try:
-                resp_json = response.json()
-            except ValueError:
-                logger.warning("[load_data] Todos response not JSON decodable; treating as empty list. Raw: %.500s", response.text)
-                session["todos"] = []
-                cache.set(oid, [])
-            else:
-                data = resp_json.get("data") or {}
-                todos_root = data.get("todos") or {}
-                items = todos_root.get("items")
-                if items is None:
-                    logger.debug("[load_data] 'items' missing in todos response structure; defaulting to empty list")
-                    items = []
-                session["todos"] = items
-                cache.set(oid, items)  # Cache the results
+                counts = (today, counted.result())
+            except RuntimeError as e:
+                logger.warning("[load_data] Group count lookup failed for OID %s: %s", oid, e)
         else:
-            logger.warning("[load_data] Failed to load data from API (status=%s). Body: %.500s", response.status_code, response.text)
-            session["todos"] = []
-            # Don't cache errors
-    except requests.RequestException as e:
-        logger.error("[load_data] Request exception: %s", e)
-        session["todos"] = []
+            page = api_client.get_todos_page(oid, first=first, after=after)
+    except RuntimeError as e:
+        logger.warning("[load_data] Failed to load todos from API: %s", e)
         # Don't cache errors
+        return None
+    if cacheable:
+        page = cache.set_page(
+            oid, after, page["items"], page["end_cursor"], page["has_next_page"], version=version, counts=counts
+        )
+    return page
 
-    session["todo"] = None
-    session["TabEnum"] = Tab
-    session["PriorityEnum"] = Priority
-    session["selectedTab"] = Tab.NONE
+# Signed CSRF tokens expire after WTF_CSRF_TIME_LIMIT; a cached page is only
+# reused within half of that, so its form tokens stay valid for at least as long
+_CSRF_ETAG_BUCKET_SECONDS = max(1, int(app.config.get("WTF_CSRF_TIME_LIMIT") or 3600) // 2)
+
+@app.before_request
+def index_not_modified():
+    """Answer a conditional GET of the index page before the session is loaded."""
+    if request.endpoint != "index" or request.method != "GET":
+        return None
+    user = _current_user()
+    oid = _current_oid()
+    if not oid:
+        return None
+    g.index_etag = _list_etag(
+        oid,
+        user.get("name"),
+        inject_current_date()["current_date"],
+        session.get("csrf_token"),
+        int(time.time()) // _CSRF_ETAG_BUCKET_SECONDS,
+    )
+    return _not_modified(g.index_etag)
+
+# --------------------------------------------------
+# Per-route data requirements
+# Views declare what they use with @requires(...) and load_data_to_session
+# prepares only that; views without a declaration get nothing.
+#   "user": signed-in user; otherwise the request is redirected to /login
+#   "list": the view renders index.html. The tab state is reset and the first
+#           page of the user's todos is loaded when the template first asks
+#           for it (todo_rows()/todo_list_cursor()), never in advance.
+# --------------------------------------------------
+_DATA_REQUIREMENTS = frozenset({"user", "list"})
+
+def requires(*data: str):
+    """Declare the per-request data a view needs.
+
+    Args:
+        data: Names from ``_DATA_REQUIREMENTS``
+
+    Raises:
+        ValueError: If a name is unknown
+    """
+    unknown = set(data) - _DATA_REQUIREMENTS
+    if unknown:
+        raise ValueError(f"Unknown data requirements: {sorted(unknown)}")
+
+    def decorator(view):
+        view.data_requirements = frozenset(data)
+        return view
+    return decorator
+
+def _request_todo_page() -> Optional[Dict[str, Any]]:
+    """First page of the signed-in user's todos, loaded once per request on first use."""
+    if "todo_page" not in g:
+        oid = _current_oid()
+        g.todo_page = _load_todo_page(oid) if oid else None
+        g.todo_list_oid = oid if g.todo_page is not None else None
+    return g.todo_page
+
+def _request_todo_rows() -> Markup:
+    """Rendered rows of the first page (``todo_rows()`` in templates)."""
+    page = _request_todo_page()
+    return _todo_rows_html(g.todo_list_oid, None, page["items"] if page is not None else [])
+
+def _request_todo_cursor() -> Optional[str]:
+    """Cursor after the first page, None if it is the last (``todo_list_cursor()`` in templates)."""
+    page = _request_todo_page()
+    return page["end_cursor"] if page is not None else None
+
+@app.before_request
+def load_data_to_session():
+    """Prepare the data the matched view declared with ``@requires``."""
+    view = app.view_functions.get(request.endpoint) if request.endpoint else None
+    requirements = getattr(view, "data_requirements", frozenset())
+    if not requirements:
+        return None
+    logger.debug("[before_request] preparing %s for endpoint=%s", sorted(requirements), request.endpoint)
+
+    if "user" in requirements and _current_user() is None:
+        return redirect(url_for("login"))
+
+    if "list" in requirements:
+        session["todo"] = None
+        session["TabEnum"] = Tab
+        session["PriorityEnum"] = Priority
+        session["selectedTab"] = Tab.NONE
+    return None
 
 @app.route("/")
+@requires("user", "list")
 def index():
 
-    user = auth.get_user()
+    user = _current_user()
     if not user:
         return redirect(url_for("login"))
     else:
-    # load_data_to_session already executed via before_request; avoid duplicate call
-        session["name"] = user.get("name") if isinstance(user, dict) else None
-        session["token"] = auth.get_token_for_user(scope)['access_token']
+        session["name"] = user.get("name")
+        _user_token()
         session["TabEnum"] = Tab
         session["selectedTab"] =Tab.NONE
-        return render_template("index.html")
+        return _cache_headers(make_response(render_template("index.html")), g.get("index_etag"))
 @app.route("/add", methods=["POST"])
+@requires("user")
 def add_todo():
     """Add a new todo item with input validation."""
     global api_url
 
-    user = auth.get_user()
+    user = _current_user()
     if not user:
         return redirect(url_for("login"))
 
@@ -666,26 +1109,17 @@ def add_todo():
         logger.warning("[add_todo] Validation failed: %s", error_msg)
         return f'Validation error: {error_msg}', 400
 
-    logger.info("Adding TODO: User OID: %s", user.get("oid") if isinstance(user, dict) else None)
+    logger.info("Adding TODO: User OID: %s", _current_oid())
 
-    mutation = """
-    mutation Createtodo($name: String!, $oid: String!) {
-        createtodo(item: {name: $name, oid: $oid}) {
-            id
-            name
-            recommendations_json
-            notes
-            priority
-            completed
-            due_date
-            oid
-        }
-    }
+    mutation = f"""
+    mutation Createtodo($name: String!, $oid: String!) {{
+        createtodo(item: {{name: $name, oid: $oid}}) {{ {todo_fields("detail")} }}
+    }}
     """
     # Prepare the variables with sanitized input
     variables = {
         "name": sanitize_string(todo_name, max_length=200),
-        "oid": user.get("oid") if isinstance(user, dict) else None
+        "oid": _current_oid()
     }
 
     headers = {
@@ -705,7 +1139,7 @@ def add_todo():
         # Invalidate cache for this user
         from services.cache import get_cache
         cache = get_cache()
-        oid = user.get("oid") if isinstance(user, dict) else None
+        oid = _current_oid()
         if oid:
             cache.invalidate(oid)
         return redirect(url_for('index'))
@@ -720,9 +1154,11 @@ def add_todo():
 
 # Details of ToDo Item
 @app.route('/details/<int:id>', methods=['GET'])
+@requires("user", "list")
 def details(id: int):
     """Show details of a todo item."""
-    if not auth.get_user():
+    user = _current_user()
+    if not user:
         return redirect(url_for("login"))
     
     # Validate todo ID
@@ -734,7 +1170,7 @@ def details(id: int):
     global api_url
     
     try:
-        todo = get_todo_by_id(todo_id, api_url)
+        todo = get_todo_by_id(todo_id, api_url, _current_oid())
     except RuntimeError as e:
         logger.error("[details] Failed to fetch todo id=%s: %s", todo_id, e)
         return redirect(url_for('index'))
@@ -749,9 +1185,11 @@ def details(id: int):
 
 # Edit a new ToDo
 @app.route('/edit/<int:id>', methods=['GET'])
+@requires("user", "list")
 def edit(id: int):
     """Edit a todo item."""
-    if not auth.get_user():
+    user = _current_user()
+    if not user:
         return redirect(url_for("login"))
     
     # Validate todo ID
@@ -763,7 +1201,7 @@ def edit(id: int):
     global api_url
     
     try:
-        todo = get_todo_by_id(todo_id, api_url)
+        todo = get_todo_by_id(todo_id, api_url, _current_oid())
     except RuntimeError as e:
         logger.error("[edit] Failed to fetch todo id=%s: %s", todo_id, e)
         return redirect(url_for('index'))
@@ -778,9 +1216,10 @@ def edit(id: int):
 
 # Save existing To Do Item
 @app.route('/update/<int:id>', methods=['POST'])
+@requires("user")
 def update_todo(id: int):
     """Update an existing todo item with input validation."""
-    if not auth.get_user():
+    if not _current_user():
         return redirect(url_for("login"))
 
     # Validate todo ID
@@ -869,10 +1308,10 @@ def update_todo(id: int):
         # Invalidate cache for this user
         from services.cache import get_cache
         cache = get_cache()
-        user = auth.get_user()
-        oid = user.get("oid") if isinstance(user, dict) else None
+        oid = _current_oid()
         if oid:
             cache.invalidate(oid)
+        _track_reminder(oid, variables)
         return redirect(url_for('index'))
     else:
         try:
@@ -886,9 +1325,10 @@ def update_todo(id: int):
 
 # Delete a ToDo
 @app.route('/remove/<int:id>', methods=["POST", "GET"])
+@requires("user")
 def remove_todo(id: int):
     """Delete a todo item."""
-    if not auth.get_user():
+    if not _current_user():
         return redirect(url_for("login"))
 
     # Validate todo ID
@@ -929,10 +1369,10 @@ def remove_todo(id: int):
         # Invalidate cache for this user
         from services.cache import get_cache
         cache = get_cache()
-        user = auth.get_user()
-        oid = user.get("oid") if isinstance(user, dict) else None
+        oid = _current_oid()
         if oid:
             cache.invalidate(oid)
+        _cancel_reminders(todo_id)
         session["selectedTab"] = Tab.NONE
         return redirect(url_for('index'))
     else:
@@ -947,6 +1387,7 @@ def remove_todo(id: int):
 # Show AI recommendations
 @app.route('/recommend/<int:id>', methods=['GET'])
 @app.route('/recommend/<int:id>/<refresh>', methods=['GET'])
+@requires("user", "list")
 def recommend(id: int, refresh: bool = False):
     """Show AI recommendations for a todo item.
     
@@ -954,15 +1395,18 @@ def recommend(id: int, refresh: bool = False):
         id: The todo item ID
         refresh: Whether to refresh recommendations (ignore cached)
     """
-    if not auth.get_user():
+    user = _current_user()
+    if not user:
         return redirect(url_for("login"))
 
     global api_url
     session["selectedTab"] = Tab.RECOMMENDATIONS
+    # Imported on first use: the openai SDK is the heaviest import in the app
+    from recommendation_engine import RecommendationEngine
     recommendation_engine = RecommendationEngine()
     
     try:
-        todo = get_todo_by_id(id, api_url)
+        todo = get_todo_by_id(id, api_url, _current_oid(), view="recommendations")
     except RuntimeError as e:
         logger.error("[recommend] Failed to fetch todo id=%s: %s", id, e)
         return f'An error occurred: {str(e)}', 500
@@ -970,13 +1414,15 @@ def recommend(id: int, refresh: bool = False):
     if todo is None:
         return redirect(url_for('index'))
 
+    # Keep only the parsed recommendations in the session, not the raw JSON as well
+    recommendations_json = todo.pop('recommendations_json', None)
     session["todo"] = todo
 
     if session["todo"] and not refresh:
         try:
             # Attempt to load any saved recommendation from the API response
-            if session["todo"].get('recommendations_json') is not None:
-                session["todo"]['recommendations'] = json.loads(session["todo"]['recommendations_json'])
+            if recommendations_json is not None:
+                session["todo"]['recommendations'] = json.loads(recommendations_json)
                 return render_template('index.html', appinsights_connection_string=app_insights_connection_string)
         except (ValueError, json.JSONDecodeError) as e:
             logger.warning("[recommend] Failed to parse recommendations_json for id=%s: %s", id, e)
@@ -985,7 +1431,7 @@ def recommend(id: int, refresh: bool = False):
     previous_links_str = None
     if refresh:
         try:
-            session["todo"]['recommendations'] = json.loads(session["todo"]['recommendations_json'])
+            session["todo"]['recommendations'] = json.loads(recommendations_json)
             # Extract links
             links = [item["link"] for item in session["todo"]['recommendations']]
             # Convert list of links to a single string
@@ -1007,7 +1453,6 @@ def recommend(id: int, refresh: bool = False):
     mutation UpdateTodoRecommendations($id: Int!, $recommendations_json: String!) {
         updatetodo(id: $id, item: { recommendations_json: $recommendations_json}) {
             id
-            recommendations_json
         }
     }
     """
@@ -1040,101 +1485,817 @@ def recommend(id: int, refresh: bool = False):
         logger.error('Recommend error: %s', error_message)
         return f'An error occurred: {error_message}', 500
 
-    # Invalidate cache for this user since recommendations were updated
-    from services.cache import get_cache
-    cache = get_cache()
-    user = auth.get_user()
-    oid = user.get("oid") if isinstance(user, dict) else None
-    if oid:
-        cache.invalidate(oid)
-
+    # Cached list pages do not hold recommendations, so there is nothing to invalidate
     return render_template('index.html', appinsights_connection_string=app_insights_connection_string)
 
-@app.route('/completed/<int:id>/<complete>', methods=['GET'])
+def _wants_json() -> bool:
+    """True when the client prefers a JSON response over HTML."""
+    return request.accept_mimetypes.best_match(["text/html", "application/json"]) == "application/json"
+
+@app.route('/completed/<int:id>/<complete>', methods=['GET', 'POST'])
+@requires("user")
 def completed(id: int, complete: str):
-    """Update the completion status of a todo item."""
-    if not auth.get_user():
+    """Update the completion status of a todo item.
+
+    Sends a single ``set_todo_completed`` mutation, which only updates the
+    item if it belongs to the signed-in user, so nothing is read first. The
+    cached list is then patched in place. Clients asking for JSON (the list
+    checkbox) get the re-rendered row and its group instead of a redirect.
+    """
+    user = _current_user()
+    if not user:
         return redirect(url_for("login"))
+    wants_json = _wants_json()
 
     # Validate todo ID
     is_valid, todo_id, error_msg = validate_todo_id(id)
     if not is_valid:
         logger.warning("[completed] Invalid todo ID: %s", error_msg)
-        return redirect(url_for('index'))
+        return (jsonify(error=error_msg), 400) if wants_json else redirect(url_for('index'))
 
     # Validate complete parameter
     if complete not in ["true", "false"]:
         logger.warning("[completed] Invalid complete parameter: %s", complete)
-        return redirect(url_for('index'))
+        return (jsonify(error="complete must be 'true' or 'false'"), 400) if wants_json else redirect(url_for('index'))
+    is_completed = complete == "true"
 
     session["selectedTab"] = Tab.NONE
 
-    global api_url
-    
+    oid = _current_oid()
+
+    # One write filtered by id and owner: another user's id updates nothing and reads as not found
     try:
-        todo = get_todo_by_id(todo_id, api_url)
+        result = api_client.set_todo_completed(todo_id, oid, is_completed)
     except RuntimeError as e:
-        logger.error("[completed] Failed to fetch todo id=%s: %s", todo_id, e)
-        return redirect(url_for('index'))
+        logger.error("[completed] Completion update failed for id=%s: %s", todo_id, e)
+        if wants_json:
+            return jsonify(error="An error occurred while connecting to the API"), 502
+        return 'An error occurred while connecting to the API', 500
+    if result is None:
+        logger.warning("[completed] Todo id=%s not found for OID: %s", todo_id, oid)
+        return (jsonify(error="not found"), 404) if wants_json else redirect(url_for('index'))
+    todo, version = result
+
+    # Patch the cached list instead of invalidating it
+    _patch_cached_todo(oid, todo_id, {"completed": is_completed}, version)
+    _track_reminder(oid, todo)
+
+    if wants_json:
+        group = todo_group(todo, inject_current_date()["current_date"])
+        return jsonify(
+            todo=todo,
+            group=group,
+            html=render_template("_todo_row.html", todo=todo, group=group),
+            group_counts=_list_counts(oid),
+        )
+    return redirect(url_for('index'))
 
-    if todo is None:
-        return redirect(url_for('index'))
-    
-    session["todo"] = todo
+# --------------------------------------------------
+# JSON API
+# Todo CRUD for in-place DOM updates (static/js/app.js). Responses carry the
+# todo plus, where a list row changes, its server-rendered HTML fragment
+# (templates/_todo_row.html), so one request replaces redirect + full render.
+# Requests under /api/ skip load_data_to_session; the per-user cache is used
+# (and patched) directly. Non-GET calls need the CSRF token in X-CSRFToken.
+# --------------------------------------------------
+_TODO_FIELDS = todo_fields("detail")
 
-    # Update the completion status based on the 'complete' parameter
-    if complete == "true":
-        session["todo"]['completed'] = True
-    elif complete == "false":
-        session["todo"]['completed'] = False
+def _owned_todo(oid: Optional[str], todo_id: int, view: str = "list") -> Optional[Dict[str, Any]]:
+    """Return a copy of the todo if it belongs to ``oid``, else None.
 
-    # Prepare the GraphQL mutation to update the completion status
-    mutation = """
-    mutation UpdateTodoCompletion($id: Int!, $completed: Boolean!) {
-        updatetodo(id: $id, item: { completed: $completed }) {
-            id
-            completed
-        }
-    }
+    The user's cached list answers without a read when it holds the fields of
+    ``view``; otherwise the item is fetched and ``get_todo_by_id`` compares
+    its owner.
+
+    Raises:
+        RuntimeError: If the API request fails
     """
+    if not oid:
+        return None
+    return get_todo_by_id(todo_id, api_url, oid, view=view)
 
-    headers = {
-        'Content-Type' : 'application/json',
-        'Authorization' : f"Bearer {_get_api_access_token()}"
-    }
+def _patch_cached_todo(oid: Optional[str], todo_id: int, changes: Dict[str, Any], version: Optional[str] = None) -> None:
+    """Apply a successful update to the user's cached list (or drop the list).
 
-    # Prepare the variables for the mutation
-    variables = {
-        "id": todo_id,
-        "completed": session["todo"]['completed']
+    ``version`` is the list version read right after the write, if any.
+    """
+    if not oid:
+        return
+    from services.cache import get_cache
+    cache = get_cache()
+    if cache.update_item(oid, todo_id, changes, version=version) is None:
+        cache.invalidate(oid)
+
+def _api_user_oid() -> Optional[str]:
+    return _current_oid()
+
+def _api_error(message: str, status: int):
+    return jsonify(error=message), status
+
+def _list_counts(oid: str) -> Optional[Dict[str, int]]:
+    """Group counts for the headings after a write (None if they cannot be read; ``app.js`` then drops them).
+
+    Writes to cached items keep the cached counts current; only a write the
+    cache could not follow costs a ``todo_group_counts`` read.
+    """
+    return _group_counts(oid, inject_current_date()["current_date"])
+
+def _todo_response(oid: str, todo: Dict[str, Any], status: int = 200):
+    return jsonify(todo=todo, html=render_template("_todo_row.html", todo=todo), group_counts=_list_counts(oid)), status
+
+_UPDATABLE_FIELDS = ("name", "due_date", "notes", "priority", "completed")
+
+def _todo_changes(body: Dict[str, Any], fields: Tuple[str, ...] = _UPDATABLE_FIELDS) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Validate the updatable ``fields`` present in a JSON body.
+
+    Returns:
+        Tuple of (changes, error_message); ``null`` clears due_date/notes
+    """
+    for field in ("name", "due_date", "notes"):
+        if field in fields and body.get(field) is not None and not isinstance(body[field], str):
+            return {}, f"{field} must be a string"
+
+    changes: Dict[str, Any] = {}
+    if "name" in fields and "name" in body:
+        name = str(body.get("name") or "").strip()
+        is_valid, error_msg = validate_todo_name(name)
+        if not is_valid:
+            return {}, error_msg
+        changes["name"] = sanitize_string(name, max_length=200)
+    if "due_date" in fields and "due_date" in body:
+        is_valid, normalized_due_date, error_msg = validate_due_date(body.get("due_date"))
+        if not is_valid:
+            return {}, error_msg
+        changes["due_date"] = normalized_due_date
+    if "notes" in fields and "notes" in body:
+        is_valid, sanitized_notes, error_msg = validate_notes(body.get("notes"))
+        if not is_valid:
+            return {}, error_msg
+        changes["notes"] = sanitized_notes
+    if "priority" in fields and "priority" in body:
+        is_valid, priority_int, error_msg = validate_priority(body.get("priority"))
+        if not is_valid:
+            return {}, error_msg
+        changes["priority"] = priority_int
+    if "completed" in fields and "completed" in body:
+        if not isinstance(body["completed"], bool):
+            return {}, "completed must be a boolean"
+        changes["completed"] = body["completed"]
+    if not changes:
+        return {}, "no updatable fields supplied"
+    return changes, None
+
+@app.route("/api/todos", methods=["GET"])
+def api_list_todos():
+    """One page of the user's todos; ``after`` continues from a previous ``end_cursor``."""
+    oid = _api_user_oid()
+    if not oid:
+        return _api_error("not authenticated", 401)
+    after = request.args.get("after") or None
+    if after is not None and len(after) > 1024:
+        return _api_error("invalid cursor", 400)
+    try:
+        first = int(request.args.get("first", TODO_PAGE_SIZE))
+    except ValueError:
+        return _api_error("first must be an integer", 400)
+    first = max(1, min(first, TODO_PAGE_SIZE_MAX))
+    html = request.args.get("format") == "html"
+    # Only default-size pages come from the cache the ETag describes
+    etag = _list_etag(oid, "list", after, html, inject_current_date()["current_date"] if html else None) if first == TODO_PAGE_SIZE else None
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    page = _load_todo_page(oid, after=after, first=first)
+    if page is None:
+        return _api_error("could not load todos", 502)
+    body: Dict[str, Any] = {
+        "todos": page["items"],
+        "end_cursor": page["end_cursor"],
+        "has_next_page": page["has_next_page"],
     }
+    if html:
+        body["html"] = _todo_rows_html(oid, after, page["items"], cached=first == TODO_PAGE_SIZE)
+    return _cache_headers(jsonify(body), etag)
+
+# Search: the first query loads all of the user's todos (searchable columns,
+# SEARCH_LOAD_PAGE_SIZE per DAB call) into a TodoSearchIndex kept on the
+# user's cache entry. Cache writes keep it current; it is rebuilt when the
+# entry is dropped (expiry, revalidation, invalidation).
+SEARCH_LOAD_PAGE_SIZE = max(1, int(os.environ.get("SEARCH_LOAD_PAGE_SIZE", "1000")))
+SEARCH_LIMIT_MAX = 100
 
-    # Send the request to update the completion status with error handling
+def _build_search_index(oid: str) -> Optional[TodoSearchIndex]:
+    """Index all of the user's todos and attach the index to their cache entry.
+
+    Returns:
+        The index (used for this request even if a concurrent write kept it
+        from being attached), or None when the API call fails
+    """
+    cache = get_cache()
+    tag = cache.tag(oid)
+    if tag is None:
+        # Start an entry (with its list version) for the index to live on
+        _load_todo_page(oid)
+        tag = cache.tag(oid)
+    todos: List[Dict[str, Any]] = []
+    after = None
     try:
-        response = requests.post(api_url, json={'query': mutation, 'variables': variables}, headers=headers, timeout=30)
-        logger.debug("[completed] GraphQL update completion response status=%s", response.status_code)
-    except requests.RequestException as e:
-        logger.error('[completed] Request exception: %s', e)
-        return 'An error occurred while connecting to the API', 500
+        while True:
+            page = api_client.get_todos_page(
+                oid, first=SEARCH_LOAD_PAGE_SIZE, after=after, order_by=TODO_ID_ORDER, fields=todo_fields("search")
+            )
+            todos.extend(page["items"])
+            if not page["has_next_page"]:
+                break
+            after = page["end_cursor"]
+    except RuntimeError as e:
+        logger.warning("[search] Failed to load todos from API: %s", e)
+        return None
+    index = TodoSearchIndex(todos)
+    if tag is not None:
+        cache.set_search_index(oid, index, tag)
+    return index
+
+@app.route("/api/todos/search", methods=["GET"])
+def api_search_todos():
+    """Ranked search over name and notes: ``q`` plus optional ``priority``, ``completed``, ``overdue``, ``limit``."""
+    oid = _api_user_oid()
+    if not oid:
+        return _api_error("not authenticated", 401)
+    query = (request.args.get("q") or "").strip()
+    if len(query) > 200:
+        return _api_error("query is too long", 400)
+    filters: Dict[str, Any] = {}
+    is_valid, priority_int, error_msg = validate_priority(request.args.get("priority"))
+    if not is_valid:
+        return _api_error(error_msg, 400)
+    if priority_int is not None:
+        filters["priority"] = priority_int
+    completed = request.args.get("completed")
+    if completed:
+        if completed not in ("true", "false"):
+            return _api_error("completed must be true or false", 400)
+        filters["completed"] = completed == "true"
+    if request.args.get("overdue") == "true":
+        filters["overdue_before"] = inject_current_date()["current_date"]
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), SEARCH_LIMIT_MAX))
+    except ValueError:
+        return _api_error("limit must be an integer", 400)
+
+    _revalidate_cached_list(oid)
+    result = get_cache().search(oid, query, limit=limit, **filters)
+    if result is None:
+        index = _build_search_index(oid)
+        if index is None:
+            return _api_error("could not load todos", 502)
+        result = index.search(query, limit=limit, **filters)
+    todos, total = result
+    return jsonify(todos=todos, total=total)
+
+@app.route("/api/todos", methods=["POST"])
+def api_create_todo():
+    oid = _api_user_oid()
+    if not oid:
+        return _api_error("not authenticated", 401)
+    body = request.get_json(silent=True) or {}
+    name = str(body.get("name") or "").strip()
+    is_valid, error_msg = validate_todo_name(name)
+    if not is_valid:
+        return _api_error(error_msg, 400)
 
-    if response.status_code != 200:
-        try:
-            error_data = response.json()
-            error_message = error_data.get('errors', [{'message': 'Unknown error'}])[0]['message']
-        except (ValueError, KeyError, IndexError):
-            error_message = f"API error (status {response.status_code}): {response.text[:200]}"
-        logger.error('Completion update error: %s', error_message)
-        return f'An error occurred: {error_message}', 500
+    # The version read goes out after the mutation, so it includes the new row
+    with api_client.batch() as batch:
+        created = batch.create_todo(_TODO_FIELDS, name=sanitize_string(name, max_length=200), oid=oid)
+        version = batch.list_version(oid)
+    try:
+        todo = created.result()
+    except RuntimeError as e:
+        logger.error("[api] create failed: %s", e)
+        return _api_error(str(e), 502)
+    if not todo:
+        return _api_error("todo was not created", 502)
 
-    # Invalidate cache for this user
     from services.cache import get_cache
     cache = get_cache()
-    user = auth.get_user()
-    oid = user.get("oid") if isinstance(user, dict) else None
-    if oid:
+    if not cache.add_item(oid, dict(todo), version=_written_version(version)):
         cache.invalidate(oid)
+    return _todo_response(oid, todo, 201)
 
-    return redirect(url_for('index'))
+@app.route("/api/todos/<int:id>", methods=["GET"])
+def api_get_todo(id: int):
+    oid = _api_user_oid()
+    if not oid:
+        return _api_error("not authenticated", 401)
+    etag = _list_etag(oid, "todo", id)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    try:
+        todo = _owned_todo(oid, id, view="detail")
+    except RuntimeError as e:
+        return _api_error(str(e), 502)
+    if todo is None:
+        return _api_error("not found", 404)
+    return _cache_headers(jsonify(todo=todo), etag)
+
+@app.route("/api/todos/<int:id>/row", methods=["GET"])
+def api_todo_row(id: int):
+    """Server-rendered list row for a single todo (text/html)."""
+    oid = _api_user_oid()
+    if not oid:
+        return _api_error("not authenticated", 401)
+    etag = _list_etag(oid, "row", id, inject_current_date()["current_date"])
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    try:
+        todo = _owned_todo(oid, id)
+    except RuntimeError as e:
+        return _api_error(str(e), 502)
+    if todo is None:
+        return _api_error("not found", 404)
+    return _cache_headers(make_response(render_template("_todo_row.html", todo=todo)), etag)
+
+@app.route("/api/todos/<int:id>", methods=["PATCH"])
+def api_update_todo(id: int):
+    """Update the fields present in the JSON body (null clears due_date/notes)."""
+    oid = _api_user_oid()
+    if not oid:
+        return _api_error("not authenticated", 401)
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return _api_error("expected a JSON object", 400)
+    changes, error_msg = _todo_changes(body)
+    if error_msg:
+        return _api_error(error_msg, 400)
+
+    try:
+        todo = _owned_todo(oid, id)
+    except RuntimeError as e:
+        return _api_error(str(e), 502)
+    if todo is None:
+        return _api_error("not found", 404)
+
+    with api_client.batch() as batch:
+        updated = batch.update_todo(id, "id", **changes)
+        version = batch.list_version(oid)
+    try:
+        updated.result()
+    except RuntimeError as e:
+        logger.error("[api] update failed for id=%s: %s", id, e)
+        return _api_error(str(e), 502)
+
+    _patch_cached_todo(oid, id, changes, _written_version(version))
+    todo.update(changes)
+    _track_reminder(oid, todo)
+    return _todo_response(oid, todo)
+
+@app.route("/api/todos/<int:id>", methods=["DELETE"])
+def api_delete_todo(id: int):
+    oid = _api_user_oid()
+    if not oid:
+        return _api_error("not authenticated", 401)
+    try:
+        todo = _owned_todo(oid, id)
+    except RuntimeError as e:
+        return _api_error(str(e), 502)
+    if todo is None:
+        return _api_error("not found", 404)
+
+    with api_client.batch() as batch:
+        deleted = batch.delete_todo(id)
+        version = batch.list_version(oid)
+    try:
+        deleted.result()
+    except RuntimeError as e:
+        logger.error("[api] delete failed for id=%s: %s", id, e)
+        return _api_error(str(e), 502)
+
+    from services.cache import get_cache
+    cache = get_cache()
+    if not cache.remove_item(oid, id, version=_written_version(version)):
+        cache.invalidate(oid)
+    _cancel_reminders(id)
+    return jsonify(id=id, deleted=True, group_counts=_list_counts(oid))
+
+# --------------------------------------------------
+# Bulk operations
+# /bulk/complete, /bulk/update and /bulk/delete act on many todos at once.
+# They take {"ids": [...], ...} as JSON (answered with JSON) or a form post
+# with repeated "ids" fields (redirected back to the list). Ownership is
+# settled from the user's cached list plus one batched todo_by_pk lookup for
+# the rest; the changes go out as aliased multi-mutation documents of
+# BULK_CHUNK_SIZE operations, and the cache is patched once at the end.
+# --------------------------------------------------
+BULK_MAX_ITEMS = 500
+BULK_CHUNK_SIZE = max(1, int(os.environ.get("BULK_CHUNK_SIZE", "100")))
+_BULK_UPDATE_FIELDS = ("due_date", "priority", "completed")
+
+def _bulk_request() -> Tuple[Dict[str, Any], Optional[List[int]], Optional[str]]:
+    """Parse a bulk request body.
+
+    Returns:
+        Tuple of (body, unique ids in request order, error_message)
+    """
+    if request.is_json:
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return {}, None, "expected a JSON object"
+        raw_ids = body.get("ids")
+    else:
+        body = request.form.to_dict()
+        raw_ids = request.form.getlist("ids")
+        if "completed" in body:
+            body["completed"] = body["completed"] == "true"
+    if not isinstance(raw_ids, list) or not raw_ids:
+        return body, None, "ids must be a non-empty list"
+    if len(raw_ids) > BULK_MAX_ITEMS:
+        return body, None, f"at most {BULK_MAX_ITEMS} ids per request"
+    ids: Dict[int, None] = {}
+    for raw_id in raw_ids:
+        is_valid, todo_id, error_msg = validate_todo_id(raw_id)
+        if not is_valid:
+            return body, None, f"{error_msg}: {raw_id!r}"
+        ids[todo_id] = None
+    return body, list(ids), None
+
+def _owned_todos(oid: str, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Copies (list fields) of the todos in ``ids`` that belong to ``oid``.
+
+    Ids in the user's cached pages are owned by definition; the others are
+    looked up in one batched query.
+
+    Raises:
+        RuntimeError: If a lookup fails
+    """
+    cache = get_cache()
+    owned: Dict[int, Dict[str, Any]] = {}
+    lookups = {}
+    with api_client.batch(max_fields=BULK_CHUNK_SIZE) as batch:
+        for todo_id in ids:
+            cached = cache.get_item(oid, todo_id)
+            if cached is not None:
+                owned[todo_id] = dict(cached)
+            else:
+                lookups[todo_id] = batch.todo_by_pk(todo_id, todo_fields("list") + " oid")
+    for todo_id, deferred in lookups.items():
+        todo = deferred.result()
+        if todo is not None and todo.pop("oid", None) == oid:
+            owned[todo_id] = todo
+    return owned
+
+def _bulk_result(body: Dict[str, Any], status: int = 200):
+    if request.is_json:
+        return jsonify(body), status
+    return redirect(url_for("index"))
+
+def _bulk_update(oid: str, ids: List[int], changes: Dict[str, Any]):
+    """Apply ``changes`` to the user's todos in ``ids``; the shared part of complete and update."""
+    try:
+        owned = _owned_todos(oid, ids)
+    except RuntimeError as e:
+        logger.error("[bulk] ownership lookup failed: %s", e)
+        return _bulk_result({"error": str(e)}, 502)
+    with api_client.batch(max_fields=BULK_CHUNK_SIZE) as batch:
+        results = {todo_id: batch.update_todo(todo_id, "id", **changes) for todo_id in owned}
+        version = batch.list_version(oid)
+
+    updated, failed = [], []
+    not_found = [todo_id for todo_id in ids if todo_id not in owned]
+    for todo_id, deferred in results.items():
+        try:
+            # None: the row was deleted after the ownership check
+            (updated if deferred.result() is not None else not_found).append(todo_id)
+        except RuntimeError as e:
+            logger.error("[bulk] update failed for id=%s: %s", todo_id, e)
+            failed.append(todo_id)
+    cache = get_cache()
+    if updated and not cache.update_items(oid, updated, changes, version=_written_version(version) if not failed else None):
+        cache.invalidate(oid)
+    logger.info("[bulk] updated %d of %d todos (%s)", len(updated), len(ids), ", ".join(changes))
+
+    html = {}
+    for todo_id in updated:
+        owned[todo_id].update(changes)
+        _track_reminder(oid, owned[todo_id])
+        html[todo_id] = render_template("_todo_row.html", todo=owned[todo_id])
+    return _bulk_result({
+        "updated": updated,
+        "not_found": not_found,
+        "failed": failed,
+        "html": html,
+        "current_date": inject_current_date()["current_date"],
+        "group_counts": _list_counts(oid),
+    })
+
+@app.route("/bulk/complete", methods=["POST"])
+@requires("user")
+def bulk_complete():
+    """Mark many todos completed (or open again with ``"completed": false``)."""
+    body, ids, error_msg = _bulk_request()
+    if error_msg:
+        return _bulk_result({"error": error_msg}, 400)
+    completed = body.get("completed", True)
+    if not isinstance(completed, bool):
+        return _bulk_result({"error": "completed must be a boolean"}, 400)
+    return _bulk_update(_current_oid(), ids, {"completed": completed})
+
+@app.route("/bulk/update", methods=["POST"])
+@requires("user")
+def bulk_update():
+    """Set due_date, priority and/or completed on many todos."""
+    body, ids, error_msg = _bulk_request()
+    if error_msg:
+        return _bulk_result({"error": error_msg}, 400)
+    changes, error_msg = _todo_changes(body, _BULK_UPDATE_FIELDS)
+    if error_msg:
+        return _bulk_result({"error": error_msg}, 400)
+    return _bulk_update(_current_oid(), ids, changes)
+
+@app.route("/bulk/delete", methods=["POST"])
+@requires("user")
+def bulk_delete():
+    """Delete many todos."""
+    oid = _current_oid()
+    body, ids, error_msg = _bulk_request()
+    if error_msg:
+        return _bulk_result({"error": error_msg}, 400)
+    try:
+        owned = _owned_todos(oid, ids)
+    except RuntimeError as e:
+        logger.error("[bulk] ownership lookup failed: %s", e)
+        return _bulk_result({"error": str(e)}, 502)
+    with api_client.batch(max_fields=BULK_CHUNK_SIZE) as batch:
+        results = {todo_id: batch.delete_todo(todo_id) for todo_id in owned}
+        version = batch.list_version(oid)
+
+    deleted, failed = [], []
+    not_found = [todo_id for todo_id in ids if todo_id not in owned]
+    for todo_id, deferred in results.items():
+        try:
+            (deleted if deferred.result() else not_found).append(todo_id)
+        except RuntimeError as e:
+            logger.error("[bulk] delete failed for id=%s: %s", todo_id, e)
+            failed.append(todo_id)
+    cache = get_cache()
+    if deleted and not cache.remove_items(oid, deleted, version=_written_version(version) if not failed else None):
+        cache.invalidate(oid)
+    _cancel_reminders(*deleted)
+    logger.info("[bulk] deleted %d of %d todos", len(deleted), len(ids))
+    return _bulk_result({
+        "deleted": deleted,
+        "not_found": not_found,
+        "failed": failed,
+        "group_counts": _list_counts(oid),
+    })
+
+# --------------------------------------------------
+# Import
+# POST /import takes a CSV or NDJSON upload (multipart "file" field or the
+# raw body) and reads it line by line. Valid rows are created through
+# batched createtodo mutations (BULK_CHUNK_SIZE per document), with at most
+# IMPORT_CONCURRENCY documents in flight. The response is NDJSON: a progress
+# line after each document, then a summary with per-line errors.
+# --------------------------------------------------
+IMPORT_MAX_ROWS = int(os.environ.get("IMPORT_MAX_ROWS", "5000"))
+IMPORT_CONCURRENCY = max(1, int(os.environ.get("IMPORT_CONCURRENCY", "4")))
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+@app.route("/import", methods=["POST"])
+@requires("user")
+def import_todos():
+    """Create todos from an uploaded CSV/NDJSON file, streaming progress back.
+
+    The file is best sent as the raw request body (CSRF token in the
+    ``X-CSRFToken`` header, as the page does): it is then read from the
+    socket a line at a time. A multipart ``file`` field is also accepted,
+    but Werkzeug parses (buffers) the whole multipart body before the view
+    runs.
+    """
+    oid = _current_oid()
+    # Only touches the body for multipart/form content types; a raw body is left unread
+    upload = request.files.get("file")
+    if upload is not None:
+        stream, filename, mimetype = upload.stream, upload.filename, upload.mimetype
+    else:
+        stream, filename, mimetype = request.stream, None, request.mimetype
+    fmt = detect_format(request.args.get("format"), filename, mimetype)
+    if fmt is None:
+        return _api_error("upload a .csv or .ndjson file (or pass format=csv|ndjson)", 400)
+    lines = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    fields = todo_fields("list")
+
+    def progress(counts: Dict[str, int], **extra: Any) -> str:
+        return json.dumps({**counts, **extra}) + "\n"
+
+    def generate():
+        counts = {"processed": 0, "created": 0, "invalid": 0, "failed": 0}
+        errors: List[Dict[str, Any]] = []
+
+        def report(line_number: int, message: str) -> None:
+            if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                errors.append({"line": line_number, "error": message})
+
+        def settle(submitted) -> None:
+            future, rows = submitted
+            future.result()
+            for line_number, deferred in rows:
+                try:
+                    created = deferred.result()
+                except RuntimeError as e:
+                    created, message = None, str(e)
+                else:
+                    message = "todo was not created"
+                if created:
+                    counts["created"] += 1
+                    _track_reminder(oid, created)
+                else:
+                    counts["failed"] += 1
+                    report(line_number, message)
+
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=IMPORT_CONCURRENCY) as pool:
+            batch, rows = api_client.batch(max_fields=BULK_CHUNK_SIZE), []
+            for line_number, item, error_msg in iter_import_rows(lines, fmt):
+                if counts["processed"] >= IMPORT_MAX_ROWS:
+                    report(line_number, f"import stopped after {IMPORT_MAX_ROWS} rows")
+                    break
+                counts["processed"] += 1
+                if error_msg:
+                    counts["invalid"] += 1
+                    report(line_number, error_msg)
+                    continue
+                rows.append((line_number, batch.create_todo(fields, oid=oid, **item)))
+                if len(rows) >= BULK_CHUNK_SIZE:
+                    pending.append((pool.submit(batch.execute), rows))
+                    batch, rows = api_client.batch(max_fields=BULK_CHUNK_SIZE), []
+                    # Bounded concurrency: wait for the oldest document before reading further
+                    while len(pending) >= IMPORT_CONCURRENCY:
+                        settle(pending.popleft())
+                        yield progress(counts)
+            if rows:
+                pending.append((pool.submit(batch.execute), rows))
+            while pending:
+                settle(pending.popleft())
+                yield progress(counts)
+
+        if counts["created"]:
+            # Reload the first page once rather than patching the cache row by row
+            get_cache().invalidate(oid)
+            _load_todo_page(oid)
+        logger.info("[import] %s", counts)
+        yield progress(counts, done=True, errors=errors)
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+# --------------------------------------------------
+# Export
+# GET /export?format=ndjson|csv follows DAB cursors EXPORT_PAGE_SIZE rows at
+# a time and streams each page out as soon as it arrives, so memory does not
+# grow with the list. The per-user cache is bypassed: it only holds the
+# leading list pages and never recommendations_json.
+# --------------------------------------------------
+EXPORT_PAGE_SIZE = max(1, int(os.environ.get("EXPORT_PAGE_SIZE", "200")))
+_EXPORT_FIELDS = todo_fields("detail", "recommendations")
+
+@app.route("/export")
+@requires("user")
+def export_todos():
+    """Stream all of the signed-in user's todos as NDJSON (default) or CSV."""
+    oid = _current_oid()
+    fmt = (request.args.get("format") or "ndjson").lower()
+    if fmt not in FORMATS:
+        return _api_error("format must be csv or ndjson", 400)
+    try:
+        # Fetched before responding so a failing API is still a 502, not a truncated file
+        first_page = api_client.get_todos_page(oid, first=EXPORT_PAGE_SIZE, order_by=TODO_ID_ORDER, fields=_EXPORT_FIELDS)
+    except RuntimeError as e:
+        logger.warning("[export] Failed to load todos from API: %s", e)
+        return _api_error("could not load todos", 502)
+
+    def pages():
+        page = first_page
+        count = len(page["items"])
+        yield page["items"]
+        while page["has_next_page"]:
+            # Errors after the first byte abort the response so the client sees an incomplete download
+            page = api_client.get_todos_page(
+                oid, first=EXPORT_PAGE_SIZE, after=page["end_cursor"], order_by=TODO_ID_ORDER, fields=_EXPORT_FIELDS
+            )
+            count += len(page["items"])
+            yield page["items"]
+        logger.info("[export] Exported %d todos as %s", count, fmt)
+
+    response = Response(stream_with_context(iter_export(pages(), fmt)), mimetype=CONTENT_TYPES[fmt])
+    response.headers["Content-Disposition"] = f"attachment; filename=todos.{fmt}"
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+# --------------------------------------------------
+# Archive tier
+# Completed todos older than ARCHIVE_AFTER_DAYS move from dbo.todo to
+# dbo.todo_archive (scripts/create-archive.sql), so list pages, the cache and
+# the search index only hold active work. POST /archive moves the signed-in
+# user's; with ARCHIVE_INTERVAL_SECONDS set, a background thread moves every
+# user's (app-only token). Every worker and replica starts the thread, but a
+# Redis lease (ARCHIVE_LOCK_KEY, SET NX with the interval as its expiry) lets
+# only one of them run each pass. Other processes notice through list revalidation,
+# since the move lowers the list version's todo count. Archived todos are read
+# on demand from GET /api/todos/archived a page at a time and never cached.
+# --------------------------------------------------
+ARCHIVE_AFTER_DAYS = max(0, int(os.environ.get("ARCHIVE_AFTER_DAYS", "30")))
+ARCHIVE_INTERVAL_SECONDS = int(os.environ.get("ARCHIVE_INTERVAL_SECONDS", "0"))
+ARCHIVE_BATCH_SIZE = max(1, int(os.environ.get("ARCHIVE_BATCH_SIZE", "1000")))
+ARCHIVE_LOCK_KEY = "archive-job:lock"
+
+def _archive_all(older_than_days: int) -> int:
+    """Archive every user's completed todos older than ``older_than_days``."""
+    archived = api_client.archive_completed_todos(older_than_days, batch_size=ARCHIVE_BATCH_SIZE)
+    logger.info("[archive] Archived %d todos completed more than %d days ago", archived, older_than_days)
+    return archived
+
+def _claim_archive_pass() -> bool:
+    """Whether this process should run the current archive pass.
+
+    The lease is not released after the pass; it expires after one interval,
+    so the fleet runs at most one pass per interval however the workers'
+    timers line up. Without Redis (filesystem sessions, a single process) the
+    pass always runs; if Redis cannot be reached it is skipped.
+    """
+    redis_client = _shared_redis()
+    if redis_client is None:
+        return True
+    try:
+        return bool(redis_client.set(ARCHIVE_LOCK_KEY, _process_id(), nx=True, ex=ARCHIVE_INTERVAL_SECONDS))
+    except Exception as e:
+        logger.warning("[archive] Could not take the archive lease, skipping this pass: %s", e)
+        return False
+
+def _run_archive_job() -> None:
+    while True:
+        time.sleep(ARCHIVE_INTERVAL_SECONDS)
+        if not _claim_archive_pass():
+            logger.debug("[archive] Another process holds the archive lease")
+            continue
+        try:
+            _archive_all(ARCHIVE_AFTER_DAYS)
+        except RuntimeError as e:
+            logger.warning("[archive] Archive job failed: %s", e)
+
+if ARCHIVE_INTERVAL_SECONDS > 0:
+    threading.Thread(target=_run_archive_job, name="archive-job", daemon=True).start()
+
+@app.route("/archive", methods=["POST"])
+@requires("user")
+def archive_completed():
+    """Archive the signed-in user's completed todos.
+
+    Takes ``older_than_days`` (default ``ARCHIVE_AFTER_DAYS``) as JSON or a
+    form field and answers like the bulk endpoints.
+    """
+    oid = _current_oid()
+    body = (request.get_json(silent=True) if request.is_json else request.form) or {}
+    try:
+        older_than_days = int(body.get("older_than_days", ARCHIVE_AFTER_DAYS))
+    except (TypeError, ValueError):
+        return _bulk_result({"error": "older_than_days must be an integer"}, 400)
+    if older_than_days < 0:
+        return _bulk_result({"error": "older_than_days must not be negative"}, 400)
+    try:
+        archived = api_client.archive_completed_todos(older_than_days, oid=oid, batch_size=ARCHIVE_BATCH_SIZE)
+    except RuntimeError as e:
+        logger.error("[archive] Archiving failed: %s", e)
+        return _bulk_result({"error": "could not archive todos"}, 502)
+    if archived:
+        get_cache().invalidate(oid)
+    logger.info("[archive] Archived %d todos", archived)
+    return _bulk_result({"archived": archived, "older_than_days": older_than_days})
+
+@app.route("/api/todos/archived", methods=["GET"])
+def api_archived_todos():
+    """One page of the user's archived todos, most recently completed first."""
+    oid = _api_user_oid()
+    if not oid:
+        return _api_error("not authenticated", 401)
+    after = request.args.get("after") or None
+    if after is not None and len(after) > 1024:
+        return _api_error("invalid cursor", 400)
+    try:
+        first = int(request.args.get("first", TODO_PAGE_SIZE))
+    except ValueError:
+        return _api_error("first must be an integer", 400)
+    first = max(1, min(first, TODO_PAGE_SIZE_MAX))
+    try:
+        page = api_client.get_archived_todos_page(oid, first=first, after=after)
+    except RuntimeError as e:
+        logger.warning("[archive] Failed to load archived todos: %s", e)
+        return _api_error("could not load archived todos", 502)
+    return jsonify({
+        "todos": page["items"],
+        "end_cursor": page["end_cursor"],
+        "has_next_page": page["has_next_page"],
+    })
 
 @app.route("/login")
 def login():
@@ -1173,74 +2334,203 @@ def logout():
     session.pop('name', None)
     session.pop('todos', None)
     session.pop('todo', None)
+    session.pop('token', None)
+    session.pop('token_expires_at', None)
 
     return redirect(auth.log_out(url_for("index", _external=True)))
 
 
-def get_todo_by_id(id: int, api_url: str) -> Optional[Dict[str, Any]]:
-    """Fetch a todo item by ID from the GraphQL API.
+# Sampling profiler output (collapsed stacks, flamegraph-ready)
+@app.route("/admin/profile", methods=["GET"])
+@admin_required
+def admin_profile():
+    if profiler is None:
+        abort(404)
+    if request.args.get("format") == "json":
+        return jsonify(stats=profiler.stats(), collapsed=profiler.collapsed())
+    return Response(profiler.collapsed(), mimetype="text/plain")
+
+@app.route("/admin/profile/reset", methods=["POST"])
+@csrf.exempt
+@admin_required
+def admin_profile_reset():
+    if profiler is None:
+        abort(404)
+    profiler.reset()
+    return jsonify(stats=profiler.stats())
+
+# Reminder scheduler state (404 unless REMINDERS_ENABLED)
+@app.route("/admin/reminders", methods=["GET"])
+@admin_required
+def admin_reminders():
+    if reminder_scheduler is None:
+        abort(404)
+    status = reminder_scheduler.status()
+    sink = reminder_scheduler.sink
+    if isinstance(sink, QueueSink):
+        status.update(queued=sink.queue.qsize(), dropped=sink.dropped)
+    return jsonify(status)
+
+# Archive every user's old completed todos now (?older_than_days=, default ARCHIVE_AFTER_DAYS)
+@app.route("/admin/archive", methods=["POST"])
+@csrf.exempt
+@admin_required
+def admin_archive():
+    older_than_days = max(0, request.args.get("older_than_days", ARCHIVE_AFTER_DAYS, type=int))
+    try:
+        return jsonify(archived=_archive_all(older_than_days), older_than_days=older_than_days)
+    except RuntimeError as e:
+        logger.error("[archive] Archiving failed: %s", e)
+        return jsonify(error="could not archive todos"), 502
+
+# Memory diagnostics (tracemalloc snapshots and growth diffs)
+@app.route("/admin/memory", methods=["GET"])
+@admin_required
+def admin_memory_status():
+    return jsonify(memory_diagnostics.status())
+
+@app.route("/admin/memory/start", methods=["POST"])
+@csrf.exempt
+@admin_required
+def admin_memory_start():
+    nframes = request.args.get("nframes", type=int)
+    return jsonify(memory_diagnostics.start(nframes))
+
+@app.route("/admin/memory/stop", methods=["POST"])
+@csrf.exempt
+@admin_required
+def admin_memory_stop():
+    return jsonify(memory_diagnostics.stop())
+
+@app.route("/admin/memory/snapshot", methods=["POST"])
+@csrf.exempt
+@admin_required
+def admin_memory_snapshot():
+    try:
+        return jsonify(memory_diagnostics.take_snapshot(request.args.get("label")))
+    except RuntimeError as e:
+        return jsonify(error=str(e)), 409
+
+@app.route("/admin/memory/top", methods=["GET"])
+@admin_required
+def admin_memory_top():
+    try:
+        return jsonify(memory_diagnostics.top(
+            request.args.get("snapshot"),
+            limit=request.args.get("limit", 20, type=int),
+            group_by=request.args.get("group_by", "module"),
+        ))
+    except KeyError as e:
+        return jsonify(error=str(e.args[0]) if e.args else "not found"), 404
+
+@app.route("/admin/memory/diff", methods=["GET"])
+@admin_required
+def admin_memory_diff():
+    older = request.args.get("a")
+    if not older:
+        return jsonify(error="query parameter 'a' (older snapshot id) is required"), 400
+    try:
+        return jsonify(memory_diagnostics.diff(
+            older,
+            request.args.get("b"),
+            limit=request.args.get("limit", 20, type=int),
+            group_by=request.args.get("group_by", "module"),
+        ))
+    except KeyError as e:
+        return jsonify(error=str(e.args[0]) if e.args else "not found"), 404
+
+# Startup phase timings
+@app.route("/admin/startup", methods=["GET"])
+@admin_required
+def admin_startup():
+    return jsonify(startup_timer.summary())
+
+
+def get_todo_by_id(id: int, api_url: str, oid: Optional[str] = None, view: str = "detail") -> Optional[Dict[str, Any]]:
+    """Fetch a todo item by ID, from the user's cached list when possible.
     
     Args:
         id: The todo item ID
-        api_url: The GraphQL API endpoint URL
+        api_url: The GraphQL API endpoint URL (requests go through ``api_client``,
+                 which is configured with the same URL)
+        oid: Owner's OID; when given, the user's cached list is checked first,
+             the API is only queried on a miss, and a fetched todo owned by
+             anyone else is treated as not found
+        view: Field set the caller renders (see ``TODO_FIELD_SETS``); a cached
+              list item lacking any of its fields counts as a miss
         
     Returns:
-        Dict containing the todo item data, or None if not found
+        Dict containing the todo item data (a copy, safe to modify), or None if not found
         
     Raises:
         RuntimeError: If API request fails
     """
-    # Prepare the GraphQL query to fetch the todo item
-    query = """
-        query Todo_by_pk($id: Int!) {
-            todo_by_pk(id: $id) {
-                id
-                name
-                recommendations_json
-                notes
-                priority
-                completed
-                due_date
-                oid
-            }
-        }
-    """
-    variables = {"id": id}
-
-    headers = {
-        'Content-Type' : 'application/json',
-        'Authorization' : f"Bearer {_get_api_access_token()}"
-    }
-
-    try:
-        # Send the request to fetch the todo item
-        response = requests.post(api_url, json={'query': query, 'variables': variables}, headers=headers, timeout=30)
-        logger.debug("[get_todo_by_id] status=%s for id=%s", response.status_code, id)
+    cache = get_cache()
+    revalidate = bool(oid) and cache.needs_revalidation(oid)
+    cached = cache.get_item(oid, id) if oid else None
+    if cached is not None and not missing_fields(cached, view):
+        if revalidate:
+            _revalidate_cached_list(oid)
+            cached = cache.get_item(oid, id)
+            revalidate = False
+        if cached is not None:
+            logger.debug("[get_todo_by_id] served id=%s from cache", id)
+            return dict(cached)
+
+    # oid is always needed for ownership checks. A due version check rides
+    # along in the same request instead of costing a round trip of its own.
+    fields = todo_fields(view)
+    if "oid" not in TODO_FIELD_SETS[view]:
+        fields += " oid"
+    with api_client.batch() as batch:
+        fetched = batch.todo_by_pk(id, fields)
+        version = batch.list_version(oid) if revalidate else None
+    if version is not None:
+        try:
+            current = version.result()
+        except RuntimeError as e:
+            logger.warning("[cache] List version lookup failed for OID %s: %s", oid, e)
+            current = None
+        cache.revalidate(oid, current)
+        cached = cache.get_item(oid, id)
+
+    todo = fetched.result()
+    logger.debug("[get_todo_by_id] fetched id=%s (found: %s)", id, todo is not None)
+    if todo and oid and todo.get("oid") != oid:
+        # Checked on every fetch, including after revalidation dropped the cached list
+        logger.warning("[get_todo_by_id] id=%s does not belong to OID %s", id, oid)
+        return None
+    if todo and cached is not None:
+        # Keep the detail columns with the cached list item so later views hit;
+        # larger lazily loaded fields (recommendations_json) stay out of the cache
+        detail = {k: v for k, v in todo.items() if k in TODO_FIELD_SETS["detail"]}
+        cache.update_item(oid, id, detail, changed=False)
+    return todo
 
-        if response.status_code == 200:
-            try:
-                resp_json = response.json()
-            except ValueError:
-                logger.error("[get_todo_by_id] Invalid JSON response for id=%s", id)
-                raise RuntimeError("Invalid JSON response from API")
-            
-            todo = resp_json.get('data', {}).get('todo_by_pk')
-            if todo:
-                return todo
-            else:
-                logger.debug("[get_todo_by_id] Todo item not found for id=%s", id)
-                return None
-        else:
-            try:
-                error_data = response.json()
-                error_message = error_data.get('errors', [{'message': 'Unknown error'}])[0]['message']
-            except (ValueError, KeyError, IndexError):
-                error_message = f"API error (status {response.status_code}): {response.text[:200]}"
-            logger.error('Get TODO by id error: %s', error_message)
-            raise RuntimeError(f"Failed to fetch todo: {error_message}")
-    except requests.RequestException as e:
-        logger.error("[get_todo_by_id] Request exception for id=%s: %s", id, e)
-        raise RuntimeError(f"API request failed: {str(e)}")
+# --------------------------------------------------
+# Startup timing
+# Waits for the background telemetry setup, then logs the per-phase breakdown
+# and records it as the app.startup.duration histogram (attribute "phase").
+# --------------------------------------------------
+startup_timer.mark("routes")
+_telemetry_thread.join(timeout=float(os.environ.get("TELEMETRY_INIT_TIMEOUT_SECONDS", "30")))
+if _telemetry_thread.is_alive():
+    logger.warning("[startup] Azure Monitor configuration still running; continuing without waiting")
+startup_timer.mark("telemetry_wait")
+startup_timer.finish()
+startup_summary = startup_timer.summary()
+logger.info("[startup] ready in %sms: %s", startup_summary["total_ms"], json.dumps(startup_summary))
+try:
+    _startup_histogram = metrics.get_meter("my_todoapp").create_histogram(
+        "app.startup.duration", unit="ms", description="Time spent in each application startup phase"
+    )
+    for _phase, _elapsed_ms in startup_summary["phases"].items():
+        _startup_histogram.record(_elapsed_ms, {"phase": _phase, "kind": "sequential"})
+    for _phase, _elapsed_ms in startup_summary["background"].items():
+        _startup_histogram.record(_elapsed_ms, {"phase": _phase, "kind": "background"})
+    _startup_histogram.record(startup_summary["total_ms"], {"phase": "total", "kind": "sequential"})
+except Exception as _e_metric:
+    logger.warning("[startup] Failed to record startup metric: %s", _e_metric)
 
 if __name__ == "__main__":
     # Do NOT reassign secret_key here; earlier initialization already set it from env or generated one.
@@ -0,0 +1 @@
+"""Opt-in runtime diagnostics (profiling) served from admin-only endpoints."""
@@ -0,0 +1,263 @@
+"""tracemalloc-based memory snapshots and growth diffing."""
+import importlib.util
+import inspect
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+class _Group:
+    """Matches tracemalloc frames belonging to a module, package or code object."""
+
+    def __init__(self, name: str, path: str, is_dir: bool = False, lines: Optional[Tuple[int, int]] = None):
+        self.name = name
+        self.path = os.path.normcase(os.path.abspath(path))
+        self.is_dir = is_dir
+        self.lines = lines
+
+    def matches(self, filename: str, lineno: int) -> bool:
+        filename = os.path.normcase(filename)
+        if self.is_dir:
+            if not filename.startswith(self.path + os.sep):
+                return False
+        elif filename != self.path:
+            return False
+        if self.lines is not None:
+            return self.lines[0] <= lineno <= self.lines[1]
+        return True
+
+
+class MemoryDiagnostics:
+    """Starts tracemalloc on demand and keeps a bounded set of named snapshots.
+
+    Allocation sites can be reported per line, per file or per module, and
+    registered focus groups (modules, packages or classes) report the bytes
+    allocated anywhere beneath them, so suspects such as the todo cache or the
+    session interface can be watched directly.
+    """
+
+    def __init__(self, max_snapshots: int = 5, default_nframes: int = 10):
+        """Initialize memory diagnostics.
+
+        Args:
+            max_snapshots: Maximum snapshots retained (oldest evicted first)
+            default_nframes: Frames stored per allocation when tracing starts
+        """
+        self.max_snapshots = max_snapshots
+        self.default_nframes = default_nframes
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[str, Tuple[float, tracemalloc.Snapshot]]" = OrderedDict()
+        self._groups: Dict[str, _Group] = {}
+        self._module_files: Dict[str, str] = {}
+        self._sequence = 0
+
+    # ------------------ Focus groups ------------------
+    def register_module_group(self, module_name: str, name: Optional[str] = None) -> bool:
+        """Track allocations made from a module or package (by import name)."""
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None or not spec.origin:
+            logger.warning("[MemoryDiagnostics] Cannot locate module %s", module_name)
+            return False
+        if spec.submodule_search_locations:
+            group = _Group(name or module_name, os.path.dirname(spec.origin), is_dir=True)
+        else:
+            group = _Group(name or module_name, spec.origin)
+        with self._lock:
+            self._groups[group.name] = group
+        return True
+
+    def register_code_group(self, name: str, obj: Any) -> bool:
+        """Track allocations made from the source lines of a class or function."""
+        try:
+            filename = inspect.getsourcefile(obj)
+            lines, start = inspect.getsourcelines(obj)
+        except (OSError, TypeError):
+            logger.warning("[MemoryDiagnostics] Cannot locate source for %s", name)
+            return False
+        if not filename:
+            return False
+        with self._lock:
+            self._groups[name] = _Group(name, filename, lines=(start, start + len(lines) - 1))
+        return True
+
+    # ------------------ Tracing ------------------
+    @staticmethod
+    def is_tracing() -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, nframes: Optional[int] = None) -> Dict[str, Any]:
+        """Start tracemalloc (no-op if already tracing)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, min(int(nframes or self.default_nframes), 64)))
+            logger.info("[MemoryDiagnostics] tracemalloc started (nframes=%d)", tracemalloc.get_traceback_limit())
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracemalloc and discard retained snapshots."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("[MemoryDiagnostics] tracemalloc stopped")
+        with self._lock:
+            self._snapshots.clear()
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [
+                {"id": sid, "taken_at": taken_at, "traces": len(snap.traces)}
+                for sid, (taken_at, snap) in self._snapshots.items()
+            ]
+            groups = sorted(self._groups)
+        return {
+            "tracing": tracing,
+            "nframes": tracemalloc.get_traceback_limit() if tracing else 0,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "rss_bytes": _current_rss(),
+            "snapshots": snapshots,
+            "groups": groups,
+        }
+
+    def take_snapshot(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """Take and retain a snapshot.
+
+        Raises:
+            RuntimeError: If tracemalloc is not tracing
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; start it first")
+        snap = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES]
+        )
+        with self._lock:
+            self._sequence += 1
+            sid = label or f"s{self._sequence}"
+            self._snapshots.pop(sid, None)
+            self._snapshots[sid] = (time.time(), snap)
+            while len(self._snapshots) > self.max_snapshots:
+                evicted, _ = self._snapshots.popitem(last=False)
+                logger.debug("[MemoryDiagnostics] Evicted snapshot %s", evicted)
+        return {"id": sid, "traces": len(snap.traces), "total_bytes": sum(t.size for t in snap.traces)}
+
+    def _get(self, sid: Optional[str]) -> tracemalloc.Snapshot:
+        with self._lock:
+            if not self._snapshots:
+                raise KeyError("no snapshots taken")
+            if sid is None:
+                return next(reversed(self._snapshots.values()))[1]
+            if sid not in self._snapshots:
+                raise KeyError(f"unknown snapshot '{sid}'")
+            return self._snapshots[sid][1]
+
+    # ------------------ Reports ------------------
+    def _module_name(self, filename: str) -> str:
+        name = self._module_files.get(filename)
+        if name is None:
+            if len(self._module_files) > 10000:
+                self._module_files.clear()
+            by_file = {}
+            for mod_name, module in list(sys.modules.items()):
+                mod_file = getattr(module, "__file__", None)
+                if mod_file:
+                    by_file[os.path.normcase(os.path.abspath(mod_file))] = mod_name
+            name = by_file.get(os.path.normcase(os.path.abspath(filename)), filename)
+            self._module_files[filename] = name
+        return name
+
+    def _site(self, traceback: tracemalloc.Traceback, group_by: str) -> str:
+        frame = traceback[0]
+        if group_by == "lineno":
+            return f"{frame.filename}:{frame.lineno}"
+        if group_by == "filename":
+            return frame.filename
+        return self._module_name(frame.filename)
+
+    def top(self, sid: Optional[str] = None, limit: int = 20, group_by: str = "module") -> Dict[str, Any]:
+        """Top allocation sites of a snapshot plus per-group totals."""
+        snap = self._get(sid)
+        key_type = "lineno" if group_by == "lineno" else "filename"
+        sites: Dict[str, List[int]] = {}
+        for stat in snap.statistics(key_type):
+            totals = sites.setdefault(self._site(stat.traceback, group_by), [0, 0])
+            totals[0] += stat.size
+            totals[1] += stat.count
+        ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return {
+            "group_by": group_by,
+            "sites": [{"site": site, "size_bytes": size, "count": count} for site, (size, count) in ranked],
+            "groups": self._group_totals(snap),
+        }
+
+    def diff(self, older: str, newer: Optional[str] = None, limit: int = 20, group_by: str = "module") -> Dict[str, Any]:
+        """Growth between two snapshots, largest increase first."""
+        old_snap = self._get(older)
+        new_snap = self._get(newer)
+        key_type = "lineno" if group_by == "lineno" else "filename"
+        sites: Dict[str, List[int]] = {}
+        for stat in new_snap.compare_to(old_snap, key_type):
+            totals = sites.setdefault(self._site(stat.traceback, group_by), [0, 0, 0])
+            totals[0] += stat.size_diff
+            totals[1] += stat.count_diff
+            totals[2] += stat.size
+        ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        old_groups = self._group_totals(old_snap)
+        new_groups = self._group_totals(new_snap)
+        return {
+            "group_by": group_by,
+            "sites": [
+                {"site": site, "size_diff_bytes": size_diff, "count_diff": count_diff, "size_bytes": size}
+                for site, (size_diff, count_diff, size) in ranked
+            ],
+            "groups": {
+                name: {
+                    "size_bytes": new_groups[name]["size_bytes"],
+                    "size_diff_bytes": new_groups[name]["size_bytes"] - old_groups.get(name, {}).get("size_bytes", 0),
+                    "count_diff": new_groups[name]["count"] - old_groups.get(name, {}).get("count", 0),
+                }
+                for name in new_groups
+            },
+        }
+
+    def _group_totals(self, snap: tracemalloc.Snapshot) -> Dict[str, Dict[str, int]]:
+        """Bytes whose allocation traceback passes through each focus group."""
+        with self._lock:
+            groups = list(self._groups.values())
+        totals = {g.name: {"size_bytes": 0, "count": 0} for g in groups}
+        if not groups:
+            return totals
+        matchers: List[Tuple[str, Callable[[str, int], bool]]] = [(g.name, g.matches) for g in groups]
+        for trace in snap.traces:
+            hit = set()
+            for frame in trace.traceback:
+                for name, matches in matchers:
+                    if name not in hit and matches(frame.filename, frame.lineno):
+                        hit.add(name)
+            for name in hit:
+                totals[name]["size_bytes"] += trace.size
+                totals[name]["count"] += 1
+        return totals
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux), else None."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
@@ -0,0 +1,295 @@
+"""Low-overhead sampling profiler for production requests."""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional, Set
+from logging import getLogger
+
+from werkzeug.wsgi import ClosingIterator
+
+from utils import tokens_match
+
+logger = getLogger(__name__)
+
+TRUNCATED_STACK = "[truncated]"
+
+
+class SamplingProfiler:
+    """Samples the Python stacks of registered request threads.
+
+    A single daemon thread wakes every ``interval_ms`` and reads the current
+    frame of each registered thread via ``sys._current_frames()``. Stacks are
+    aggregated into collapsed-stack counts (``root;frame;frame count``), the
+    input format used by flamegraph tools.
+
+    Hard caps keep the cost bounded:
+        - at most ``max_concurrent`` requests are profiled at once
+        - at most ``max_stacks`` distinct stacks are retained (the rest are
+          counted under ``[truncated]``)
+        - at most ``max_samples`` samples are retained until ``reset()``
+        - if sampling takes more than ``overhead_budget`` of wall time the
+          interval is doubled (up to ``max_interval_ms``)
+    """
+
+    def __init__(
+        self,
+        interval_ms: float = 10.0,
+        max_interval_ms: float = 200.0,
+        max_depth: int = 64,
+        max_stacks: int = 5000,
+        max_samples: int = 200000,
+        max_concurrent: int = 4,
+        overhead_budget: float = 0.02,
+    ):
+        """Initialize the profiler.
+
+        Args:
+            interval_ms: Target time between samples in milliseconds
+            max_interval_ms: Upper bound for the interval when backing off
+            max_depth: Maximum frames recorded per stack
+            max_stacks: Maximum distinct stacks retained
+            max_samples: Maximum samples retained until reset
+            max_concurrent: Maximum requests profiled at the same time
+            overhead_budget: Fraction of wall time sampling may consume
+        """
+        self.base_interval = interval_ms / 1000.0
+        self.max_interval = max(max_interval_ms / 1000.0, self.base_interval)
+        self.interval = self.base_interval
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self.max_samples = max_samples
+        self.max_concurrent = max_concurrent
+        self.overhead_budget = overhead_budget
+
+        self._lock = threading.Lock()
+        self._targets: Dict[int, str] = {}
+        self._stacks: Counter = Counter()
+        self._frame_labels: Dict[object, str] = {}
+        self._samples = 0
+        self._dropped = 0
+        self._rejected = 0
+        self._profiled_requests = 0
+        self._sampling_seconds = 0.0
+        self._started_at = time.time()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------ Registration ------------------
+    def start_request(self, label: str, thread_id: Optional[int] = None) -> bool:
+        """Start sampling the calling (or given) thread under ``label``.
+
+        Returns:
+            False if the concurrency or sample caps are reached
+        """
+        thread_id = thread_id if thread_id is not None else threading.get_ident()
+        with self._lock:
+            if len(self._targets) >= self.max_concurrent or self._samples >= self.max_samples:
+                self._rejected += 1
+                return False
+            self._targets[thread_id] = label
+            self._profiled_requests += 1
+            self._ensure_thread()
+        self._wake.set()
+        return True
+
+    def stop_request(self, thread_id: Optional[int] = None) -> None:
+        """Stop sampling the calling (or given) thread."""
+        thread_id = thread_id if thread_id is not None else threading.get_ident()
+        with self._lock:
+            self._targets.pop(thread_id, None)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+            logger.info("[SamplingProfiler] Sampler thread started (interval=%.1fms)", self.interval * 1000.0)
+
+    # ------------------ Sampling ------------------
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                idle = not self._targets
+            if idle:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            started = time.perf_counter()
+            self._sample_once()
+            cost = time.perf_counter() - started
+            self._adjust_interval(cost)
+            time.sleep(self.interval)
+
+    def _adjust_interval(self, cost: float) -> None:
+        with self._lock:
+            self._sampling_seconds += cost
+            ratio = cost / (cost + self.interval)
+            if ratio > self.overhead_budget and self.interval < self.max_interval:
+                self.interval = min(self.interval * 2, self.max_interval)
+            elif ratio < self.overhead_budget / 4 and self.interval > self.base_interval:
+                self.interval = max(self.interval / 2, self.base_interval)
+
+    def _sample_once(self) -> None:
+        with self._lock:
+            targets = dict(self._targets)
+        if not targets:
+            return
+        frames = sys._current_frames()
+        collected = []
+        for thread_id, label in targets.items():
+            frame = frames.get(thread_id)
+            if frame is not None:
+                collected.append(self._collapse(label, frame))
+        del frames
+        with self._lock:
+            for stack in collected:
+                if self._samples >= self.max_samples:
+                    self._dropped += 1
+                    continue
+                self._samples += 1
+                if stack in self._stacks or len(self._stacks) < self.max_stacks:
+                    self._stacks[stack] += 1
+                else:
+                    self._stacks[TRUNCATED_STACK] += 1
+
+    def _collapse(self, label: str, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            name = self._frame_labels.get(code)
+            if name is None:
+                name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                if len(self._frame_labels) < 50000:
+                    self._frame_labels[code] = name
+            names.append(name)
+            frame = frame.f_back
+        names.append(label)
+        names.reverse()
+        return ";".join(n.replace(";", ":") for n in names)
+
+    # ------------------ Output ------------------
+    def collapsed(self) -> str:
+        """Return aggregated stacks in collapsed-stack (flamegraph) format."""
+        with self._lock:
+            items = self._stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def stats(self) -> Dict[str, object]:
+        """Return counters describing what has been collected."""
+        with self._lock:
+            elapsed = max(time.time() - self._started_at, 1e-9)
+            return {
+                "samples": self._samples,
+                "distinct_stacks": len(self._stacks),
+                "dropped_samples": self._dropped,
+                "rejected_requests": self._rejected,
+                "profiled_requests": self._profiled_requests,
+                "active_requests": len(self._targets),
+                "interval_ms": round(self.interval * 1000.0, 3),
+                "sampling_seconds": round(self._sampling_seconds, 6),
+                "sampling_share": round(self._sampling_seconds / elapsed, 6),
+                "since": self._started_at,
+            }
+
+    def reset(self) -> None:
+        """Discard collected stacks and counters."""
+        with self._lock:
+            self._stacks.clear()
+            self._frame_labels.clear()
+            self._samples = 0
+            self._dropped = 0
+            self._rejected = 0
+            self._profiled_requests = 0
+            self._sampling_seconds = 0.0
+            self._started_at = time.time()
+            self.interval = self.base_interval
+
+
+class ProfilerMiddleware:
+    """WSGI middleware that selects requests to profile.
+
+    A request is profiled when any of the following holds:
+        - its path starts with one of ``paths``
+        - its Flask endpoint is in ``endpoints`` (needs ``url_map``)
+        - it carries ``header_name`` with the value ``header_value``
+        - a random draw falls under ``sample_rate``
+    """
+
+    def __init__(
+        self,
+        wsgi_app,
+        profiler: SamplingProfiler,
+        sample_rate: float = 0.0,
+        paths: Iterable[str] = (),
+        endpoints: Iterable[str] = (),
+        url_map=None,
+        header_name: str = "X-Profile-Request",
+        header_value: Optional[str] = None,
+        exclude_paths: Iterable[str] = ("/static/", "/admin/", "/startupz", "/readyz", "/livez", "/favicon.ico"),
+    ):
+        """Initialize the middleware.
+
+        Args:
+            wsgi_app: The wrapped WSGI application
+            profiler: Profiler that collects the samples
+            sample_rate: Fraction (0-1) of requests to profile at random
+            paths: Path prefixes that are always profiled
+            endpoints: Flask endpoint names that are always profiled
+            url_map: Flask ``url_map`` used to resolve endpoints and rule labels
+            header_name: Request header that opts a request in
+            header_value: Required header value (header trigger disabled if empty)
+            exclude_paths: Path prefixes that are never profiled
+        """
+        self.wsgi_app = wsgi_app
+        self.profiler = profiler
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.paths = tuple(p for p in paths if p)
+        self.endpoints: Set[str] = {e for e in endpoints if e}
+        self.url_map = url_map
+        self.header_key = "HTTP_" + header_name.upper().replace("-", "_")
+        self.header_value = header_value or None
+        self.exclude_paths = tuple(exclude_paths)
+
+    def _match(self, environ):
+        """Return (rule label, endpoint) for the request, or the raw path."""
+        path = environ.get("PATH_INFO", "")
+        if self.url_map is None:
+            return path, None
+        try:
+            adapter = self.url_map.bind_to_environ(environ)
+            rule, _ = adapter.match(return_rule=True)
+            return rule.rule, rule.endpoint
+        except Exception:
+            return path, None
+
+    def _triggered(self, environ) -> bool:
+        """Cheap checks that do not need URL routing."""
+        path = environ.get("PATH_INFO", "")
+        if self.paths and path.startswith(self.paths):
+            return True
+        if self.header_value is not None:
+            if tokens_match(environ.get(self.header_key), self.header_value):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path.startswith(self.exclude_paths):
+            return self.wsgi_app(environ, start_response)
+        profile = self._triggered(environ)
+        if not profile and not self.endpoints:
+            return self.wsgi_app(environ, start_response)
+        label, endpoint = self._match(environ)
+        if not profile and endpoint not in self.endpoints:
+            return self.wsgi_app(environ, start_response)
+        thread_id = threading.get_ident()
+        if not self.profiler.start_request(f"{environ.get('REQUEST_METHOD', 'GET')} {label}", thread_id):
+            return self.wsgi_app(environ, start_response)
+        try:
+            result = self.wsgi_app(environ, start_response)
+        except BaseException:
+            self.profiler.stop_request(thread_id)
+            raise
+        return ClosingIterator(result, lambda: self.profiler.stop_request(thread_id))
@@ -0,0 +1,190 @@
+"""Background dependency checks with cached results for health probes."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+
+class _Check:
+    """A registered dependency check and its most recent result."""
+
+    def __init__(self, name: str, fn: Callable[[], Any], critical: bool, startup: bool):
+        self.name = name
+        self.fn = fn
+        self.critical = critical
+        self.startup = startup
+        self.ok: Optional[bool] = None
+        self.detail: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self.last_ok_at: Optional[float] = None
+        self.latency_ms: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ever_ok = False
+        self.future = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "critical": self.critical,
+            "detail": self.detail,
+            "checked_at": self.checked_at,
+            "last_ok_at": self.last_ok_at,
+            "latency_ms": round(self.latency_ms, 3) if self.latency_ms is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class HealthMonitor:
+    """Runs dependency checks on a background schedule and caches the results.
+
+    Probes only read the cached state, so they never block on the network:
+        - startup: every ``startup`` check has succeeded at least once
+        - readiness: started, and every ``critical`` check passed its latest
+          run within ``stale_after`` seconds
+        - liveness: the scheduler thread is still completing rounds
+
+    A check is any callable; it passes unless it raises or returns ``False``.
+    A returned string is kept as the check's detail.
+    """
+
+    def __init__(self, interval: float = 15.0, timeout: float = 5.0, stale_after: Optional[float] = None):
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between check rounds
+            timeout: Seconds a single check may take before it counts as failed
+            stale_after: Age in seconds after which a result no longer counts
+                (defaults to three intervals plus the timeout)
+        """
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = stale_after if stale_after is not None else interval * 3 + timeout
+        self._checks: Dict[str, _Check] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._last_round_at: Optional[float] = None
+        self._rounds = 0
+
+    def register(self, name: str, fn: Callable[[], Any], critical: bool = True, startup: bool = False) -> None:
+        """Register a dependency check.
+
+        Args:
+            name: Name reported in probe responses
+            fn: The check itself
+            critical: Whether a failure makes the app not ready
+            startup: Whether the startup probe waits for a first success
+        """
+        with self._lock:
+            self._checks[name] = _Check(name, fn, critical, startup)
+
+    # ------------------ Scheduling ------------------
+    def start(self) -> None:
+        """Start the scheduler thread (no-op if already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(1, len(self._checks)), thread_name_prefix="health-check")
+            self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+            self._thread.start()
+        logger.info("[HealthMonitor] Started (interval=%.1fs, checks=%s)", self.interval, ",".join(self._checks))
+
+    def _run(self) -> None:
+        while True:
+            self.run_checks()
+            # Until startup succeeds, retry quickly so the startup probe turns green promptly
+            wait = self.interval if self.started() else min(self.interval, 1.0)
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def run_checks(self) -> None:
+        """Run every check once, concurrently, each bounded by ``timeout``."""
+        with self._lock:
+            checks = list(self._checks.values())
+            pool = self._pool
+        if pool is None:
+            pool = self._pool = ThreadPoolExecutor(max_workers=max(1, len(checks)), thread_name_prefix="health-check")
+        started = {c.name: time.perf_counter() for c in checks}
+        futures = []
+        for check in checks:
+            if check.future is not None and not check.future.done():
+                # A hung check keeps its worker; do not queue another run behind it
+                self._record(check, False, "previous run still in progress", 0.0)
+                continue
+            check.future = pool.submit(check.fn)
+            futures.append((check, check.future))
+        for check, future in futures:
+            ok, detail = False, None
+            try:
+                remaining = max(0.0, self.timeout - (time.perf_counter() - started[check.name]))
+                result = future.result(timeout=remaining)
+                ok = result is not False
+                detail = result if isinstance(result, str) else None
+            except FutureTimeoutError:
+                detail = f"timed out after {self.timeout:.1f}s"
+            except Exception as e:
+                detail = f"{type(e).__name__}: {e}"
+            self._record(check, ok, detail, (time.perf_counter() - started[check.name]) * 1000.0)
+        with self._lock:
+            self._last_round_at = time.time()
+            self._rounds += 1
+
+    def _record(self, check: _Check, ok: bool, detail: Optional[str], latency_ms: float) -> None:
+        now = time.time()
+        with self._lock:
+            if ok != check.ok:
+                log = logger.info if ok else logger.warning
+                log("[HealthMonitor] %s is %s%s", check.name, "healthy" if ok else "unhealthy", f" ({detail})" if detail else "")
+            check.ok = ok
+            check.detail = detail
+            check.checked_at = now
+            check.latency_ms = latency_ms
+            if ok:
+                check.last_ok_at = now
+                check.consecutive_failures = 0
+                check.ever_ok = True
+            else:
+                check.consecutive_failures += 1
+
+    # ------------------ Probe state ------------------
+    def started(self) -> bool:
+        with self._lock:
+            return all(c.ever_ok for c in self._checks.values() if c.startup)
+
+    def ready(self) -> bool:
+        if not self.started():
+            return False
+        now = time.time()
+        with self._lock:
+            return all(
+                c.ok and c.checked_at is not None and now - c.checked_at <= self.stale_after
+                for c in self._checks.values()
+                if c.critical
+            )
+
+    def alive(self) -> bool:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return False
+            last = self._last_round_at
+        # The first round may still be running; otherwise rounds must keep completing
+        return last is None or time.time() - last <= self.stale_after
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            checks = {name: c.as_dict() for name, c in self._checks.items()}
+            rounds = self._rounds
+            last_round_at = self._last_round_at
+        return {
+            "started": self.started(),
+            "ready": self.ready(),
+            "alive": self.alive(),
+            "rounds": rounds,
+            "last_round_at": last_round_at,
+            "checks": checks,
+        }
@@ -5,7 +5,7 @@ import asyncio
 from services import Service
 from openai import AzureOpenAI
 from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
-from azure.keyvault.secrets import SecretClient
+from startup import get_secret_cache
 from typing import Optional
 
 class RecommendationEngine:
@@ -46,19 +46,13 @@ class RecommendationEngine:
         # or when local user has access to the vault.
         if self._key_vault_name:
             try:
-                kv_uri = f"https://{self._key_vault_name}.vault.azure.net"
-                kv_client = SecretClient(vault_url=kv_uri, credential=self._credential)
+                # Served from the process-wide cache after the first request.
                 # These secrets should exist if bootstrap script populated them.
-                if not self.deployment:
-                    try:
-                        self.deployment = kv_client.get_secret("AZUREOPENAIDEPLOYMENTNAME").value or ""
-                    except Exception:
-                        self.deployment = self.deployment or ""
-                if not self._endpoint:
-                    try:
-                        self._endpoint = kv_client.get_secret("AZUREOPENAIENDPOINT").value or ""
-                    except Exception:
-                        self._endpoint = self._endpoint or ""
+                kv_secrets = get_secret_cache(self._key_vault_name, self._credential).get_many(
+                    ["AZUREOPENAIDEPLOYMENTNAME", "AZUREOPENAIENDPOINT"]
+                )
+                self.deployment = kv_secrets.get("AZUREOPENAIDEPLOYMENTNAME") or ""
+                self._endpoint = kv_secrets.get("AZUREOPENAIENDPOINT") or ""
             except Exception as e:
                 print(f"[RecommendationEngine] Warning: Key Vault access failed ({type(e).__name__}: {e}); will rely on environment vars.")
 
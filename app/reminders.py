@@ -0,0 +1,440 @@
+"""Due-date reminders: a time-ordered heap of open todos and a thread that fires them."""
+import heapq
+import itertools
+import queue
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from logging import getLogger
+
+import requests
+
+logger = getLogger(__name__)
+
+# Columns a reminder needs, for queries that feed the scheduler
+REMINDER_FIELDS = ("id", "oid", "name", "due_date", "completed")
+
+Event = Dict[str, Any]
+Sink = Callable[[Event], None]
+# {"op": "track", "todo": {...REMINDER_FIELDS}} or {"op": "cancel", "id": ...}
+Change = Dict[str, Any]
+
+
+def track_change(todo: Dict[str, Any], oid: Optional[str] = None) -> Change:
+    """A change that schedules or cancels a todo's reminder from its state."""
+    change = {field: todo.get(field) for field in REMINDER_FIELDS}
+    if oid:
+        change["oid"] = oid
+    return {"op": "track", "todo": change}
+
+
+def cancel_change(todo_id: int) -> Change:
+    """A change that drops a todo's reminder."""
+    return {"op": "cancel", "id": todo_id}
+
+
+@lru_cache(maxsize=4096)
+def _midnight(due_date: str) -> Optional[float]:
+    """Local midnight at the start of ``due_date`` (``YYYY-MM-DD``) in epoch seconds."""
+    try:
+        return datetime.strptime(due_date, "%Y-%m-%d").timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class QueueSink:
+    """Hands reminder events to a bounded in-process queue; drops them when it is full."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.queue: "queue.Queue[Event]" = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def __call__(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("[reminders] Queue full, dropped reminder for id=%s", event.get("id"))
+
+
+class WebhookSink:
+    """POSTs each reminder event as JSON to a URL."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def __call__(self, event: Event) -> None:
+        try:
+            self._session.post(self.url, json=event, timeout=self.timeout).raise_for_status()
+        except requests.RequestException as e:
+            logger.warning("[reminders] Webhook failed for id=%s: %s", event.get("id"), e)
+
+
+class ReminderScheduler:
+    """Fires one reminder per open todo ``lead_seconds`` before its due date starts.
+
+    Reminders sit in a heap of ``(fire_at, seq, todo_id)``; ``_entries`` holds
+    the live one per todo. Rescheduling or cancelling leaves the old heap
+    item behind and it is skipped when it surfaces, so every operation is
+    O(log n); the heap is compacted once stale items outnumber live ones.
+    ``_fired`` remembers the due date each todo was last reminded about, so
+    re-saving a todo (a rename, a notes edit, a bulk priority change) does not
+    send the same reminder again; only a new due date clears it.
+
+    Writes feed it through ``track``/``cancel``, or ``apply`` for changes
+    that arrive from other processes. ``start`` runs a thread that first
+    loads every open todo with a due date through ``loader`` (one page at a
+    time), then sleeps until the earliest reminder, hands due ones to
+    ``sink`` and, if ``resync_seconds`` is set, repeats the load. Todos
+    changed by ``track``/``cancel`` while a load runs keep their newer state.
+
+    With several processes, ``claim`` elects the one that loads and fires:
+    the thread only leads while it returns True, loads when it starts
+    leading and drops its heap when it stops. The leader pulls every
+    process's writes from ``changes`` instead of re-reading the table.
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        lead_seconds: float = 86400.0,
+        resync_seconds: float = 0.0,
+        claim_seconds: float = 20.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            sink: Called with each reminder event (from the scheduler thread)
+            lead_seconds: How long before the due date starts a reminder fires
+            resync_seconds: Seconds between full reloads (0: only when the
+                thread starts leading)
+            claim_seconds: Seconds between ``claim`` calls (take or renew the lease)
+            clock: Time source, in epoch seconds
+        """
+        self.sink = sink
+        self.lead_seconds = lead_seconds
+        self.resync_seconds = resync_seconds
+        self.claim_seconds = claim_seconds
+        self.clock = clock
+        self._heap: List[Tuple[float, int, int]] = []
+        # todo id -> (fire_at, seq, oid, name, due_date)
+        self._entries: Dict[int, Tuple[float, int, str, Optional[str], str]] = {}
+        # todo id -> due date its reminder fired for
+        self._fired: Dict[int, str] = {}
+        self._forget_at = 0.0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loader: Optional[Callable[[Optional[str]], Dict[str, Any]]] = None
+        self._claim: Optional[Callable[[], bool]] = None
+        self._changes: Optional[Callable[[], List[Change]]] = None
+        self._next_claim_at = 0.0
+        self.leading = False
+        self._touched: Optional[Set[int]] = None
+        self._loaded_at: Optional[float] = None
+        self._next_load_at: Optional[float] = None
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _fire_at(self, due_date: Optional[str], now: float, late: bool) -> Optional[float]:
+        """When to remind about ``due_date``; None if no reminder is needed.
+
+        A reminder time already past still fires (now) when ``late`` is set,
+        unless the due date itself is over.
+        """
+        midnight = _midnight(due_date) if due_date else None
+        if midnight is None:
+            return None
+        fire_at = midnight - self.lead_seconds
+        if fire_at > now:
+            return fire_at
+        if not late or now >= midnight + 86400:
+            return None
+        return now
+
+    def _push(self, todo_id: int, oid: str, name: Optional[str], due_date: str, fire_at: float) -> None:
+        seq = next(self._seq)
+        self._entries[todo_id] = (fire_at, seq, oid, name, due_date)
+        heapq.heappush(self._heap, (fire_at, seq, todo_id))
+
+    def _compact(self) -> None:
+        if len(self._heap) > 1024 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [(entry[0], entry[1], todo_id) for todo_id, entry in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def schedule(self, todo_id: int, oid: str, due_date: Optional[str], name: Optional[str] = None) -> bool:
+        """(Re)schedule the reminder for an open todo.
+
+        Returns:
+            False if no reminder is due for it (no or invalid date, the due
+            date is over, or its reminder already fired for this due date);
+            any earlier reminder is cancelled either way
+        """
+        now = self.clock()
+        with self._lock:
+            if self._touched is not None:
+                self._touched.add(todo_id)
+            self._entries.pop(todo_id, None)
+            fired_for = self._fired.get(todo_id)
+            if fired_for is not None and fired_for != due_date:
+                del self._fired[todo_id]
+                fired_for = None
+            fire_at = None if fired_for is not None else self._fire_at(due_date, now, late=True)
+            if fire_at is None:
+                self._compact()
+                return False
+            earliest = self._heap[0][0] if self._heap else None
+            self._push(todo_id, oid, name, due_date, fire_at)
+        if earliest is None or fire_at < earliest:
+            self._wake.set()
+        return True
+
+    def cancel(self, todo_id: int) -> bool:
+        """Drop a todo's reminder; False if it had none."""
+        with self._lock:
+            if self._touched is not None:
+                self._touched.add(todo_id)
+            if self._entries.pop(todo_id, None) is None:
+                return False
+            self._compact()
+            return True
+
+    def track(self, todo: Dict[str, Any], oid: Optional[str] = None) -> bool:
+        """Schedule or cancel from a todo's current state (completed or undated: cancel)."""
+        if todo.get("id") is None:
+            return False
+        if todo.get("completed") or not todo.get("due_date"):
+            self.cancel(todo["id"])
+            return False
+        return self.schedule(todo["id"], oid or todo.get("oid"), todo["due_date"], todo.get("name"))
+
+    def apply(self, change: Change) -> bool:
+        """Apply a ``track_change``/``cancel_change``; False if it left no reminder."""
+        if change.get("op") == "cancel":
+            return self.cancel(change["id"])
+        return self.track(change.get("todo") or {})
+
+    def pop_due(self, now: Optional[float] = None) -> List[Event]:
+        """Remove and return the reminders whose time has come, earliest first."""
+        now = self.clock() if now is None else now
+        events: List[Event] = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                fire_at, seq, todo_id = heapq.heappop(heap)
+                entry = self._entries.get(todo_id)
+                if entry is None or entry[1] != seq:
+                    continue
+                del self._entries[todo_id]
+                self._fired[todo_id] = entry[4]
+                events.append({
+                    "type": "todo.due_soon",
+                    "id": todo_id,
+                    "oid": entry[2],
+                    "name": entry[3],
+                    "due_date": entry[4],
+                    "fire_at": fire_at,
+                })
+            if now >= self._forget_at:
+                self._forget_past(now)
+        return events
+
+    def _forget_past(self, now: float) -> None:
+        """Drop fired records whose due date is over (hourly, under the lock)."""
+        self._fired = {
+            todo_id: due_date for todo_id, due_date in self._fired.items()
+            if now < (_midnight(due_date) or 0.0) + 86400
+        }
+        self._forget_at = now + 3600.0
+
+    def next_fire_at(self) -> Optional[float]:
+        """Time of the earliest live reminder, or None if nothing is scheduled."""
+        with self._lock:
+            heap = self._heap
+            while heap:
+                fire_at, seq, todo_id = heap[0]
+                entry = self._entries.get(todo_id)
+                if entry is not None and entry[1] == seq:
+                    return fire_at
+                heapq.heappop(heap)
+            return None
+
+    def load(self, todos: Iterable[Dict[str, Any]]) -> int:
+        """Replace every reminder with those for ``todos`` (open todos with a due date).
+
+        Reminders whose time has already passed are not fired again (they
+        count as fired, so a later ``track`` of the same due date does not
+        send them either), and todos that went through ``track``/``cancel``
+        since ``begin_load`` keep their current reminder.
+
+        Returns:
+            Number of reminders scheduled
+        """
+        now = self.clock()
+        fresh: Dict[int, Tuple[float, int, str, Optional[str], str]] = {}
+        passed: Dict[int, str] = {}
+        for todo in todos:
+            if todo.get("completed") or todo.get("id") is None:
+                continue
+            due_date = todo.get("due_date")
+            fire_at = self._fire_at(due_date, now, late=False)
+            if fire_at is not None:
+                fresh[todo["id"]] = (fire_at, next(self._seq), todo.get("oid"), todo.get("name"), due_date)
+            elif self._fire_at(due_date, now, late=True) is not None:
+                passed[todo["id"]] = due_date
+        with self._lock:
+            touched = self._touched or set()
+            self._touched = None
+            for todo_id in touched:
+                fresh.pop(todo_id, None)
+                passed.pop(todo_id, None)
+                if todo_id in self._entries:
+                    fresh[todo_id] = self._entries[todo_id]
+                if todo_id in self._fired:
+                    passed[todo_id] = self._fired[todo_id]
+            self._entries = fresh
+            self._fired = passed
+            self._heap = [(entry[0], entry[1], todo_id) for todo_id, entry in fresh.items()]
+            heapq.heapify(self._heap)
+            self._loaded_at = now
+        self._wake.set()
+        logger.info("[reminders] Loaded %d reminders", len(fresh))
+        return len(fresh)
+
+    def begin_load(self) -> None:
+        """Start recording ``track``/``cancel`` calls for the next ``load``."""
+        with self._lock:
+            self._touched = set()
+
+    def _load_pages(self) -> None:
+        """Page through ``loader`` and ``load`` the result."""
+        def todos():
+            after = None
+            while True:
+                page = self._loader(after)
+                yield from page["items"]
+                if not page["has_next_page"]:
+                    return
+                after = page["end_cursor"]
+
+        self.begin_load()
+        try:
+            self.load(todos())
+        except Exception as e:
+            with self._lock:
+                self._touched = None
+            logger.warning("[reminders] Loading reminders failed: %s", e)
+            # Retry a failed load sooner than the regular resync
+            self._next_load_at = self.clock() + min(self.resync_seconds or 300.0, 300.0)
+            return
+        self._next_load_at = self.clock() + self.resync_seconds if self.resync_seconds else None
+
+    # ------------------ Thread ------------------
+    def start(
+        self,
+        loader: Callable[[Optional[str]], Dict[str, Any]],
+        claim: Optional[Callable[[], bool]] = None,
+        changes: Optional[Callable[[], List[Change]]] = None,
+    ) -> None:
+        """Start the scheduler thread (no-op if already running).
+
+        Args:
+            loader: Returns the page of open, dated todos after a cursor
+                (``items`` with ``REMINDER_FIELDS``, ``end_cursor``, ``has_next_page``)
+            claim: Takes or renews the lease that lets this process load and
+                fire reminders; None: always lead
+            changes: Returns (and removes) the changes written since the last
+                call, for the leader to ``apply``
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._loader = loader
+            self._claim = claim
+            self._changes = changes
+            self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+            self._thread.start()
+        logger.info("[reminders] Started (lead=%.0fs, resync=%.0fs)", self.lead_seconds, self.resync_seconds)
+
+    def wake(self) -> None:
+        """Have a leading thread pull ``changes`` now instead of at its next wakeup."""
+        if self.leading:
+            self._wake.set()
+
+    def _pull_changes(self) -> List[Change]:
+        if self._changes is None:
+            return []
+        try:
+            return self._changes()
+        except Exception as e:
+            logger.warning("[reminders] Reading changes failed: %s", e)
+            return []
+
+    def _lead(self) -> bool:
+        """Take or renew the lease when due; load on gaining it, clear on losing it."""
+        now = self.clock()
+        if self._claim is not None and now >= self._next_claim_at:
+            self._next_claim_at = now + self.claim_seconds
+            leading = self._claim()
+        else:
+            leading = self.leading or self._claim is None
+        if leading and not self.leading:
+            self.leading = True
+            logger.info("[reminders] Leading: loading reminders")
+            # The load reads the current rows, which already include these changes
+            self._pull_changes()
+            self._load_pages()
+        elif not leading and self.leading:
+            self.leading = False
+            with self._lock:
+                self._entries = {}
+                self._heap = []
+            logger.info("[reminders] Lost the lease; another process fires reminders")
+        return leading
+
+    def _run(self) -> None:
+        while True:
+            if not self._lead():
+                self._wake.wait(max(0.0, self._next_claim_at - self.clock()))
+                self._wake.clear()
+                continue
+            for change in self._pull_changes():
+                self.apply(change)
+            for event in self.pop_due():
+                try:
+                    self.sink(event)
+                    self.fired += 1
+                except Exception as e:
+                    logger.warning("[reminders] Sink failed for id=%s: %s", event["id"], e)
+            now = self.clock()
+            if self._next_load_at is not None and now >= self._next_load_at:
+                self._load_pages()
+                continue
+            next_at = self.next_fire_at()
+            # Wake at least once a minute so clock changes, resyncs and lease renewals are noticed
+            wait = 60.0 if next_at is None else min(max(0.0, next_at - now), 60.0)
+            if self._claim is not None:
+                wait = min(wait, max(0.0, self._next_claim_at - now))
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def status(self) -> Dict[str, Any]:
+        next_fire_at = self.next_fire_at()
+        with self._lock:
+            return {
+                "scheduled": len(self._entries),
+                "heap_size": len(self._heap),
+                "next_fire_at": next_fire_at,
+                "fired": self.fired,
+                "loaded_at": self._loaded_at,
+                "leading": self.leading,
+                "running": self._thread is not None and self._thread.is_alive(),
+            }
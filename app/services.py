@@ -1,5 +0,0 @@
-from enum import Enum
-
-class Service(Enum):
-    OpenAI = "openai"
-    AzureOpenAI = "azureopenai"
\ No newline at end of file
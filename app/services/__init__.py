@@ -1 +1,7 @@
 """Services package for business logic and API interactions."""
+from enum import Enum
+
+
+class Service(Enum):
+    OpenAI = "openai"
+    AzureOpenAI = "azureopenai"
@@ -1,11 +1,343 @@
 """GraphQL API client for interacting with the Data API Builder backend."""
 import json
+import re
 import requests
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from logging import getLogger
 
 logger = getLogger(__name__)
 
+# Columns each screen renders. Queries select one of these sets rather than
+# every column, so list pages never carry the recommendations_json blob.
+TODO_FIELD_SETS: Dict[str, Tuple[str, ...]] = {
+    "list": ("id", "name", "priority", "completed", "due_date"),
+    "detail": ("id", "name", "notes", "priority", "completed", "due_date", "oid"),
+    "recommendations": ("id", "name", "recommendations_json", "oid"),
+    "search": ("id", "name", "notes", "priority", "completed", "due_date"),
+    # Rows of the todo_archive entity (scripts/create-archive.sql)
+    "archive": ("id", "name", "notes", "priority", "due_date", "completed_at"),
+}
+
+
+# Server-side order for list pages: open items first, then by priority (High to
+# Low, then none: the computed priority_rank column) and due date (the computed
+# due_date_sort column: no date sorts first as '' rather than NULL). DAB adds the
+# primary key as the final tiebreaker and encodes these columns in its cursors,
+# so none of them may be NULL; scripts/create-indexes.sql has the columns and a
+# matching index, and services/views.py sort_key() orders grouped views the same way.
+TODO_LIST_ORDER: Tuple[Tuple[str, str], ...] = (("completed", "ASC"), ("priority_rank", "ASC"), ("due_date_sort", "ASC"))
+
+# Columns only sorted on, never selected
+_SORT_COLUMNS: Tuple[str, ...] = ("priority_rank", "due_date_sort")
+
+# Primary-key order, for reads of a whole list: the cheapest keyset scan
+TODO_ID_ORDER: Tuple[Tuple[str, str], ...] = (("id", "ASC"),)
+
+# Archived view order: most recently completed first (IX_todo_archive_oid_completed_at)
+ARCHIVE_ORDER: Tuple[Tuple[str, str], ...] = (("completed_at", "DESC"),)
+
+
+def todo_fields(*views: str) -> str:
+    """Build a GraphQL selection for the union of the named field sets.
+    
+    Args:
+        views: Names from ``TODO_FIELD_SETS``
+        
+    Returns:
+        Space separated field names, in first-seen order
+        
+    Raises:
+        KeyError: If a view name is unknown
+    """
+    return " ".join(dict.fromkeys(field for view in views for field in TODO_FIELD_SETS[view]))
+
+
+def missing_fields(todo: Dict[str, Any], view: str) -> List[str]:
+    """Return the fields of ``view`` that ``todo`` was fetched without."""
+    return [field for field in TODO_FIELD_SETS[view] if field not in todo]
+
+
+def _order_argument(order_by: Tuple[Tuple[str, str], ...]) -> str:
+    """``orderBy`` argument (with trailing comma) for a todos query, or "" for no order."""
+    for column, direction in order_by:
+        if column not in TODO_FIELD_SETS["detail"] + TODO_FIELD_SETS["archive"] + _SORT_COLUMNS or direction not in ("ASC", "DESC"):
+            raise ValueError(f"Unsupported order: {column} {direction}")
+    order = ", ".join(f"{column}: {direction}" for column, direction in order_by)
+    return f"orderBy: {{ {order} }}, " if order else ""
+
+
+def _page_from_root(todos_root: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    todos_root = todos_root or {}
+    has_next_page = bool(todos_root.get("hasNextPage"))
+    return {
+        "items": todos_root.get("items") or [],
+        "end_cursor": todos_root.get("endCursor") if has_next_page else None,
+        "has_next_page": has_next_page,
+    }
+
+
+def _version_from_row(version: Optional[Dict[str, Any]]) -> str:
+    if not version:
+        return "0:0"
+    return f"{version.get('max_version')}:{version.get('todo_count')}"
+
+
+# Columns returned by the todo_group_counts procedure (scripts/create-procedures.sql),
+# one per services.views GROUPS entry
+GROUP_COUNT_FIELDS: Tuple[str, ...] = ("overdue", "today", "upcoming", "no_date", "completed")
+
+
+def _counts_from_rows(rows: Optional[List[Dict[str, Any]]]) -> Dict[str, int]:
+    row = rows[0] if rows else {}
+    return {name: int(row.get(name) or 0) for name in GROUP_COUNT_FIELDS}
+
+
+# GraphQL types of the variables batched operations use, matching the argument
+# types DAB generates; operations override them where a field's input type
+# differs (see _CREATE_VARIABLE_TYPES)
+_VARIABLE_TYPES: Dict[str, str] = {
+    "id": "Int!",
+    "oid": "String!",
+    "first": "Int",
+    "after": "String",
+    "today": "String",
+    "name": "String",
+    "due_date": "String",
+    "notes": "String",
+    "priority": "Int",
+    "completed": "Boolean",
+    "recommendations_json": "String",
+}
+# createtodo's item.name is non-null (name NVARCHAR(100) NOT NULL, no default);
+# a nullable variable there makes DAB reject the whole document
+_CREATE_VARIABLE_TYPES: Dict[str, str] = {**_VARIABLE_TYPES, "name": "String!"}
+_VARIABLE_RE = re.compile(r"\$(\w+)")
+
+
+class Deferred:
+    """Result of an operation queued on a ``GraphQLBatch``."""
+
+    __slots__ = ("_done", "_value", "_error")
+
+    def __init__(self):
+        self._done = False
+        self._value: Any = None
+        self._error: Optional[Exception] = None
+
+    def _resolve(self, value: Any = None, error: Optional[Exception] = None) -> None:
+        self._done = True
+        self._value = value
+        self._error = error
+
+    def result(self) -> Any:
+        """Return the operation's result.
+
+        Raises:
+            RuntimeError: If the operation failed or the batch has not been executed
+        """
+        if not self._done:
+            raise RuntimeError("GraphQL batch has not been executed")
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class _Operation:
+    __slots__ = ("kind", "field", "arguments", "variables", "types", "selection", "transform", "deferred")
+
+    def __init__(self, kind, field, arguments, variables, types, selection, transform):
+        self.kind = kind
+        self.field = field
+        self.arguments = arguments
+        self.variables = variables
+        self.types = types
+        self.selection = selection
+        self.transform = transform
+        self.deferred = Deferred()
+
+
+class GraphQLBatch:
+    """Collects GraphQL operations and sends them as aliased multi-field documents.
+
+    Queued queries go out as one ``query`` document and mutations as one
+    ``mutation`` document (split into chunks of ``max_fields`` root fields),
+    so independent operations cost one round trip instead of one each.
+    Identical queries are sent once and share their ``Deferred``. DAB runs
+    the root fields of a mutation in order; query fields have no defined
+    order, so only batch reads that do not depend on each other.
+
+    Use as a context manager (executed on exit) or call ``execute``::
+
+        with api_client.batch() as batch:
+            todo = batch.todo_by_pk(42, "id name oid")
+            version = batch.list_version(oid)
+        todo.result(), version.result()
+    """
+
+    def __init__(self, client: "GraphQLClient", max_fields: int = 50):
+        self.client = client
+        self.max_fields = max(1, max_fields)
+        self._operations: List[_Operation] = []
+        self._queries: Dict[Tuple[Any, ...], _Operation] = {}
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def __enter__(self) -> "GraphQLBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.execute()
+
+    def add(
+        self,
+        kind: str,
+        field: str,
+        arguments: str,
+        variables: Dict[str, Any],
+        selection: str,
+        transform: Optional[Callable[[Any], Any]] = None,
+        types: Dict[str, str] = _VARIABLE_TYPES,
+    ) -> Deferred:
+        """Queue one root field.
+
+        Args:
+            kind: ``"query"`` or ``"mutation"``
+            field: Root field name, e.g. ``todo_by_pk``
+            arguments: Argument list referencing ``$variables`` (without parentheses)
+            variables: Values for the variables in ``arguments``
+            selection: Selection set contents
+            transform: Applied to the field's data to produce the result
+            types: GraphQL type of each variable, as the field's arguments declare it
+
+        Returns:
+            Deferred result, available once the batch has executed
+        """
+        if kind not in ("query", "mutation"):
+            raise ValueError(f"Unsupported operation kind: {kind}")
+        key = None
+        if kind == "query":
+            key = (field, arguments, tuple(sorted(variables.items())), selection)
+            if key in self._queries:
+                return self._queries[key].deferred
+        operation = _Operation(kind, field, arguments, variables, types, selection, transform)
+        self._operations.append(operation)
+        if key is not None:
+            self._queries[key] = operation
+        return operation.deferred
+
+    # -------- common operations --------
+    def todo_by_pk(self, todo_id: int, fields: str) -> Deferred:
+        """Queue a single todo lookup; the result is the todo or None."""
+        return self.add("query", "todo_by_pk", "id: $id", {"id": todo_id}, fields)
+
+    def list_version(self, oid: str) -> Deferred:
+        """Queue a list version read (see ``GraphQLClient.get_list_version``)."""
+        return self.add(
+            "query", "todo_version_by_pk", "oid: $oid", {"oid": oid}, "max_version todo_count", _version_from_row
+        )
+
+    def todos_page(
+        self,
+        oid: str,
+        first: int,
+        after: Optional[str] = None,
+        order_by: Tuple[Tuple[str, str], ...] = TODO_LIST_ORDER,
+        fields: Optional[str] = None,
+    ) -> Deferred:
+        """Queue a page read (see ``GraphQLClient.get_todos_page``)."""
+        arguments = f"filter: {{ oid: {{ eq: $oid }} }}, {_order_argument(order_by)}first: $first"
+        variables: Dict[str, Any] = {"oid": oid, "first": first}
+        if after:
+            arguments += ", after: $after"
+            variables["after"] = after
+        selection = f"items {{ {fields or todo_fields('list')} }} endCursor hasNextPage"
+        return self.add("query", "todos", arguments, variables, selection, _page_from_root)
+
+    def group_counts(self, oid: str, today: str) -> Deferred:
+        """Queue a group count read (see ``GraphQLClient.get_group_counts``)."""
+        return self.add(
+            "query", "executetodo_group_counts", "oid: $oid, today: $today", {"oid": oid, "today": today},
+            " ".join(GROUP_COUNT_FIELDS), _counts_from_rows,
+        )
+
+    def create_todo(self, fields: str, **item: Any) -> Deferred:
+        """Queue a create (``item`` must include ``name`` and ``oid``); the result is the new todo."""
+        unknown = set(item) - set(_CREATE_VARIABLE_TYPES)
+        if unknown:
+            raise ValueError(f"Unsupported todo fields: {sorted(unknown)}")
+        values = ", ".join(f"{name}: ${name}" for name in item)
+        return self.add("mutation", "createtodo", f"item: {{ {values} }}", item, fields, types=_CREATE_VARIABLE_TYPES)
+
+    def update_todo(self, todo_id: int, fields: str, **changes: Any) -> Deferred:
+        """Queue an update of the given columns; the result is the updated todo or None."""
+        unknown = set(changes) - set(_VARIABLE_TYPES)
+        if unknown:
+            raise ValueError(f"Unsupported todo fields: {sorted(unknown)}")
+        item = ", ".join(f"{name}: ${name}" for name in changes)
+        return self.add("mutation", "updatetodo", f"id: $id, item: {{ {item} }}", {"id": todo_id, **changes}, fields)
+
+    def delete_todo(self, todo_id: int) -> Deferred:
+        """Queue a delete; the result is True if a row was deleted."""
+        return self.add("mutation", "deletetodo", "id: $id", {"id": todo_id}, "id", lambda row: row is not None)
+
+    # -------- execution --------
+    def execute(self) -> None:
+        """Send every queued operation and resolve its ``Deferred``.
+
+        Failures are reported per operation through ``Deferred.result``;
+        this method itself does not raise.
+        """
+        operations, self._operations, self._queries = self._operations, [], {}
+        kinds = list(dict.fromkeys(op.kind for op in operations))
+        for kind in kinds:
+            same_kind = [op for op in operations if op.kind == kind]
+            for start in range(0, len(same_kind), self.max_fields):
+                self._send(kind, same_kind[start:start + self.max_fields])
+
+    def _send(self, kind: str, operations: List[_Operation]) -> None:
+        definitions: List[str] = []
+        fields: List[str] = []
+        variables: Dict[str, Any] = {}
+        for n, op in enumerate(operations):
+            alias = f"op{n}"
+            for name, value in op.variables.items():
+                definitions.append(f"${alias}_{name}: {op.types[name]}")
+                variables[f"{alias}_{name}"] = value
+            arguments = _VARIABLE_RE.sub(lambda m: f"${alias}_{m.group(1)}", op.arguments)
+            fields.append(f"{alias}: {op.field}({arguments}) {{ {op.selection} }}")
+        signature = f"({', '.join(definitions)})" if definitions else ""
+        document = f"{kind} Batch{signature} {{\n    " + "\n    ".join(fields) + "\n}"
+
+        try:
+            response = self.client.execute_query(document, variables)
+        except RuntimeError as e:
+            for op in operations:
+                op.deferred._resolve(error=e)
+            return
+        data = response.get("data") or {}
+        errors: Dict[str, str] = {}
+        general_error = None
+        for error in response.get("errors") or []:
+            path = error.get("path") or []
+            message = error.get("message", "Unknown error")
+            if path and isinstance(path[0], str):
+                errors.setdefault(path[0], message)
+            elif general_error is None:
+                general_error = message
+        for n, op in enumerate(operations):
+            alias = f"op{n}"
+            message = errors.get(alias) or (general_error if data.get(alias) is None else None)
+            if message is not None:
+                op.deferred._resolve(error=RuntimeError(f"GraphQL {op.field} failed: {message}"))
+                continue
+            value = data.get(alias)
+            try:
+                op.deferred._resolve(op.transform(value) if op.transform else value)
+            except Exception as e:  # a bad payload fails only its own operation
+                op.deferred._resolve(error=RuntimeError(f"Invalid {op.field} result: {e}"))
+
 
 class GraphQLClient:
     """Client for making GraphQL requests to the Data API Builder API."""
@@ -22,6 +354,10 @@ class GraphQLClient:
         self.get_token = get_token_func
         self.timeout = timeout
     
+    def batch(self, max_fields: int = 50) -> GraphQLBatch:
+        """Start a batch of operations sent together (see ``GraphQLBatch``)."""
+        return GraphQLBatch(self, max_fields=max_fields)
+    
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with authentication.
         
@@ -77,47 +413,236 @@ class GraphQLClient:
             logger.error("[GraphQLClient] Request exception: %s", e)
             raise RuntimeError(f"API request failed: {str(e)}")
     
-    def get_todos_by_oid(self, oid: str) -> List[Dict[str, Any]]:
-        """Get all todos for a user by OID.
+    def get_open_todos_due_page(
+        self, due_from: str, fields: str, first: int = 1000, after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get one page of open todos of every user due on or after a date, in id order.
+
+        Needs the app-only token (no ``oid`` filter).
+
+        Args:
+            due_from: Earliest due date (``YYYY-MM-DD``)
+            fields: Selection for each item
+            first: Maximum number of items in the page
+            after: Cursor returned as ``end_cursor`` by the previous page
+
+        Returns:
+            Dictionary with ``items``, ``end_cursor`` and ``has_next_page``
+
+        Raises:
+            RuntimeError: If the request fails
+        """
+        query = f"""
+        query OpenTodosDue($due_from: String!, $first: Int, $after: String) {{
+            todos(filter: {{ and: [{{ completed: {{ eq: false }} }}, {{ due_date: {{ gte: $due_from }} }}] }}, {_order_argument(TODO_ID_ORDER)}first: $first, after: $after) {{
+                items {{ {fields} }}
+                endCursor
+                hasNextPage
+            }}
+        }}
+        """
+        variables: Dict[str, Any] = {"due_from": due_from, "first": first}
+        if after:
+            variables["after"] = after
+        response = self.execute_query(query, variables)
+        if response.get("errors"):
+            raise RuntimeError(f"GraphQL query failed: {response['errors'][0].get('message', 'Unknown error')}")
+        return _page_from_root((response.get("data") or {}).get("todos"))
+
+    def get_todos_page(
+        self,
+        oid: str,
+        first: int = 50,
+        after: Optional[str] = None,
+        order_by: Tuple[Tuple[str, str], ...] = TODO_LIST_ORDER,
+        fields: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get one page of a user's todos using DAB keyset pagination.
         
         Args:
             oid: User's object ID
+            first: Maximum number of items in the page
+            after: Cursor returned as ``end_cursor`` by the previous page
+                (only valid with the same ``order_by``)
+            order_by: ``(column, "ASC"|"DESC")`` pairs sorted on in SQL
+            fields: Selection for each item (default ``todo_fields("list")``)
             
         Returns:
-            List of todo dictionaries
+            Dictionary with ``items``, ``end_cursor`` and ``has_next_page``
+            
+        Raises:
+            RuntimeError: If the request fails
         """
-        query = """
-        {
-            todos(filter: { oid: { eq: "%s" } }) {
-                items {
-                    id
-                    name
-                    recommendations_json
-                    notes
-                    priority
-                    completed
-                    due_date
-                    oid
-                }
+        order_arg = _order_argument(order_by)
+        query = f"""
+        query TodosPage($oid: String!, $first: Int, $after: String) {{
+            todos(filter: {{ oid: {{ eq: $oid }} }}, {order_arg}first: $first, after: $after) {{
+                items {{ {fields or todo_fields("list")} }}
+                endCursor
+                hasNextPage
+            }}
+        }}
+        """
+        variables: Dict[str, Any] = {"oid": oid, "first": first}
+        if after:
+            variables["after"] = after
+        
+        response = self.execute_query(query, variables)
+        if response.get("errors"):
+            raise RuntimeError(f"GraphQL query failed: {response['errors'][0].get('message', 'Unknown error')}")
+        return _page_from_root((response.get("data") or {}).get("todos"))
+    
+    def get_archived_todos_page(self, oid: str, first: int = 50, after: Optional[str] = None) -> Dict[str, Any]:
+        """Get one page of a user's archived todos, most recently completed first.
+        
+        Args:
+            oid: User's object ID
+            first: Maximum number of items in the page
+            after: Cursor returned as ``end_cursor`` by the previous page
+            
+        Returns:
+            Dictionary with ``items``, ``end_cursor`` and ``has_next_page``
+            
+        Raises:
+            RuntimeError: If the request fails or the entity is not available
+        """
+        query = f"""
+        query ArchivedTodosPage($oid: String!, $first: Int, $after: String) {{
+            todo_archives(filter: {{ oid: {{ eq: $oid }} }}, {_order_argument(ARCHIVE_ORDER)}first: $first, after: $after) {{
+                items {{ {todo_fields("archive")} }}
+                endCursor
+                hasNextPage
+            }}
+        }}
+        """
+        variables: Dict[str, Any] = {"oid": oid, "first": first}
+        if after:
+            variables["after"] = after
+        response = self.execute_query(query, variables)
+        if response.get("errors"):
+            raise RuntimeError(f"GraphQL query failed: {response['errors'][0].get('message', 'Unknown error')}")
+        return _page_from_root((response.get("data") or {}).get("todo_archives"))
+    
+    def archive_completed_todos(self, older_than_days: int, oid: Optional[str] = None, batch_size: int = 1000) -> int:
+        """Move completed todos older than a number of days to the archive.
+        
+        Runs the ``archive_completed_todos`` stored procedure, which moves
+        rows from ``dbo.todo`` to ``dbo.todo_archive`` in transactions of
+        ``batch_size`` rows.
+        
+        Args:
+            older_than_days: Only todos completed at least this many days ago
+            oid: Only this user's todos; None archives every user's (needs
+                the app-only token)
+            batch_size: Rows moved per transaction
+            
+        Returns:
+            Number of todos archived
+            
+        Raises:
+            RuntimeError: If the request fails or the procedure is not available
+        """
+        mutation = """
+        mutation ArchiveCompletedTodos($older_than_days: Int!, $oid: String, $batch_size: Int!) {
+            executearchive_completed_todos(older_than_days: $older_than_days, oid: $oid, batch_size: $batch_size) {
+                archived
             }
         }
-        """ % oid
+        """
+        variables = {"older_than_days": older_than_days, "oid": oid, "batch_size": batch_size}
+        response = self.execute_query(mutation, variables)
+        if response.get("errors"):
+            raise RuntimeError(f"GraphQL mutation failed: {response['errors'][0].get('message', 'Unknown error')}")
+        rows = (response.get("data") or {}).get("executearchive_completed_todos") or []
+        return int(rows[0].get("archived") or 0) if rows else 0
+    
+    def get_todos_by_oid(self, oid: str, first: Optional[int] = None, after: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get a user's todos by OID.
         
+        Without ``first``, every page is followed so the full list is
+        returned (a bare DAB query stops at its default page size).
+        
+        Args:
+            oid: User's object ID
+            first: Optional page size; only that one page is returned
+            after: Optional cursor to start after
+            
+        Returns:
+            List of todo dictionaries
+        """
         try:
-            response = self.execute_query(query)
-            data = response.get("data", {})
-            todos_root = data.get("todos", {})
-            items = todos_root.get("items", [])
-            return items if items is not None else []
+            if first is not None:
+                return self.get_todos_page(oid, first=first, after=after)["items"]
+            items: List[Dict[str, Any]] = []
+            cursor = after
+            while True:
+                page = self.get_todos_page(oid, first=100, after=cursor)
+                items.extend(page["items"])
+                if not page["has_next_page"] or not page["end_cursor"]:
+                    return items
+                cursor = page["end_cursor"]
         except Exception as e:
             logger.error("[GraphQLClient] Failed to get todos for OID %s: %s", oid, e)
             return []
     
-    def get_todo_by_id(self, todo_id: int) -> Optional[Dict[str, Any]]:
+    def get_list_version(self, oid: str) -> str:
+        """Get a token that changes whenever the user's todo list changes.
+        
+        Reads the ``todo_version`` view entity: the highest ``row_version``
+        among the user's todos and their count (see
+        scripts/create-version-view.sql).
+        
+        Args:
+            oid: User's object ID
+            
+        Returns:
+            ``"<max_version>:<count>"`` (``"0:0"`` for a user without todos)
+            
+        Raises:
+            RuntimeError: If the request fails or the entity is not available
+        """
+        query = """
+        query TodoVersion($oid: String!) {
+            todo_version_by_pk(oid: $oid) {
+                max_version
+                todo_count
+            }
+        }
+        """
+        response = self.execute_query(query, {"oid": oid})
+        if response.get("errors"):
+            raise RuntimeError(f"GraphQL query failed: {response['errors'][0].get('message', 'Unknown error')}")
+        return _version_from_row((response.get("data") or {}).get("todo_version_by_pk"))
+    
+    def get_group_counts(self, oid: str, today: str) -> Dict[str, int]:
+        """Count a user's todos per list group with the ``todo_group_counts`` procedure.
+        
+        Args:
+            oid: User's object ID
+            today: Date (``YYYY-MM-DD``) that decides overdue, today and upcoming
+            
+        Returns:
+            Count for each name in ``GROUP_COUNT_FIELDS``
+            
+        Raises:
+            RuntimeError: If the request fails
+        """
+        query = f"""
+        query TodoGroupCounts($oid: String!, $today: String!) {{
+            executetodo_group_counts(oid: $oid, today: $today) {{ {" ".join(GROUP_COUNT_FIELDS)} }}
+        }}
+        """
+        response = self.execute_query(query, {"oid": oid, "today": today})
+        if response.get("errors"):
+            raise RuntimeError(f"GraphQL query failed: {response['errors'][0].get('message', 'Unknown error')}")
+        return _counts_from_rows((response.get("data") or {}).get("executetodo_group_counts"))
+    
+    def get_todo_by_id(self, todo_id: int, view: str = "detail") -> Optional[Dict[str, Any]]:
         """Get a single todo by ID.
         
         Args:
             todo_id: The todo item ID
+            view: Field set to fetch (see ``TODO_FIELD_SETS``)
             
         Returns:
             Todo dictionary or None if not found
@@ -125,19 +650,10 @@ class GraphQLClient:
         Raises:
             RuntimeError: If the request fails
         """
-        query = """
-        query Todo_by_pk($id: Int!) {
-            todo_by_pk(id: $id) {
-                id
-                name
-                recommendations_json
-                notes
-                priority
-                completed
-                due_date
-                oid
-            }
-        }
+        query = f"""
+        query Todo_by_pk($id: Int!) {{
+            todo_by_pk(id: $id) {{ {todo_fields(view)} }}
+        }}
         """
         variables = {"id": todo_id}
         
@@ -155,19 +671,10 @@ class GraphQLClient:
         Returns:
             Created todo dictionary or None if creation fails
         """
-        mutation = """
-        mutation Createtodo($name: String!, $oid: String!) {
-            createtodo(item: {name: $name, oid: $oid}) {
-                id
-                name
-                recommendations_json
-                notes
-                priority
-                completed
-                due_date
-                oid
-            }
-        }
+        mutation = f"""
+        mutation Createtodo($name: String!, $oid: String!) {{
+            createtodo(item: {{name: $name, oid: $oid}}) {{ {todo_fields("detail")} }}
+        }}
         """
         variables = {
             "name": name,
@@ -226,15 +733,7 @@ class GraphQLClient:
         mutation UpdateTodo($id: Int!, $name: String, $due_date: String, $notes: String, $priority: Int, $completed: Boolean, $recommendations_json: String) {{
             updatetodo(id: $id, item: {{
                 {item_str}
-            }}) {{
-                id
-                name
-                due_date
-                notes
-                priority
-                completed
-                recommendations_json
-            }}
+            }}) {{ {todo_fields("detail")} }}
         }}
         """
         
@@ -259,6 +758,44 @@ class GraphQLClient:
             logger.error("[GraphQLClient] Failed to update todo %d: %s", todo_id, e)
             return None
     
+    def set_todo_completed(
+        self, todo_id: int, oid: str, completed: bool
+    ) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Set a todo's completed flag if it belongs to ``oid``, in one write.
+        
+        Runs the ``set_todo_completed`` stored procedure, whose ``UPDATE`` is
+        filtered by both id and owner, so no read is needed to check ownership.
+        The procedure also returns the owner's list version after the update.
+        
+        Args:
+            todo_id: The todo item ID
+            oid: Owner's object ID
+            completed: New completion state
+            
+        Returns:
+            ``(todo, version)``: the updated todo (``list`` fields) and the list
+            version it left behind, or None if no todo with that id belongs to ``oid``
+            
+        Raises:
+            RuntimeError: If the request fails or the procedure is not available
+        """
+        mutation = """
+        mutation SetTodoCompleted($id: Int!, $oid: String!, $completed: Boolean!) {
+            executeset_todo_completed(id: $id, oid: $oid, completed: $completed) {
+                id name priority completed due_date max_version todo_count
+            }
+        }
+        """
+        response = self.execute_query(mutation, {"id": todo_id, "oid": oid, "completed": completed})
+        if response.get("errors"):
+            raise RuntimeError(f"GraphQL mutation failed: {response['errors'][0].get('message', 'Unknown error')}")
+        rows = (response.get("data") or {}).get("executeset_todo_completed") or []
+        if not rows:
+            return None
+        todo = dict(rows[0])
+        version = _version_from_row({"max_version": todo.pop("max_version", None), "todo_count": todo.pop("todo_count", None)})
+        return todo, version
+    
     def delete_todo(self, todo_id: int) -> bool:
         """Delete a todo item.
         
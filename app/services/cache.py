@@ -1,63 +1,658 @@
 """Simple caching layer for todos."""
+import itertools
+import os
 import time
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from threading import Lock
 from logging import getLogger
 
+from services.search import TodoSearchIndex
+from services.views import GroupedView, count_groups, todo_group
+
 logger = getLogger(__name__)
 
+# Entry tags are unique within this process; the prefix keeps them from
+# matching tags handed out by another replica or an earlier process
+_TAG_PREFIX = os.urandom(4).hex()
+_generations = itertools.count(1)
+
+# Fields that decide where a todo sits in a GroupedView
+_VIEW_FIELDS = frozenset(("completed", "priority", "due_date"))
+# Fields that decide which group a todo counts towards
+_GROUP_FIELDS = frozenset(("completed", "due_date"))
+
+
+def _after_write(known: Optional[str], version: Optional[str], count_delta: int) -> Optional[str]:
+    """An entry's version after a local write, given the list version read right after it.
+
+    Versions are ``"<max_version>:<count>"`` (``api_client.get_list_version``).
+    The new version is only trusted if the entry was current before the write
+    and the count moved by exactly the write's own ``count_delta``; a create or
+    delete from elsewhere in between shows up as a different count and leaves
+    the version unknown (None), so the next revalidation reloads.
+    """
+    if known is None or version is None:
+        return None
+    try:
+        if int(version.rsplit(":", 1)[1]) != int(known.rsplit(":", 1)[1]) + count_delta:
+            return None
+    except (IndexError, ValueError):
+        return None
+    return version
+
+
+class _Entry:
+    """One user's cached todos: pages keyed by the cursor they start after.
+
+    ``None`` keys the first page. A list stored with ``TodoCache.set`` is a
+    single, final first page. ``index`` maps id -> todo across all cached
+    pages; the page lists and the index share the same dicts. ``version`` is
+    the list version the pages were loaded at, moved forward by local writes
+    that report the version they left behind (None once a change makes it
+    unknown), and ``validated_at`` when it was last confirmed current.
+    ``generation`` changes whenever cached content changes; filling in pages
+    or fields that were not cached before leaves it alone. ``fragments``
+    holds rendered markup per page as ``(variant, html)`` and is emptied
+    with every generation change. ``search`` is the user's full-list search
+    index once one has been attached; writes are applied to it as well, so
+    it lives as long as the entry. ``views`` holds each page's
+    ``GroupedView``, built for one day on first use and then kept in step
+    with item writes; replacing a page drops its view. ``counts`` is
+    ``(today, counts)``: the number of the user's todos in each group across
+    the whole list (not just the cached pages), adjusted by item writes and
+    None once a write it cannot follow makes it unknown.
+    """
+
+    __slots__ = (
+        "pages", "index", "timestamp", "version", "validated_at", "generation", "fragments", "search", "views",
+        "counts",
+    )
+
+    def __init__(self, timestamp: float, version: Optional[str] = None):
+        self.pages: Dict[Optional[str], Dict[str, Any]] = {}
+        self.index: Dict[int, Dict[str, Any]] = {}
+        self.timestamp = timestamp
+        self.version = version
+        self.validated_at = timestamp
+        self.generation = next(_generations)
+        self.fragments: Dict[Optional[str], Tuple[str, str]] = {}
+        self.search: Optional[TodoSearchIndex] = None
+        self.views: Dict[Optional[str], GroupedView] = {}
+        self.counts: Optional[Tuple[str, Dict[str, int]]] = None
+
+    def tag(self) -> str:
+        return f"{_TAG_PREFIX}-{self.generation}"
+
+    def touch(self, local_change: bool = True, version: Optional[str] = None, count_delta: int = 0) -> None:
+        """Record a change to the cached content.
+
+        A local change keeps the entry current only if the write reported the
+        list ``version`` it produced (see ``_after_write``).
+        """
+        self.generation = next(_generations)
+        self.fragments.clear()
+        if local_change:
+            self.version = _after_write(self.version, version, count_delta)
+
+    def count(self, todo: Dict[str, Any], delta: int) -> None:
+        """Move the group count of ``todo`` by ``delta``."""
+        if self.counts is not None:
+            today, counts = self.counts
+            counts[todo_group(todo, today)] += delta
+
+    def group_counts(self, today: str) -> Optional[Dict[str, int]]:
+        """Counts for ``today``, computed from the cached list when it is complete."""
+        if self.counts is None or self.counts[0] != today:
+            todos = self.full_list()
+            self.counts = (today, count_groups(todos, today)) if todos is not None else None
+        return dict(self.counts[1]) if self.counts is not None else None
+
+    def update_todo(self, todo: Dict[str, Any], changes: Dict[str, Any]) -> None:
+        """Patch a cached todo, moving it within the views that hold it and between group counts."""
+        moved = [view for view in self.views.values() if todo.get("id") in view] if _VIEW_FIELDS.intersection(changes) else []
+        regroup = bool(_GROUP_FIELDS.intersection(changes))
+        for view in moved:
+            view.remove(todo["id"])
+        if regroup:
+            self.count(todo, -1)
+        todo.update(changes)
+        if regroup:
+            self.count(todo, 1)
+        for view in moved:
+            view.add(todo)
+
+    def drop_from_views(self, todo_id: int) -> None:
+        for view in self.views.values():
+            view.remove(todo_id)
+
+    def add_page(self, after: Optional[str], page: Dict[str, Any]) -> None:
+        self.views.pop(after, None)
+        old = self.pages.get(after)
+        if old is not None:
+            for todo in old["items"]:
+                self.index.pop(todo.get("id"), None)
+        self.pages[after] = page
+        for todo in page["items"]:
+            if isinstance(todo, dict) and todo.get("id") is not None:
+                self.index[todo["id"]] = todo
+
+    def full_list(self) -> Optional[List[Dict[str, Any]]]:
+        """All todos if the cached pages chain from the first to the last, else None."""
+        page = self.pages.get(None)
+        if page is not None and not page["has_next_page"]:
+            return page["items"]
+        todos: List[Dict[str, Any]] = []
+        seen = set()
+        while page is not None:
+            todos.extend(page["items"])
+            if not page["has_next_page"]:
+                return todos
+            cursor = page["end_cursor"]
+            if cursor is None or cursor in seen:
+                return None
+            seen.add(cursor)
+            page = self.pages.get(cursor)
+        return None
+
 
 class TodoCache:
-    """Simple in-memory cache for todos with TTL."""
-    
-    def __init__(self, ttl_seconds: int = 60):
+    """Simple in-memory cache for todos with TTL.
+
+    Each user's entry holds the pages loaded so far (a full list is one
+    page) plus an id -> todo index, so single items can be looked up without
+    another API round trip.
+
+    With ``revalidate_seconds`` set, an entry older than that must be checked
+    against the list version in the database (``revalidate``) before reuse;
+    matching entries live on until ``ttl_seconds``, others are dropped.
+    """
+
+    def __init__(self, ttl_seconds: int = 60, revalidate_seconds: Optional[int] = None):
         """Initialize the cache.
-        
+
         Args:
             ttl_seconds: Time to live for cache entries in seconds
+            revalidate_seconds: Seconds after which an entry needs revalidating
+                (None: entries are trusted until they expire)
         """
-        self._cache: Dict[str, tuple[List[Dict[str, Any]], float]] = {}
+        self._cache: Dict[str, _Entry] = {}
         self._lock = Lock()
         self.ttl = ttl_seconds
-    
+        self.revalidate_seconds = revalidate_seconds
+
+    def _entry(self, key: str) -> Optional[_Entry]:
+        """Return the live entry for a key (caller holds the lock)."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        # Check if expired
+        if time.time() > entry.timestamp + self.ttl:
+            del self._cache[key]
+            logger.debug("[TodoCache] Cache expired for key: %s", key)
+            return None
+        return entry
+
+    def needs_revalidation(self, key: str) -> bool:
+        """Whether a cached entry exists but has not been validated recently.
+
+        Args:
+            key: Cache key (typically user OID)
+        """
+        if self.revalidate_seconds is None:
+            return False
+        with self._lock:
+            entry = self._entry(key)
+            return entry is not None and time.time() - entry.validated_at >= self.revalidate_seconds
+
+    def revalidate(self, key: str, version: Optional[str]) -> bool:
+        """Keep the entry if it was loaded at ``version``, otherwise drop it.
+
+        Args:
+            key: Cache key (typically user OID)
+            version: Current list version from the database (None if unknown)
+
+        Returns:
+            True if the entry is still current
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                return False
+            if version is not None and entry.version == version:
+                entry.validated_at = time.time()
+                logger.debug("[TodoCache] Revalidated key: %s (version: %s)", key, version)
+                return True
+            del self._cache[key]
+            logger.debug("[TodoCache] Version changed for key: %s (%s -> %s)", key, entry.version, version)
+            return False
+
+    def tag(self, key: str) -> Optional[str]:
+        """Opaque tag that changes whenever the cached todos for a key change.
+
+        Read it before the todos a response is built from; a change in between
+        then only makes the tag older than the content, never newer.
+
+        Args:
+            key: Cache key (typically user OID)
+
+        Returns:
+            The tag, or None if nothing is cached for the key
+        """
+        with self._lock:
+            entry = self._entry(key)
+            return entry.tag() if entry is not None else None
+
     def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
         """Get cached todos for a key.
-        
+
         Args:
             key: Cache key (typically user OID)
-            
+
         Returns:
-            List of todos or None if not cached or expired
+            List of todos or None if not cached, expired or only partly loaded
         """
         with self._lock:
-            if key not in self._cache:
-                return None
-            
-            todos, timestamp = self._cache[key]
-            
-            # Check if expired
-            if time.time() > timestamp + self.ttl:
-                del self._cache[key]
-                logger.debug("[TodoCache] Cache expired for key: %s", key)
+            entry = self._entry(key)
+            todos = entry.full_list() if entry is not None else None
+            if todos is None:
                 return None
-            
             logger.debug("[TodoCache] Cache hit for key: %s", key)
             return todos
-    
+
+    def get_page(self, key: str, after: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get a cached page of todos.
+
+        Args:
+            key: Cache key (typically user OID)
+            after: Cursor the page starts after (None for the first page)
+
+        Returns:
+            Dictionary with ``items``, ``end_cursor`` and ``has_next_page`` or None
+        """
+        with self._lock:
+            entry = self._entry(key)
+            page = entry.pages.get(after) if entry is not None else None
+            logger.debug("[TodoCache] Page %s for key: %s (after: %s)", "hit" if page else "miss", key, after)
+            return page
+
+    def grouped_snapshot(
+        self, key: str, after: Optional[str], today: str
+    ) -> Optional[Tuple[List[Tuple[str, str, List[Dict[str, Any]]]], str]]:
+        """Get a cached page as ``GroupedView.groups()`` together with the entry's tag.
+
+        The view is built on the first call for a page and day and reused
+        (it follows item writes) until the page is replaced or the day changes.
+        Both are read under one lock, so anything built from the groups is at
+        least as new as the tag (items are only ever patched forward).
+
+        Args:
+            key: Cache key (typically user OID)
+            after: Cursor the page starts after (None for the first page)
+            today: Current date (``YYYY-MM-DD``) the groups are computed for
+
+        Returns:
+            ``(groups, tag)`` or None if the page is not cached
+        """
+        with self._lock:
+            entry = self._entry(key)
+            page = entry.pages.get(after) if entry is not None else None
+            if page is None:
+                return None
+            view = entry.views.get(after)
+            if view is None or view.today != today:
+                view = entry.views[after] = GroupedView(page["items"], today)
+            return view.groups(), entry.tag()
+
+    def group_counts(self, key: str, today: str) -> Optional[Dict[str, int]]:
+        """Get the number of the key's todos in each list group.
+
+        Args:
+            key: Cache key (typically user OID)
+            today: Current date (``YYYY-MM-DD``) the groups are computed for
+
+        Returns:
+            Count per group name, or None if not known for ``today`` (nothing
+            was stored for that day and the cached pages are not the full list)
+        """
+        with self._lock:
+            entry = self._entry(key)
+            return entry.group_counts(today) if entry is not None else None
+
+    def set_group_counts(self, key: str, today: str, counts: Dict[str, int], tag: str) -> bool:
+        """Store group counts read from the database after ``tag``.
+
+        Args:
+            key: Cache key (typically user OID)
+            today: Date the counts were computed for
+            counts: Count per group name
+            tag: ``tag(key)`` read before the counts were loaded
+
+        Returns:
+            False (nothing stored) if the entry changed in the meantime
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None or entry.tag() != tag:
+                return False
+            entry.counts = (today, dict(counts))
+            # Markup and ETags built without the counts are out of date now
+            entry.touch(local_change=False)
+            return True
+
+    def get_fragment(self, key: str, after: Optional[str], variant: str) -> Optional[str]:
+        """Get markup rendered from a cached page.
+
+        Args:
+            key: Cache key (typically user OID)
+            after: Cursor the page starts after (None for the first page)
+            variant: Other input the markup depends on (e.g. the current date)
+
+        Returns:
+            The markup, or None if the page changed since it was rendered
+        """
+        with self._lock:
+            entry = self._entry(key)
+            fragment = entry.fragments.get(after) if entry is not None else None
+            if fragment is None or fragment[0] != variant:
+                return None
+            return fragment[1]
+
+    def set_fragment(self, key: str, after: Optional[str], variant: str, html: str, tag: str) -> bool:
+        """Store markup rendered from a ``grouped_snapshot``.
+
+        Args:
+            key: Cache key (typically user OID)
+            after: Cursor the page starts after (None for the first page)
+            variant: Other input the markup depends on
+            html: The rendered markup
+            tag: Tag returned with the snapshot the markup was rendered from
+
+        Returns:
+            False (nothing stored) if the entry changed since the snapshot
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None or entry.tag() != tag or after not in entry.pages:
+                return False
+            entry.fragments[after] = (variant, html)
+            return True
+
+    def has_search_index(self, key: str) -> bool:
+        """Whether a search index is attached to the key's entry."""
+        with self._lock:
+            entry = self._entry(key)
+            return entry is not None and entry.search is not None
+
+    def set_search_index(self, key: str, index: TodoSearchIndex, tag: str) -> bool:
+        """Attach a search index built from todos read after ``tag``.
+
+        Args:
+            key: Cache key (typically user OID)
+            index: Index over all of the user's todos
+            tag: ``tag(key)`` read before the todos were loaded
+
+        Returns:
+            False (nothing attached) if the entry changed in the meantime
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None or entry.tag() != tag:
+                return False
+            entry.search = index
+            logger.debug("[TodoCache] Search index set for key: %s (count: %d)", key, len(index))
+            return True
+
+    def search(self, key: str, query: str, **filters: Any) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Query the key's search index (see ``TodoSearchIndex.search``).
+
+        Returns:
+            ``(rows, total)`` or None if no index is attached
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None or entry.search is None:
+                return None
+            return entry.search.search(query, **filters)
+
+    def get_item(self, key: str, todo_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single cached todo by id.
+
+        Args:
+            key: Cache key (typically user OID)
+            todo_id: The todo item ID
+
+        Returns:
+            The cached todo or None if no cached page holds the id
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                return None
+            todo = entry.index.get(todo_id)
+            logger.debug("[TodoCache] Item %s for key: %s (id: %s)", "hit" if todo else "miss", key, todo_id)
+            return todo
+
     def set(self, key: str, todos: List[Dict[str, Any]]) -> None:
         """Set cached todos for a key.
-        
+
         Args:
             key: Cache key (typically user OID)
             todos: List of todos to cache
         """
+        entry = _Entry(time.time())
+        entry.add_page(None, {"items": todos, "end_cursor": None, "has_next_page": False})
         with self._lock:
-            self._cache[key] = (todos, time.time())
+            self._cache[key] = entry
             logger.debug("[TodoCache] Cache set for key: %s (count: %d)", key, len(todos))
-    
+
+    def set_page(
+        self,
+        key: str,
+        after: Optional[str],
+        todos: List[Dict[str, Any]],
+        end_cursor: Optional[str],
+        has_next_page: bool,
+        version: Optional[str] = None,
+        counts: Optional[Tuple[str, Dict[str, int]]] = None,
+    ) -> Dict[str, Any]:
+        """Cache one page of todos.
+
+        Storing the first page (``after=None``) starts a fresh entry; later
+        pages are added to the existing entry and expire with it.
+
+        Args:
+            key: Cache key (typically user OID)
+            after: Cursor the page starts after (None for the first page)
+            todos: Items in the page
+            end_cursor: Cursor for the next page
+            has_next_page: Whether more items follow
+            version: List version read before the first page was fetched
+            counts: ``(today, counts)`` group counts read with the first page
+
+        Returns:
+            The cached page
+        """
+        page = {"items": todos, "end_cursor": end_cursor if has_next_page else None, "has_next_page": has_next_page}
+        with self._lock:
+            entry = self._entry(key) if after is not None else None
+            if entry is None:
+                if after is not None:
+                    # Without the first page there is nothing to chain onto
+                    return page
+                entry = self._cache[key] = _Entry(time.time(), version)
+                if counts is not None:
+                    entry.counts = (counts[0], dict(counts[1]))
+            elif after in entry.pages:
+                entry.touch(local_change=False)
+            entry.add_page(after, page)
+            logger.debug("[TodoCache] Page set for key: %s (after: %s, count: %d)", key, after, len(todos))
+        return page
+
+    def update_item(
+        self, key: str, todo_id: int, changes: Dict[str, Any], changed: bool = True, version: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Patch a cached todo in place (its page and the index share the item).
+
+        Args:
+            key: Cache key (typically user OID)
+            todo_id: The todo item ID
+            changes: Fields to overwrite
+            changed: False when ``changes`` are columns just read from the
+                database rather than a local edit (the version stays known)
+            version: List version read right after the write (None if unknown)
+
+        Returns:
+            The updated todo or None if no cached page holds the id
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                return None
+            if entry.search is not None:
+                entry.search.update(todo_id, changes)
+            todo = entry.index.get(todo_id)
+            if todo is None:
+                if changed:
+                    entry.counts = None
+                return None
+            if changed or any(field in todo and todo[field] != value for field, value in changes.items()):
+                entry.touch(local_change=changed, version=version)
+            entry.update_todo(todo, changes)
+            logger.debug("[TodoCache] Item patched for key: %s (id: %s)", key, todo_id)
+            return todo
+
+    def update_items(
+        self, key: str, todo_ids: List[int], changes: Dict[str, Any], version: Optional[str] = None
+    ) -> bool:
+        """Apply the same local edit to several cached todos at once.
+
+        Args:
+            key: Cache key (typically user OID)
+            todo_ids: The todo item IDs
+            changes: Fields to overwrite on each
+            version: List version read right after the writes (None if unknown)
+
+        Returns:
+            False if any id is not in a cached page (the others are still patched)
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                return False
+            found = 0
+            for todo_id in todo_ids:
+                if entry.search is not None:
+                    entry.search.update(todo_id, changes)
+                todo = entry.index.get(todo_id)
+                if todo is not None:
+                    entry.update_todo(todo, changes)
+                    found += 1
+            if found < len(todo_ids):
+                entry.counts = None
+            if found:
+                entry.touch(version=version)
+            logger.debug("[TodoCache] %d items patched for key: %s", found, key)
+            return found == len(todo_ids)
+
+    def remove_items(self, key: str, todo_ids: List[int], version: Optional[str] = None) -> bool:
+        """Remove several deleted todos from the cached pages at once.
+
+        Args:
+            key: Cache key (typically user OID)
+            todo_ids: The todo item IDs (each one deleted in the database)
+            version: List version read right after the deletes (None if unknown)
+
+        Returns:
+            False if any id is not in a cached page (the others are still removed)
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                return False
+            if entry.search is not None:
+                for todo_id in todo_ids:
+                    entry.search.remove(todo_id)
+            popped = [todo for todo in (entry.index.pop(todo_id, None) for todo_id in todo_ids) if todo is not None]
+            removed = {id(todo) for todo in popped}
+            for todo in popped:
+                entry.count(todo, -1)
+            if len(popped) < len(todo_ids):
+                entry.counts = None
+            for todo_id in todo_ids:
+                entry.drop_from_views(todo_id)
+            if removed:
+                for page in entry.pages.values():
+                    page["items"][:] = [t for t in page["items"] if id(t) not in removed]
+                entry.touch(version=version, count_delta=-len(todo_ids))
+            logger.debug("[TodoCache] %d items removed for key: %s", len(removed), key)
+            return len(removed) == len(todo_ids)
+
+    def add_item(self, key: str, todo: Dict[str, Any], version: Optional[str] = None) -> bool:
+        """Append a new todo to the cached last page.
+
+        Args:
+            key: Cache key (typically user OID)
+            todo: The new todo (must carry its id)
+            version: List version read right after the create (None if unknown)
+
+        Returns:
+            False if nothing is cached for the key. When the last page has not
+            been loaded yet the item is left to arrive with it.
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None or todo.get("id") is None:
+                return False
+            if entry.search is not None:
+                entry.search.add(todo)
+            entry.count(todo, 1)
+            after, last = next(((a, p) for a, p in entry.pages.items() if not p["has_next_page"]), (None, None))
+            if last is None:
+                entry.touch(version=version, count_delta=1)
+                return True
+            last["items"].append(todo)
+            entry.index[todo["id"]] = todo
+            if after in entry.views:
+                entry.views[after].add(todo)
+            entry.touch(version=version, count_delta=1)
+            logger.debug("[TodoCache] Item added for key: %s (id: %s)", key, todo["id"])
+            return True
+
+    def remove_item(self, key: str, todo_id: int, version: Optional[str] = None) -> bool:
+        """Remove a deleted todo from whichever cached page holds it.
+
+        Args:
+            key: Cache key (typically user OID)
+            todo_id: The todo item ID
+            version: List version read right after the delete (None if unknown)
+
+        Returns:
+            False if no cached page holds the id
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                return False
+            if entry.search is not None:
+                entry.search.remove(todo_id)
+            todo = entry.index.pop(todo_id, None)
+            if todo is None:
+                entry.counts = None
+                return False
+            entry.count(todo, -1)
+            entry.drop_from_views(todo_id)
+            for page in entry.pages.values():
+                if any(t is todo for t in page["items"]):
+                    page["items"][:] = [t for t in page["items"] if t is not todo]
+                    break
+            entry.touch(version=version, count_delta=-1)
+            logger.debug("[TodoCache] Item removed for key: %s (id: %s)", key, todo_id)
+            return True
+
     def invalidate(self, key: str) -> None:
         """Invalidate cache for a key.
-        
+
         Args:
             key: Cache key to invalidate
         """
@@ -65,7 +660,7 @@ class TodoCache:
             if key in self._cache:
                 del self._cache[key]
                 logger.debug("[TodoCache] Cache invalidated for key: %s", key)
-    
+
     def clear(self) -> None:
         """Clear all cache entries."""
         with self._lock:
@@ -77,16 +672,19 @@ class TodoCache:
 _todo_cache: Optional[TodoCache] = None
 
 
-def get_cache(ttl_seconds: int = 60) -> TodoCache:
+def get_cache(ttl_seconds: int = 60, revalidate_seconds: Optional[int] = None) -> TodoCache:
     """Get or create the global todo cache instance.
-    
+
+    The arguments only apply to the call that creates the instance.
+
     Args:
         ttl_seconds: Time to live for cache entries
-        
+        revalidate_seconds: Seconds after which entries need revalidating
+
     Returns:
         TodoCache instance
     """
     global _todo_cache
     if _todo_cache is None:
-        _todo_cache = TodoCache(ttl_seconds=ttl_seconds)
+        _todo_cache = TodoCache(ttl_seconds=ttl_seconds, revalidate_seconds=revalidate_seconds)
     return _todo_cache
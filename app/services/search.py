@@ -0,0 +1,177 @@
+"""In-memory inverted index over one user's todos."""
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# A word in the name counts this many times as much as one in the notes
+NAME_WEIGHT = 2.0
+# Score factor for a query word that only matches the start of a longer word
+PREFIX_WEIGHT = 0.5
+
+# Columns kept per document: what a list row renders plus the filter fields
+_ROW_FIELDS = ("id", "name", "priority", "completed", "due_date")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into case-folded word tokens."""
+    return _TOKEN_RE.findall(text.casefold()) if text else []
+
+
+class TodoSearchIndex:
+    """Token -> {todo id: weight} postings with a sorted vocabulary for prefixes.
+
+    Not thread safe; ``TodoCache`` keeps it on a user's entry and only
+    touches it under the cache lock.
+    """
+
+    def __init__(self, todos: Iterable[Dict[str, Any]] = ()):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+        self._doc_tokens: Dict[int, Tuple[str, ...]] = {}
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._notes: Dict[int, Optional[str]] = {}
+        for todo in todos:
+            self.add(todo)
+        logger.debug("[search] Indexed %d todos, %d tokens", len(self._docs), len(self._vocabulary))
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, todo_id: int) -> bool:
+        return todo_id in self._docs
+
+    def _index(self, todo_id: int) -> None:
+        weights: Dict[str, float] = {}
+        for token in tokenize(self._docs[todo_id].get("name")):
+            weights[token] = weights.get(token, 0.0) + NAME_WEIGHT
+        for token in tokenize(self._notes[todo_id]):
+            weights[token] = weights.get(token, 0.0) + 1.0
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            postings[todo_id] = weight
+        self._doc_tokens[todo_id] = tuple(weights)
+
+    def _unindex(self, todo_id: int) -> None:
+        for token in self._doc_tokens.pop(todo_id, ()):
+            postings = self._postings[token]
+            del postings[todo_id]
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def add(self, todo: Dict[str, Any]) -> None:
+        """Index a todo (replacing any earlier version of it)."""
+        todo_id = todo.get("id")
+        if todo_id is None:
+            return
+        if todo_id in self._docs:
+            self._unindex(todo_id)
+        self._docs[todo_id] = {field: todo.get(field) for field in _ROW_FIELDS}
+        self._notes[todo_id] = todo.get("notes")
+        self._index(todo_id)
+
+    def update(self, todo_id: int, changes: Dict[str, Any]) -> bool:
+        """Apply changed fields to an indexed todo; False if it is not indexed."""
+        doc = self._docs.get(todo_id)
+        if doc is None:
+            return False
+        doc.update((field, value) for field, value in changes.items() if field in _ROW_FIELDS and field != "id")
+        if "name" in changes or "notes" in changes:
+            if "notes" in changes:
+                self._notes[todo_id] = changes["notes"]
+            self._unindex(todo_id)
+            self._index(todo_id)
+        return True
+
+    def remove(self, todo_id: int) -> bool:
+        """Drop a todo from the index; False if it was not indexed."""
+        if self._docs.pop(todo_id, None) is None:
+            return False
+        self._notes.pop(todo_id, None)
+        self._unindex(todo_id)
+        return True
+
+    def _term_scores(self, term: str) -> Dict[int, float]:
+        """Best score per todo among the tokens ``term`` matches exactly or as a prefix."""
+        vocabulary = self._vocabulary
+        position = end = bisect_left(vocabulary, term)
+        while end < len(vocabulary) and vocabulary[end].startswith(term):
+            end += 1
+        total = len(self._docs)
+        scores: Dict[int, float] = {}
+        for token in vocabulary[position:end]:
+            postings = self._postings[token]
+            factor = math.log(1.0 + total / len(postings)) * (1.0 if token == term else PREFIX_WEIGHT)
+            if end - position == 1:
+                # The common case: one token, no best-of to take
+                return {todo_id: weight * factor for todo_id, weight in postings.items()}
+            for todo_id, weight in postings.items():
+                score = weight * factor
+                if score > scores.get(todo_id, 0.0):
+                    scores[todo_id] = score
+        return scores
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        priority: Optional[int] = None,
+        completed: Optional[bool] = None,
+        overdue_before: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Rank the todos matching every word of ``query``.
+
+        Each word matches tokens it equals or starts; a todo scores the sum
+        over the words of its best weighted, idf-scaled match.
+
+        Args:
+            query: Free text; an empty query matches every todo (in id order)
+            limit: Maximum number of rows returned
+            priority: Only todos with this priority
+            completed: Only completed (True) or open (False) todos
+            overdue_before: Only open todos due before this ``YYYY-MM-DD`` date
+
+        Returns:
+            Tuple of (row copies best first, total number of matches)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if terms:
+            scores: Optional[Dict[int, float]] = None
+            for term in terms:
+                term_scores = self._term_scores(term)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    if len(term_scores) < len(scores):
+                        scores, term_scores = term_scores, scores
+                    scores = {todo_id: score + term_scores[todo_id] for todo_id, score in scores.items() if todo_id in term_scores}
+                if not scores:
+                    return [], 0
+            candidates: Dict[int, float] = scores or {}
+        else:
+            candidates = dict.fromkeys(self._docs, 0.0)
+
+        docs = self._docs
+        if priority is not None or completed is not None or overdue_before is not None:
+            def keep(doc: Dict[str, Any]) -> bool:
+                if priority is not None and doc["priority"] != priority:
+                    return False
+                if completed is not None and bool(doc["completed"]) != completed:
+                    return False
+                if overdue_before is not None and (doc["completed"] or not doc["due_date"] or doc["due_date"] >= overdue_before):
+                    return False
+                return True
+            candidates = {todo_id: score for todo_id, score in candidates.items() if keep(docs[todo_id])}
+
+        best = heapq.nsmallest(limit, candidates.items(), key=lambda item: (-item[1], item[0]))
+        return [dict(docs[todo_id]) for todo_id, _ in best], len(candidates)
@@ -0,0 +1,98 @@
+"""Grouped and sorted views of a page of todos, as the list renders them."""
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+# Group name -> heading, in display order; completed items always come last
+GROUPS: Tuple[Tuple[str, str], ...] = (
+    ("overdue", "Overdue"),
+    ("today", "Due today"),
+    ("upcoming", "Upcoming"),
+    ("no_date", "No due date"),
+    ("completed", "Completed"),
+)
+
+
+def todo_group(todo: Dict[str, Any], today: str) -> str:
+    """Name of the group a todo belongs in on ``today`` (``YYYY-MM-DD``)."""
+    if todo.get("completed"):
+        return "completed"
+    due_date = todo.get("due_date")
+    if not due_date:
+        return "no_date"
+    if due_date < today:
+        return "overdue"
+    return "today" if due_date == today else "upcoming"
+
+
+def count_groups(todos: List[Dict[str, Any]], today: str) -> Dict[str, int]:
+    """Number of ``todos`` in each group on ``today``."""
+    counts = {name: 0 for name, _ in GROUPS}
+    for todo in todos:
+        counts[todo_group(todo, today)] += 1
+    return counts
+
+
+# Rank of priority 0 (none): after LOW (3), like the priority_rank column
+NO_PRIORITY_RANK = 4
+
+
+def priority_rank(priority: Optional[int]) -> int:
+    """Sort rank of a priority: High, Medium, Low, then none."""
+    return priority or NO_PRIORITY_RANK
+
+
+def sort_key(todo: Dict[str, Any]) -> Tuple[int, str, int]:
+    """Order within a group: priority rank, then due date, then id.
+
+    This is ``TODO_LIST_ORDER`` without the completed column (a missing date
+    is '', like the due_date_sort column), so rows of later pages appended to
+    a group keep it sorted.
+    """
+    return (priority_rank(todo.get("priority")), todo.get("due_date") or "", todo.get("id") or 0)
+
+
+class GroupedView:
+    """A page of todos split into ``GROUPS`` for one day, each group kept sorted.
+
+    Items are the page's own dicts. ``add`` and ``remove`` move single items,
+    so an edit repositions one row instead of regrouping the page. Not thread
+    safe; ``TodoCache`` only uses it under its lock.
+    """
+
+    __slots__ = ("today", "_groups", "_keys", "_placed")
+
+    def __init__(self, todos: List[Dict[str, Any]], today: str):
+        self.today = today
+        self._groups: Dict[str, List[Dict[str, Any]]] = {name: [] for name, _ in GROUPS}
+        self._keys: Dict[str, List[Tuple[int, str, int]]] = {name: [] for name, _ in GROUPS}
+        self._placed: Dict[int, Tuple[str, Tuple[int, str, int]]] = {}
+        for todo in sorted(todos, key=sort_key):
+            group, key = todo_group(todo, today), sort_key(todo)
+            self._groups[group].append(todo)
+            self._keys[group].append(key)
+            self._placed[todo.get("id")] = (group, key)
+
+    def __contains__(self, todo_id: int) -> bool:
+        return todo_id in self._placed
+
+    def add(self, todo: Dict[str, Any]) -> None:
+        """Insert a todo at its sorted position in its group."""
+        group, key = todo_group(todo, self.today), sort_key(todo)
+        position = bisect_left(self._keys[group], key)
+        self._keys[group].insert(position, key)
+        self._groups[group].insert(position, todo)
+        self._placed[todo.get("id")] = (group, key)
+
+    def remove(self, todo_id: int) -> Optional[Dict[str, Any]]:
+        """Take a todo out of its group; None if the view does not hold it."""
+        placed = self._placed.pop(todo_id, None)
+        if placed is None:
+            return None
+        group, key = placed
+        position = bisect_left(self._keys[group], key)
+        del self._keys[group][position]
+        return self._groups[group].pop(position)
+
+    def groups(self) -> List[Tuple[str, str, List[Dict[str, Any]]]]:
+        """``(name, heading, items)`` for every group in display order (items copied)."""
+        return [(name, heading, list(self._groups[name])) for name, heading in GROUPS]
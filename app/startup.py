@@ -0,0 +1,157 @@
+"""Startup timing and concurrent, cached Key Vault secret resolution."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+from logging import getLogger
+
+from azure.keyvault.secrets import SecretClient
+
+logger = getLogger(__name__)
+
+_KEY_VAULT_SCOPE = "https://vault.azure.net/.default"
+
+
+class StartupTimer:
+    """Records how long each phase of application startup takes.
+
+    Sequential phases are closed with ``mark(name)`` and last from the previous
+    mark. Work running alongside them on other threads (secret fetches,
+    telemetry setup) is recorded separately with ``track(name)`` or ``record``.
+    """
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self._last = self.started_at
+        self._lock = threading.Lock()
+        self._phases: Dict[str, float] = {}
+        self._background: Dict[str, float] = {}
+        self.ready_ms: Optional[float] = None
+
+    def mark(self, name: str) -> float:
+        """Close the phase ``name``; returns its duration in milliseconds."""
+        now = time.perf_counter()
+        elapsed = (now - self._last) * 1000.0
+        with self._lock:
+            self._phases[name] = self._phases.get(name, 0.0) + elapsed
+            self._last = now
+        return elapsed
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        """Record a background task that overlapped the sequential phases."""
+        with self._lock:
+            self._background[name] = elapsed_ms
+
+    @contextmanager
+    def track(self, name: str):
+        """Time the enclosed block as a background task."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000.0)
+
+    def finish(self) -> float:
+        """Mark the app as ready; returns total startup time in milliseconds."""
+        self.ready_ms = (time.perf_counter() - self.started_at) * 1000.0
+        return self.ready_ms
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total_ms": round(self.ready_ms, 1) if self.ready_ms is not None else None,
+                "phases": {name: round(ms, 1) for name, ms in self._phases.items()},
+                "background": {name: round(ms, 1) for name, ms in self._background.items()},
+            }
+
+
+class SecretCache:
+    """Resolves Key Vault secrets concurrently and keeps them for the process lifetime.
+
+    One ``SecretClient`` (and its HTTP connection pool) is shared by all
+    lookups. Missing names are fetched in parallel, bounded by ``timeout``;
+    failures and timeouts resolve to ``None`` and are retried on the next call.
+    """
+
+    def __init__(self, vault_url: str, credential, timeout: float = 10.0, max_workers: int = 4):
+        """Initialize the cache.
+
+        Args:
+            vault_url: Key Vault URL (https://<name>.vault.azure.net)
+            credential: Azure credential used for Key Vault access
+            timeout: Seconds to wait for a batch of secrets
+            max_workers: Maximum concurrent secret fetches
+        """
+        self.vault_url = vault_url
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._credential = credential
+        self._client = SecretClient(vault_url=vault_url, credential=credential)
+        self._lock = threading.Lock()
+        self._values: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+
+    def _fetch(self, name: str) -> Optional[str]:
+        started = time.perf_counter()
+        try:
+            value = self._client.get_secret(
+                name, connection_timeout=self.timeout, read_timeout=self.timeout
+            ).value
+        finally:
+            self.timings[name] = (time.perf_counter() - started) * 1000.0
+        return value
+
+    def get_many(self, names: Iterable[str], timeout: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """Return ``{name: value}`` for ``names``, fetching uncached ones concurrently."""
+        names = list(dict.fromkeys(names))
+        with self._lock:
+            result: Dict[str, Optional[str]] = {n: self._values.get(n) for n in names}
+        missing = [n for n in names if result[n] is None]
+        if not missing:
+            return result
+
+        timeout = self.timeout if timeout is None else timeout
+        # Acquire the vault token once so the parallel fetches do not all race for it
+        try:
+            self._credential.get_token(_KEY_VAULT_SCOPE)
+        except Exception as e:
+            logger.warning("[secrets] Key Vault token acquisition failed: %s: %s", type(e).__name__, e)
+
+        pool = ThreadPoolExecutor(max_workers=min(len(missing), self.max_workers), thread_name_prefix="kv-secret")
+        try:
+            futures = {pool.submit(self._fetch, name): name for name in missing}
+            done, pending = wait(futures, timeout=timeout)
+            for future in done:
+                name = futures[future]
+                try:
+                    value = future.result()
+                except Exception as e:
+                    logger.warning("[secrets] Failed to read secret %s: %s: %s", name, type(e).__name__, e)
+                    continue
+                result[name] = value
+                if value is not None:
+                    with self._lock:
+                        self._values[name] = value
+            for future in pending:
+                logger.warning("[secrets] Timed out after %.1fs reading secret %s", timeout, futures[future])
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return result
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Optional[str]:
+        return self.get_many([name], timeout=timeout)[name]
+
+
+_caches: Dict[str, SecretCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_secret_cache(key_vault_name: str, credential, timeout: float = 10.0) -> SecretCache:
+    """Return the process-wide ``SecretCache`` for a vault (created on first use)."""
+    with _caches_lock:
+        cache = _caches.get(key_vault_name)
+        if cache is None:
+            cache = SecretCache(f"https://{key_vault_name}.vault.azure.net", credential, timeout=timeout)
+            _caches[key_vault_name] = cache
+        return cache
@@ -55,13 +55,14 @@ document.addEventListener("DOMContentLoaded", function() {
     }
 
     const myModal = document.getElementById('confirmModal')
-    const deleteButtons = document.getElementsByClassName('delete-btn');
-    Array.from(deleteButtons).forEach((deleteButton) => {
+    const deleteLink = document.getElementById('deleteLink');
+    const bindDeleteButton = (deleteButton) => {
         deleteButton.addEventListener('click', function(e) {
             e.stopPropagation();
             e.preventDefault();
             const url = this.getAttribute('data-url');
-            document.getElementById('deleteLink').setAttribute('href', url);
+            deleteLink.setAttribute('href', url);
+            deleteLink.setAttribute('data-id', this.getAttribute('data-id'));
             const taskname_paragraph = document.querySelector("p[id='taskName']");
             const taskname = this.getAttribute('data-taskname');
             taskname_paragraph.textContent = taskname;
@@ -70,7 +71,8 @@ document.addEventListener("DOMContentLoaded", function() {
             })
             clearHighlight();
         });
-    });
+    };
+    Array.from(document.getElementsByClassName('delete-btn')).forEach(bindDeleteButton);
     
     const highlightedItemId = localStorage.getItem(HIGHLIGHTEDITEM);
     console.log('highlightedItemId', highlightedItemId);
@@ -97,16 +99,516 @@ document.addEventListener("DOMContentLoaded", function() {
         window.location.href = `${rootUrl}/details/${dataId}`;
     };
 
+    const csrfToken = () => {
+        const meta = document.querySelector("meta[name='csrf-token']");
+        return meta ? meta.getAttribute('content') : '';
+    };
+
+    // JSON API helper: resolves with the parsed body, rejects with the server's error message
+    const apiRequest = (method, path, body) => {
+        const headers = { 'Accept': 'application/json', 'X-CSRFToken': csrfToken() };
+        if (body !== undefined) {
+            headers['Content-Type'] = 'application/json';
+        }
+        return fetch(`${window.location.origin}${path}`, {
+            method: method,
+            headers: headers,
+            credentials: 'same-origin',
+            body: body !== undefined ? JSON.stringify(body) : undefined
+        }).then((response) => response.json().catch(() => ({})).then((data) => {
+            if (!response.ok) {
+                throw new Error(data.error || `status ${response.status}`);
+            }
+            return data;
+        }));
+    };
+
+    // Parse a server-rendered row fragment and wire up its delete button
+    const rowFromHtml = (html) => {
+        const template = document.createElement('template');
+        template.innerHTML = html.trim();
+        const row = template.content.firstElementChild;
+        row.querySelectorAll('.delete-btn').forEach(bindDeleteButton);
+        return row;
+    };
+
+    // Close the details/edit/recommendations panel, as a redirect to / would
+    const closeSidePanel = () => {
+        const panel = document.querySelector('.col-5');
+        if (panel) {
+            panel.replaceChildren();
+        }
+        window.history.replaceState(null, '', '/');
+    };
+
+    const todoList = document.querySelector('ol.list-group');
+
+    // Order within a group, as views.sort_key: priority rank, then due date (none first), then id
+    const rowKey = (row) => [
+        Number(row.getAttribute('data-rank')),
+        row.getAttribute('data-due-date') || '',
+        Number(row.getAttribute('data-id'))
+    ];
+    const compareKeys = (a, b) => {
+        for (let i = 0; i < a.length; i++) {
+            if (a[i] !== b[i]) {
+                return a[i] < b[i] ? -1 : 1;
+            }
+        }
+        return 0;
+    };
+
+    // Rows sit under the heading of their group (data-group), at their sorted position
+    const placeRow = (row) => {
+        const header = todoList.querySelector(`[data-group-header='${row.getAttribute('data-group')}']`);
+        const key = rowKey(row);
+        let next = header ? header.nextElementSibling : null;
+        while (next && !next.hasAttribute('data-group-header') && compareKeys(rowKey(next), key) < 0) {
+            next = next.nextElementSibling;
+        }
+        todoList.insertBefore(row, next);
+    };
+
+    // Show the headings that have rows under them or, by their count over the whole list, rows on later pages
+    const refreshGroupHeaders = () => {
+        todoList.querySelectorAll('[data-group-header]').forEach((header) => {
+            const next = header.nextElementSibling;
+            const count = header.querySelector('[data-group-count]');
+            const hasRows = next && !next.hasAttribute('data-group-header');
+            header.hidden = !hasRows && !(count && Number(count.textContent) > 0);
+        });
+    };
+
+    // Update the heading counts from a write response; without counts (not known to the server) drop them
+    const applyGroupCounts = (counts) => {
+        if (!todoList) {
+            return;
+        }
+        todoList.querySelectorAll('[data-group-header]').forEach((header) => {
+            const count = header.querySelector('[data-group-count]');
+            const value = counts ? counts[header.getAttribute('data-group-header')] : undefined;
+            if (value === undefined) {
+                if (count) {
+                    count.remove();
+                }
+            } else if (count) {
+                count.textContent = value;
+            }
+        });
+        refreshGroupHeaders();
+    };
+
+    // Swap a row for its re-rendered version, moving it if its group or sort position changed
+    const replaceRow = (row, html) => {
+        const updated = rowFromHtml(html);
+        row.remove();
+        placeRow(updated);
+        refreshGroupHeaders();
+    };
+
+    // Infinite scroll: fetch the next page of rows when the sentinel under the list comes into view
+    const moreSentinel = document.getElementById('todo-list-more');
+    if (moreSentinel && todoList && 'IntersectionObserver' in window) {
+        let loading = false;
+        const observer = new IntersectionObserver((entries) => {
+            if (loading || !entries.some((entry) => entry.isIntersecting)) {
+                return;
+            }
+            const cursor = moreSentinel.getAttribute('data-next-cursor');
+            if (!cursor) {
+                return;
+            }
+            loading = true;
+            apiRequest('GET', `/api/todos?format=html&after=${encodeURIComponent(cursor)}`)
+                .then((data) => {
+                    const template = document.createElement('template');
+                    template.innerHTML = data.html || '';
+                    Array.from(template.content.children).forEach((row) => {
+                        // A task added on this page arrives again with its own page; keep one copy
+                        const existing = row.id ? document.getElementById(row.id) : null;
+                        if (existing) {
+                            existing.remove();
+                        }
+                        row.querySelectorAll('.delete-btn').forEach(bindDeleteButton);
+                        placeRow(row);
+                    });
+                    refreshGroupHeaders();
+                    if (data.has_next_page && data.end_cursor) {
+                        moreSentinel.setAttribute('data-next-cursor', data.end_cursor);
+                        // Re-observe so a sentinel that is still visible triggers the next page
+                        observer.unobserve(moreSentinel);
+                        observer.observe(moreSentinel);
+                    } else {
+                        observer.disconnect();
+                        moreSentinel.remove();
+                    }
+                })
+                .catch((error) => {
+                    moreSentinel.textContent = `Could not load more tasks: ${error.message}`;
+                    observer.disconnect();
+                })
+                .finally(() => {
+                    loading = false;
+                });
+        });
+        observer.observe(moreSentinel);
+    }
+
+    // Add: insert the new row instead of redirecting and re-rendering the list
+    const addForm = document.querySelector("form[action='/add']");
+    if (addForm && todoList) {
+        addForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            const input = document.getElementById('todo');
+            const addButton = document.querySelector("button[id='addButton']");
+            addButton.disabled = true;
+            apiRequest('POST', '/api/todos', { name: input.value })
+                .then((data) => {
+                    placeRow(rowFromHtml(data.html));
+                    applyGroupCounts(data.group_counts);
+                    input.value = '';
+                })
+                .catch((error) => {
+                    alert(`Could not add the task: ${error.message}`);
+                    addButton.disabled = input.value.trim() === '';
+                });
+        });
+    }
+
+    // Delete: remove the row in place
+    if (deleteLink) {
+        deleteLink.addEventListener('click', function(e) {
+            const todoId = this.getAttribute('data-id');
+            if (!todoId) {
+                return;
+            }
+            e.preventDefault();
+            apiRequest('DELETE', `/api/todos/${todoId}`)
+                .then((data) => {
+                    const row = document.getElementById(`task-${todoId}`);
+                    if (row) {
+                        row.remove();
+                    }
+                    applyGroupCounts(data.group_counts);
+                    const modal = bootstrap.Modal.getInstance(myModal);
+                    if (modal) {
+                        modal.hide();
+                    }
+                    const edited = document.querySelector("#edit-div input[name='id']");
+                    if (edited && edited.value === todoId) {
+                        closeSidePanel();
+                    }
+                })
+                .catch((error) => alert(`Could not delete the task: ${error.message}`));
+        });
+    }
+
+    // Edit: PATCH the todo and swap in the re-rendered row
+    const editForm = document.querySelector('#edit-div form');
+    if (editForm) {
+        editForm.addEventListener('submit', function(e) {
+            if (e.submitter && e.submitter.getAttribute('formmethod') === 'GET') {
+                return; // Cancel keeps its plain navigation
+            }
+            e.preventDefault();
+            const todoId = editForm.querySelector("input[name='id']").value;
+            const priority = editForm.querySelector("input[name='priority']:checked");
+            apiRequest('PATCH', `/api/todos/${todoId}`, {
+                name: editForm.querySelector("input[name='name']").value,
+                priority: priority ? priority.value : null,
+                due_date: editForm.querySelector("input[name='duedate']").value || null,
+                notes: editForm.querySelector("textarea[name='notes']").value || null,
+                completed: editForm.querySelector("input[name='completed']").checked
+            })
+                .then((data) => {
+                    const row = document.getElementById(`task-${todoId}`);
+                    if (row) {
+                        replaceRow(row, data.html);
+                    }
+                    applyGroupCounts(data.group_counts);
+                    closeSidePanel();
+                })
+                .catch((error) => alert(`Could not update the task: ${error.message}`));
+        });
+    }
+
+    // Search: query the server-side index as the user types and list the matches as links to their details
+    const searchInput = document.getElementById('todo-search');
+    if (searchInput) {
+        const searchResults = document.getElementById('search-results');
+        let searchTimer = null;
+        let searchSeq = 0;
+        const showResults = (data) => {
+            searchResults.replaceChildren();
+            data.todos.forEach((todo) => {
+                const link = document.createElement('a');
+                link.className = 'list-group-item list-group-item-action';
+                link.href = `${window.location.origin}/details/${todo.id}`;
+                link.textContent = todo.name;
+                searchResults.appendChild(link);
+            });
+            if (!data.todos.length) {
+                const empty = document.createElement('li');
+                empty.className = 'list-group-item text-muted small';
+                empty.textContent = 'No matching tasks';
+                searchResults.appendChild(empty);
+            }
+            searchResults.hidden = false;
+        };
+        searchInput.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            const query = searchInput.value.trim();
+            if (!query) {
+                searchResults.hidden = true;
+                return;
+            }
+            searchTimer = setTimeout(() => {
+                const seq = ++searchSeq;
+                apiRequest('GET', `/api/todos/search?q=${encodeURIComponent(query)}`)
+                    .then((data) => {
+                        // Ignore answers to queries the user has typed past
+                        if (seq === searchSeq) {
+                            showResults(data);
+                        }
+                    })
+                    .catch((error) => console.log('search failed', error));
+            }, 150);
+        });
+    }
+
+    // Multi-select: complete, reprioritize or delete the checked rows with one request
+    const bulkBar = document.getElementById('bulk-actions');
+    if (bulkBar && todoList) {
+        const selectedIds = () => Array.from(todoList.querySelectorAll('.todo-select:checked')).map((cb) => Number(cb.value));
+        const refreshBulkBar = () => {
+            const count = selectedIds().length;
+            bulkBar.hidden = count === 0;
+            document.getElementById('bulk-count').textContent = `${count} selected`;
+        };
+        todoList.addEventListener('change', (e) => {
+            if (e.target.classList.contains('todo-select')) {
+                refreshBulkBar();
+            }
+        });
+        const runBulk = (path, body) => apiRequest('POST', path, body)
+            .then((data) => {
+                Object.entries(data.html || {}).forEach(([todoId, html]) => {
+                    const row = document.getElementById(`task-${todoId}`);
+                    if (row) {
+                        replaceRow(row, html);
+                    }
+                });
+                (data.deleted || []).forEach((todoId) => {
+                    const row = document.getElementById(`task-${todoId}`);
+                    if (row) {
+                        row.remove();
+                    }
+                });
+                applyGroupCounts(data.group_counts);
+                if (data.failed && data.failed.length) {
+                    alert(`${data.failed.length} task(s) could not be changed`);
+                }
+            })
+            .catch((error) => alert(`Bulk action failed: ${error.message}`))
+            .finally(refreshBulkBar);
+        bulkBar.querySelector("[data-bulk='complete']").addEventListener('click', () => {
+            runBulk('/bulk/complete', { ids: selectedIds() });
+        });
+        bulkBar.querySelector("[data-bulk='delete']").addEventListener('click', () => {
+            const ids = selectedIds();
+            if (confirm(`Delete ${ids.length} selected task(s)?`)) {
+                runBulk('/bulk/delete', { ids: ids });
+            }
+        });
+        const prioritySelect = document.getElementById('bulk-priority');
+        prioritySelect.addEventListener('change', () => {
+            if (prioritySelect.value) {
+                runBulk('/bulk/update', { ids: selectedIds(), priority: prioritySelect.value });
+                prioritySelect.value = '';
+            }
+        });
+    }
+
+    // Toggle completion in place: one JSON request, then the re-rendered row moves to its group
     window.handleClick = function(event, cb) {
         event.stopPropagation();
         const rootUrl = window.location.origin;
         const cbId = cb.id;
         const cbChecked = cb.checked;
-        window.location.href = `${rootUrl}/completed/${cbId}/${cbChecked}`;
         clearHighlight();
+        cb.disabled = true;
+        fetch(`${rootUrl}/completed/${cbId}/${cbChecked}`, {
+            method: 'POST',
+            headers: { 'Accept': 'application/json', 'X-CSRFToken': csrfToken() },
+            credentials: 'same-origin'
+        })
+            .then((response) => {
+                if (!response.ok) {
+                    throw new Error(`status ${response.status}`);
+                }
+                return response.json();
+            })
+            .then((data) => {
+                const row = document.getElementById(`task-${cbId}`);
+                if (row) {
+                    replaceRow(row, data.html);
+                }
+                applyGroupCounts(data.group_counts);
+            })
+            .catch((error) => {
+                console.log('toggle failed', error);
+                cb.checked = !cbChecked;
+            })
+            .finally(() => {
+                cb.disabled = false;
+            });
     };
 
 
+    // Import: stream the upload to /import and show each NDJSON progress line as it arrives
+    const importForm = document.getElementById('import-form');
+    if (importForm) {
+        const importStatus = document.getElementById('import-status');
+        importForm.addEventListener('submit', (event) => {
+            event.preventDefault();
+            const file = document.getElementById('import-file').files[0];
+            if (!file) {
+                return;
+            }
+            const button = importForm.querySelector("button[type='submit']");
+            button.disabled = true;
+            importStatus.textContent = 'Importing\u2026';
+            let last = null;
+            const show = (line) => {
+                if (!line.trim()) {
+                    return;
+                }
+                last = JSON.parse(line);
+                importStatus.textContent = `${last.created} created, ${last.invalid + last.failed} skipped`;
+            };
+            // Sent as the raw body rather than multipart, so the server reads it line by line as it arrives
+            const extension = file.name.split('.').pop().toLowerCase();
+            const format = extension === 'csv' ? 'csv' : (extension === 'ndjson' || extension === 'jsonl') ? 'ndjson' : '';
+            fetch(`${window.location.origin}/import${format ? `?format=${format}` : ''}`, {
+                method: 'POST',
+                headers: {
+                    'Accept': 'application/x-ndjson',
+                    'Content-Type': file.type || 'application/octet-stream',
+                    'X-CSRFToken': csrfToken()
+                },
+                credentials: 'same-origin',
+                body: file
+            })
+                .then(async (response) => {
+                    if (!response.ok) {
+                        const data = await response.json().catch(() => ({}));
+                        throw new Error(data.error || `status ${response.status}`);
+                    }
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffered = '';
+                    for (;;) {
+                        const { done, value } = await reader.read();
+                        if (done) {
+                            break;
+                        }
+                        buffered += decoder.decode(value, { stream: true });
+                        const lines = buffered.split('\n');
+                        buffered = lines.pop();
+                        lines.forEach(show);
+                    }
+                    show(buffered);
+                    if (last && last.errors && last.errors.length) {
+                        console.log('import errors', last.errors);
+                        importStatus.title = last.errors.map((e) => `line ${e.line}: ${e.error}`).join('\n');
+                    }
+                    if (last && last.created > 0) {
+                        window.location.reload();
+                    }
+                })
+                .catch((error) => {
+                    importStatus.textContent = `Import failed: ${error.message}`;
+                })
+                .finally(() => {
+                    button.disabled = false;
+                });
+        });
+    }
+
+    // Archive: move old completed tasks out of the list, and page through the archived ones on demand
+    const archiveBox = document.getElementById('archive');
+    if (archiveBox) {
+        const archiveStatus = document.getElementById('archive-status');
+        const archivedList = document.getElementById('archived-list');
+        const moreButton = document.getElementById('archived-more');
+        const toggleButton = document.getElementById('archive-toggle');
+        let archivedCursor = null;
+        const loadArchived = () => {
+            const query = archivedCursor ? `?after=${encodeURIComponent(archivedCursor)}` : '';
+            moreButton.disabled = true;
+            return apiRequest('GET', `/api/todos/archived${query}`)
+                .then((data) => {
+                    data.todos.forEach((todo) => {
+                        const item = document.createElement('li');
+                        item.className = 'list-group-item d-flex justify-content-between text-muted';
+                        const name = document.createElement('span');
+                        name.textContent = todo.name;
+                        const completedOn = document.createElement('small');
+                        completedOn.textContent = todo.completed_at ? `completed ${todo.completed_at.slice(0, 10)}` : '';
+                        item.append(name, completedOn);
+                        archivedList.appendChild(item);
+                    });
+                    if (!archivedList.children.length) {
+                        const empty = document.createElement('li');
+                        empty.className = 'list-group-item text-muted small';
+                        empty.textContent = 'No archived tasks';
+                        archivedList.appendChild(empty);
+                    }
+                    archivedCursor = data.end_cursor;
+                    moreButton.hidden = !data.has_next_page;
+                })
+                .catch((error) => {
+                    archiveStatus.textContent = `Could not load archived tasks: ${error.message}`;
+                })
+                .finally(() => {
+                    moreButton.disabled = false;
+                });
+        };
+        toggleButton.addEventListener('click', () => {
+            const show = archivedList.hidden;
+            archivedList.hidden = !show;
+            toggleButton.setAttribute('aria-expanded', String(show));
+            toggleButton.textContent = show ? 'Hide archived' : 'Show archived';
+            if (!show) {
+                moreButton.hidden = true;
+                return;
+            }
+            // Loaded fresh each time it is opened, so newly archived tasks show up
+            archivedList.replaceChildren();
+            archivedCursor = null;
+            loadArchived();
+        });
+        moreButton.addEventListener('click', loadArchived);
+        document.getElementById('archive-completed').addEventListener('click', (event) => {
+            const button = event.currentTarget;
+            button.disabled = true;
+            apiRequest('POST', '/archive', {})
+                .then((data) => {
+                    if (data.archived > 0) {
+                        window.location.reload();
+                        return;
+                    }
+                    archiveStatus.textContent = `No tasks completed more than ${data.older_than_days} days ago`;
+                })
+                .catch((error) => {
+                    archiveStatus.textContent = `Archive failed: ${error.message}`;
+                })
+                .finally(() => {
+                    button.disabled = false;
+                });
+        });
+    }
+
     window.highlight = function(element) {
         const highlightedItemId = localStorage.getItem(HIGHLIGHTEDITEM);
         if (highlightedItemId) {
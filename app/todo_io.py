@@ -0,0 +1,194 @@
+"""Streaming import and export of todos as CSV or NDJSON."""
+import csv
+import io
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils import (
+    sanitize_string,
+    validate_due_date,
+    validate_notes,
+    validate_priority,
+    validate_todo_name,
+)
+
+FORMATS = ("csv", "ndjson")
+IMPORT_COLUMNS = ("name", "due_date", "priority", "notes", "completed")
+# Export is a superset of the import columns, so an export can be imported again
+EXPORT_COLUMNS = ("id",) + IMPORT_COLUMNS + ("recommendations",)
+CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+logger = logging.getLogger(__name__)
+
+_MIMETYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+_TRUE = {"true", "1", "yes", "y"}
+_FALSE = {"false", "0", "no", "n", ""}
+
+
+def detect_format(explicit: Optional[str], filename: Optional[str], mimetype: Optional[str]) -> Optional[str]:
+    """Pick the upload format from a ``format`` parameter, file extension or content type.
+
+    Returns:
+        ``"csv"``, ``"ndjson"`` or None if it cannot be told
+    """
+    if explicit:
+        return explicit.lower() if explicit.lower() in FORMATS else None
+    extension = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+    if extension == "csv":
+        return "csv"
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+    return _MIMETYPES.get((mimetype or "").lower())
+
+
+def _parse_completed(value: Any) -> Tuple[bool, bool, Optional[str]]:
+    if isinstance(value, bool):
+        return True, value, None
+    if value is None:
+        return True, False, None
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True, True, None
+    if text in _FALSE:
+        return True, False, None
+    return False, False, "completed must be true or false"
+
+
+def validate_import_row(raw: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate one imported row with the same rules as the add and edit forms.
+
+    Args:
+        raw: Column name -> value; unknown columns are ignored
+
+    Returns:
+        Tuple of (createtodo item without ``oid``, error_message)
+    """
+    for field in ("name", "due_date", "notes"):
+        if raw.get(field) is not None and not isinstance(raw[field], str):
+            return None, f"{field} must be a string"
+
+    name = (raw.get("name") or "").strip()
+    is_valid, error_msg = validate_todo_name(name)
+    if not is_valid:
+        return None, error_msg
+    item: Dict[str, Any] = {"name": sanitize_string(name, max_length=200)}
+
+    is_valid, due_date, error_msg = validate_due_date((raw.get("due_date") or "").strip())
+    if not is_valid:
+        return None, error_msg
+    if due_date is not None:
+        item["due_date"] = due_date
+
+    priority = raw.get("priority")
+    is_valid, priority_int, error_msg = validate_priority(priority.strip() if isinstance(priority, str) else priority)
+    if not is_valid:
+        return None, error_msg
+    if priority_int is not None:
+        item["priority"] = priority_int
+
+    is_valid, notes, error_msg = validate_notes(raw.get("notes"))
+    if not is_valid:
+        return None, error_msg
+    if notes:
+        item["notes"] = notes
+
+    is_valid, completed, error_msg = _parse_completed(raw.get("completed"))
+    if not is_valid:
+        return None, error_msg
+    if completed:
+        item["completed"] = True
+    return item, None
+
+
+def iter_import_rows(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Parse and validate an upload one line at a time.
+
+    Args:
+        lines: Text lines, e.g. a ``TextIOWrapper`` over the request stream
+        fmt: ``"csv"`` (header row with ``IMPORT_COLUMNS`` names) or ``"ndjson"``
+
+    Yields:
+        ``(line_number, item, error_message)`` per data row; exactly one of
+        ``item`` and ``error_message`` is None. Blank lines are skipped.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        if reader.fieldnames is None:
+            return
+        header = [(column or "").strip().lower() for column in reader.fieldnames]
+        if "name" not in header:
+            yield 1, None, "CSV header must include a name column"
+            return
+        reader.fieldnames = header
+        for raw in reader:
+            if not any((value or "").strip() for value in raw.values() if isinstance(value, str)):
+                continue
+            item, error_msg = validate_import_row(raw)
+            yield reader.line_num, item, error_msg
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError:
+                yield line_number, None, "invalid JSON"
+                continue
+            if not isinstance(raw, dict):
+                yield line_number, None, "each line must be a JSON object"
+                continue
+            item, error_msg = validate_import_row(raw)
+            yield line_number, item, error_msg
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def export_row(todo: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape one API row for export, decoding ``recommendations_json``."""
+    row = {column: todo.get(column) for column in EXPORT_COLUMNS if column != "recommendations"}
+    row["completed"] = bool(row["completed"])
+    recommendations_json = todo.get("recommendations_json")
+    try:
+        row["recommendations"] = json.loads(recommendations_json) if recommendations_json else None
+    except ValueError:
+        logger.warning("[export] Undecodable recommendations_json for id=%s", todo.get("id"))
+        row["recommendations"] = None
+    return row
+
+
+def iter_export(pages: Iterable[List[Dict[str, Any]]], fmt: str) -> Iterator[str]:
+    """Serialize pages of todos one at a time; nothing is held past the current page.
+
+    Args:
+        pages: Lists of API rows, e.g. a generator following DAB cursors
+        fmt: ``"csv"`` (header row first, recommendations as JSON text) or ``"ndjson"``
+
+    Yields:
+        One chunk of text per page (CSV starts with its header on its own)
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        yield buffer.getvalue()
+        for items in pages:
+            buffer.seek(0)
+            buffer.truncate()
+            for todo in items:
+                row = export_row(todo)
+                if row["recommendations"] is not None:
+                    row["recommendations"] = json.dumps(row["recommendations"])
+                writer.writerow(row)
+            yield buffer.getvalue()
+    elif fmt == "ndjson":
+        for items in pages:
+            yield "".join(json.dumps(export_row(todo)) + "\n" for todo in items)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
@@ -1,4 +1,5 @@
 """Utility functions for validation and sanitization."""
+import hmac
 import re
 from typing import Optional
 from datetime import datetime
@@ -129,3 +130,27 @@ def validate_todo_id(todo_id: any) -> tuple[bool, Optional[int], Optional[str]]:
         return True, todo_id_int, None
     except (ValueError, TypeError):
         return False, None, "Todo ID must be a valid integer"
+
+
+def tokens_match(supplied: Optional[str], expected: str) -> bool:
+    """Compare a secret from a request header with the configured one in constant time.
+
+    ``hmac.compare_digest`` raises TypeError for ``str`` arguments with
+    non-ASCII characters, so both sides are compared as bytes. WSGI hands
+    header values over as latin-1 decoded text, which ``encode("latin-1")``
+    turns back into the bytes the client sent.
+    
+    Args:
+        supplied: Header value from the request (None or empty if missing)
+        expected: Configured token
+        
+    Returns:
+        True if the header carries exactly the expected token
+    """
+    if not supplied or not expected:
+        return False
+    try:
+        supplied_bytes = supplied.encode("latin-1")
+    except UnicodeEncodeError:
+        supplied_bytes = supplied.encode("utf-8", "surrogateescape")
+    return hmac.compare_digest(supplied_bytes, expected.encode("utf-8"))
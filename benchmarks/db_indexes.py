@@ -0,0 +1,285 @@
+"""Before/after benchmark for the per-user indexes in scripts/create-indexes.sql.
+
+``FakeDab`` keeps rows in a Python dict, so it cannot show what an index does.
+This benchmark loads the same ``todo`` table into an in-memory SQLite database
+instead, runs the SQL shapes Data API Builder issues for the app's list
+queries, then applies the indexes from ``scripts/create-indexes.sql`` and runs
+them again. SQLite has no ``INCLUDE`` clause, so included columns are appended
+to the index key, which keeps the indexes covering as they are on Azure SQL.
+
+For every query shape the report has the per-query latency (p50/p95/mean in
+microseconds) and the SQLite query plan before and after. It also pages
+through whole lists with keyset cursors in ``TODO_LIST_ORDER`` (``keyset_walk``)
+and checks that every row comes back exactly once, in order, across page
+boundaries between todos with and without a due date; the script exits with
+status 1 if one does not.
+
+Usage (from the repository root):
+
+    python benchmarks/db_indexes.py --tenants 1000 --todos-per-tenant 120 --output index-report.json
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATION_PATH = os.path.join(REPO_ROOT, "scripts", "create-indexes.sql")
+sys.path.insert(0, os.path.join(REPO_ROOT, "app"))
+
+from services.api_client import TODO_FIELD_SETS, TODO_LIST_ORDER  # noqa: E402
+
+ALL_COLUMNS = "id, name, recommendations_json, notes, priority, completed, due_date, oid"
+LIST_COLUMNS = ", ".join(TODO_FIELD_SETS["list"])
+ORDER = ", ".join(f"{column} {direction}" for column, direction in TODO_LIST_ORDER) + ", id ASC"
+
+_INDEX_RE = re.compile(
+    r"CREATE\s+NONCLUSTERED\s+INDEX\s+(\w+)\s+ON\s+dbo\.todo\s*\(([^)]*)\)(?:\s*INCLUDE\s*\(([^)]*)\))?",
+    re.IGNORECASE,
+)
+
+
+def _columns(text: str) -> List[str]:
+    return [column.strip() for column in text.split(",") if column.strip()]
+
+
+def migration_indexes(path: str = MIGRATION_PATH) -> List[Tuple[str, List[str], List[str]]]:
+    """``(name, key columns, included columns)`` for each index the migration creates."""
+    with open(path, encoding="utf-8") as fh:
+        sql = fh.read()
+    indexes = []
+    for name, key, include in _INDEX_RE.findall(sql):
+        indexes.append((name, _columns(key), _columns(include)))
+    if not indexes:
+        raise RuntimeError(f"No CREATE NONCLUSTERED INDEX statements found in {path}")
+    return indexes
+
+
+def build_database(tenants: int, per_tenant: int, seed: int) -> Tuple[sqlite3.Connection, List[str]]:
+    """Create and fill the ``todo`` table; rows of one tenant are scattered as in a shared table."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        """
+        CREATE TABLE todo (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            recommendations_json TEXT NULL,
+            notes TEXT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            due_date TEXT NULL,
+            oid TEXT NULL,
+            -- PERSISTED computed columns on Azure SQL; filled on insert here because
+            -- SQLite never treats an index over a generated column as covering
+            priority_rank INTEGER NOT NULL,
+            due_date_sort TEXT NOT NULL
+        )
+        """
+    )
+    rng = random.Random(seed)
+    oids = [f"{rng.getrandbits(128):032x}" for _ in range(tenants)]
+    recommendations = json.dumps([
+        {"title": f"Helpful resource {i} for this task", "link": f"https://example.com/resource/{i}"}
+        for i in range(5)
+    ])
+    owners = [oid for oid in oids for _ in range(per_tenant)]
+    rng.shuffle(owners)
+    rows = []
+    for owner in owners:
+        due = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if rng.random() < 0.6 else None
+        rows.append((
+            f"Task {rng.getrandbits(32):08x}",
+            recommendations if rng.random() < 0.5 else None,
+            "Some additional notes" if rng.random() < 0.3 else None,
+            rng.randint(0, 3),
+            int(rng.random() < 0.3),
+            due,
+            owner,
+        ))
+    conn.executemany(
+        "INSERT INTO todo (name, recommendations_json, notes, priority, completed, due_date, oid, priority_rank, due_date_sort)"
+        " VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, CASE WHEN ?4 = 0 THEN 4 ELSE ?4 END, COALESCE(?6, ''))",
+        rows,
+    )
+    conn.commit()
+    return conn, oids
+
+
+def _after_predicate(cursor: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """Keyset predicate for rows sorting after ``cursor`` (NULLs first, ascending), as DAB expands it."""
+    columns = [column for column, _ in TODO_LIST_ORDER] + ["id"]
+    clauses, params = [], []
+    for i, column in enumerate(columns):
+        equal = []
+        for prior in columns[:i]:
+            if cursor[prior] is None:
+                equal.append(f"{prior} IS NULL")
+            else:
+                equal.append(f"{prior} = ?")
+                params.append(cursor[prior])
+        if cursor[column] is None:
+            greater = f"{column} IS NOT NULL"
+        else:
+            greater = f"{column} > ?"
+            params.append(cursor[column])
+        clauses.append("(" + " AND ".join(equal + [greater]) + ")")
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def query_shapes(page_size: int) -> Dict[str, Any]:
+    """SQL for each list query the app sends, keyed by name."""
+    return {
+        # The original unordered query: every column, DAB's default page of 100
+        "all_columns_default_page": f"SELECT {ALL_COLUMNS} FROM todo WHERE oid = ? ORDER BY id LIMIT 101",
+        "list_page_by_id": f"SELECT {LIST_COLUMNS} FROM todo WHERE oid = ? ORDER BY id LIMIT {page_size + 1}",
+        "list_page_ordered": f"SELECT {LIST_COLUMNS} FROM todo WHERE oid = ? ORDER BY {ORDER} LIMIT {page_size + 1}",
+        "list_next_page_ordered": None,  # built per cursor in run_shape
+    }
+
+
+def run_shape(conn: sqlite3.Connection, sql: Optional[str], oids: List[str], queries: int, page_size: int, rng: random.Random) -> Dict[str, Any]:
+    """Time ``queries`` runs of one shape for randomly chosen tenants."""
+    sample = [rng.choice(oids) for _ in range(queries)]
+    cursors: Dict[str, Dict[str, Any]] = {}
+    if sql is None:
+        # The cursor is the last row of each sampled tenant's first ordered page
+        columns = [column for column, _ in TODO_LIST_ORDER] + ["id"]
+        first_page = f"SELECT {', '.join(columns)} FROM todo WHERE oid = ? ORDER BY {ORDER} LIMIT {page_size}"
+        for oid in set(sample):
+            rows = conn.execute(first_page, (oid,)).fetchall()
+            if rows:
+                cursors[oid] = dict(zip(columns, rows[-1]))
+
+    def statement(oid: str) -> Tuple[str, List[Any]]:
+        if sql is not None:
+            return sql, [oid]
+        predicate, params = _after_predicate(cursors[oid])
+        return (
+            f"SELECT {LIST_COLUMNS} FROM todo WHERE oid = ? AND {predicate} ORDER BY {ORDER} LIMIT {page_size + 1}",
+            [oid] + params,
+        )
+
+    plan_sql, plan_params = statement(sample[0])
+    plan = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + plan_sql, plan_params).fetchall()]
+    timings = []
+    rows_returned = 0
+    for oid in sample:
+        text, params = statement(oid)
+        started = time.perf_counter()
+        rows_returned += len(conn.execute(text, params).fetchall())
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return {
+        "p50_us": round(statistics.median(timings), 1),
+        "p95_us": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 1),
+        "mean_us": round(statistics.fmean(timings), 1),
+        "rows_per_query": round(rows_returned / len(sample), 1),
+        "plan": plan,
+    }
+
+
+def keyset_walk(conn: sqlite3.Connection, oids: List[str], page_sizes: List[int]) -> Dict[str, Any]:
+    """Page through each tenant's list with keyset cursors and compare with one ordered read.
+
+    Counts the tenants whose walk repeats, skips or reorders a row, and the
+    page boundaries crossed between an undated and a dated todo.
+    """
+    columns = [column for column, _ in TODO_LIST_ORDER] + ["id"]
+    select = ", ".join(columns + ["due_date"])
+    due_sort = columns.index("due_date_sort") if "due_date_sort" in columns else None
+    walks = mismatched = date_boundaries = 0
+    for oid in oids:
+        expected = [row[-2] for row in conn.execute(f"SELECT {select} FROM todo WHERE oid = ? ORDER BY {ORDER}", (oid,))]
+        for page_size in page_sizes:
+            seen: List[int] = []
+            cursor: Optional[Dict[str, Any]] = None
+            # A walk that does not advance is a mismatch too; stop it after one page too many
+            for _ in range(len(expected) // page_size + 2):
+                predicate, params = _after_predicate(cursor) if cursor is not None else ("1 = 1", [])
+                rows = conn.execute(
+                    f"SELECT {select} FROM todo WHERE oid = ? AND {predicate} ORDER BY {ORDER} LIMIT {page_size}",
+                    [oid] + params,
+                ).fetchall()
+                if cursor is not None and rows and due_sort is not None:
+                    date_boundaries += (cursor["due_date_sort"] == "") != (rows[0][due_sort] == "")
+                seen.extend(row[-2] for row in rows)
+                if len(rows) < page_size:
+                    break
+                cursor = dict(zip(columns, rows[-1]))
+            walks += 1
+            mismatched += seen != expected
+    return {"walks": walks, "page_sizes": page_sizes, "mismatched": mismatched, "date_boundaries": date_boundaries}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenants", type=int, default=1000, help="Distinct users (oid values) in the table")
+    parser.add_argument("--todos-per-tenant", type=int, default=120, help="Todos per user")
+    parser.add_argument("--page-size", type=int, default=50, help="Rows per list page (TODO_PAGE_SIZE)")
+    parser.add_argument("--queries", type=int, default=200, help="Timed queries per shape and phase")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for data and tenant sampling")
+    parser.add_argument("--walk-tenants", type=int, default=50, help="Tenants whose whole list keyset_walk pages through")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    indexes = migration_indexes()
+    conn, oids = build_database(args.tenants, args.todos_per_tenant, args.seed)
+    shapes = query_shapes(args.page_size)
+    report: Dict[str, Any] = {
+        "benchmark": "db_indexes",
+        "config": {
+            "tenants": args.tenants,
+            "todos_per_tenant": args.todos_per_tenant,
+            "rows": args.tenants * args.todos_per_tenant,
+            "page_size": args.page_size,
+            "queries": args.queries,
+            "indexes": [{"name": n, "key": k, "include": i} for n, k, i in indexes],
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "shapes": {},
+    }
+    try:
+        for phase in ("before", "after"):
+            if phase == "after":
+                for name, key, include in indexes:
+                    conn.execute(f"CREATE INDEX {name} ON todo ({', '.join(key + include)})")
+                conn.execute("ANALYZE")
+            for shape, sql in shapes.items():
+                result = run_shape(conn, sql, oids, args.queries, args.page_size, random.Random(args.seed))
+                report["shapes"].setdefault(shape, {})[phase] = result
+        for shape, phases in report["shapes"].items():
+            before, after = phases["before"]["p50_us"], phases["after"]["p50_us"]
+            phases["speedup_p50"] = round(before / after, 1) if after else None
+            print(
+                f"[db_indexes] {shape:<26} before p50={before}us after p50={after}us "
+                f"speedup={phases['speedup_p50']}x plan={'; '.join(phases['after']['plan'])}",
+                file=sys.stderr,
+            )
+        # Page size 1 puts a cursor between every pair of neighbouring rows
+        walk = keyset_walk(conn, oids[:args.walk_tenants], sorted({1, 7, args.page_size}))
+        report["keyset_walk"] = walk
+        print(
+            f"[db_indexes] keyset_walk walks={walk['walks']} mismatched={walk['mismatched']} "
+            f"date_boundaries={walk['date_boundaries']}",
+            file=sys.stderr,
+        )
+    finally:
+        conn.close()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 1 if report["keyset_walk"]["mismatched"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Import the real Flask app wired to the local stand-ins.
+
+``load_app()`` sets the environment the app expects, patches the Azure/Entra
+entry points it touches at import time, starts the DAB and OpenAI stand-ins
+on loopback ports and imports ``app/app.py``. The returned ``BenchEnv`` exposes
+the app module plus the stand-ins so callers can seed data and read counters.
+"""
+import contextlib
+import os
+import sys
+import uuid
+from typing import Optional
+from unittest import mock
+
+from standins import (
+    BENCH_USER_HEADER,
+    FakeAuth,
+    FakeConfidentialClient,
+    FakeCredential,
+    FakeDab,
+    FakeOpenAI,
+    InMemoryRedis,
+    StandInServer,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_ROOT, "app")
+
+
+class BenchEnv:
+    """Handles to the imported app and the stand-ins it is wired to."""
+
+    def __init__(self, module, dab: FakeDab, openai: FakeOpenAI, redis: InMemoryRedis, servers):
+        self.module = module
+        self.app = module.app
+        self.dab = dab
+        self.openai = openai
+        self.redis = redis
+        self._servers = servers
+
+    def client(self, oid: Optional[str] = None):
+        """Return a test client authenticated (via the auth stub) as ``oid``."""
+        oid = oid or str(uuid.uuid4())
+        c = self.app.test_client()
+        # The app marks the session cookie Secure outside localhost mode
+        c.environ_base["wsgi.url_scheme"] = "https"
+        c.environ_base["HTTP_" + BENCH_USER_HEADER.upper().replace("-", "_")] = oid
+        c.oid = oid
+        return c
+
+    def reset_counters(self) -> None:
+        self.dab.reset_counters()
+        self.openai.reset_counters()
+        self.redis.reset_counters()
+
+    def close(self) -> None:
+        for server in self._servers:
+            server.stop()
+
+
+_ENV: Optional[BenchEnv] = None
+
+
+@contextlib.contextmanager
+def silenced():
+    """Discard stdout; the app's ``SpanLogger`` prints every log line."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def load_app(dab_latency_ms: float = 0.0, openai_latency_ms: float = 0.0, quiet: bool = True) -> BenchEnv:
+    """Import ``app.py`` against the stand-ins (once per process)."""
+    global _ENV
+    if _ENV is not None:
+        _ENV.dab.latency_ms = dab_latency_ms
+        _ENV.openai.latency_ms = openai_latency_ms
+        return _ENV
+
+    dab = FakeDab(latency_ms=dab_latency_ms)
+    openai = FakeOpenAI(latency_ms=openai_latency_ms)
+    redis = InMemoryRedis()
+    dab_server = StandInServer(dab).start()
+    openai_server = StandInServer(openai).start()
+
+    os.environ.update({
+        "IS_LOCALHOST": "false",
+        "API_URL": f"{dab_server.url}/graphql",
+        "API_APP_ID_URI": "api://bench",
+        "APPLICATIONINSIGHTS_CONNECTION_STRING": "InstrumentationKey=00000000-0000-0000-0000-000000000000",
+        "AUTHORITY": "https://login.invalid/bench",
+        "CLIENTID": "bench-client",
+        "CLIENTSECRET": "bench-secret",
+        "REDIRECT_URI": "https://localhost/getAToken",
+        "REDIS_CONNECTION_STRING": "rediss://bench.invalid:6380/0",
+        "AZURE_OPENAI_ENDPOINT": openai_server.url,
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "bench",
+        "SECRET_KEY": "bench-secret-key",
+    })
+    for var in ("AZURE_CLIENT_ID", "KEY_VAULT_NAME"):
+        os.environ.pop(var, None)
+
+    patches = [
+        mock.patch("azure.monitor.opentelemetry.configure_azure_monitor", lambda **kwargs: None),
+        mock.patch("azure.identity.ManagedIdentityCredential", FakeCredential),
+        mock.patch("azure.identity.DefaultAzureCredential", FakeCredential),
+        mock.patch("redis_entraid.cred_provider.create_from_managed_identity", lambda **kwargs: None),
+        mock.patch("redis.Redis", lambda *args, **kwargs: redis),
+        mock.patch("msal.ConfidentialClientApplication", FakeConfidentialClient),
+        mock.patch("identity.web.Auth", FakeAuth),
+    ]
+    for p in patches:
+        p.start()
+
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    with (silenced() if quiet else contextlib.nullcontext()):
+        import app as module  # noqa: E402  (imported after patching on purpose)
+    module.app.config["WTF_CSRF_ENABLED"] = False
+
+    _ENV = BenchEnv(module, dab, openai, redis, [dab_server, openai_server])
+    return _ENV
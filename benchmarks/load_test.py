@@ -0,0 +1,187 @@
+"""End-to-end load test for the Flask app against local stand-ins.
+
+Each virtual user runs the flows a real user clicks through (list, add, edit,
+update, toggle complete, recommend, delete) using its own cookie jar, with
+authentication stubbed out. The run is repeated for every concurrency level
+and a JSON report is written with throughput, latency percentiles, upstream
+calls per request and Redis bytes per request.
+
+Usage (from the repository root):
+
+    python benchmarks/load_test.py --concurrency 1,4,16 --iterations 5 --output load-report.json
+"""
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from harness import load_app, silenced
+
+FLOWS = ("list", "add", "edit", "update", "toggle", "recommend", "delete")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+class VirtualUser:
+    """Drives one user's session through the app's flows."""
+
+    def __init__(self, env, seed_todos: int):
+        self.env = env
+        self.client = env.client()
+        env.dab.seed(self.client.oid, seed_todos)
+        self.samples: Dict[str, List[float]] = {flow: [] for flow in FLOWS}
+        self.errors = 0
+
+    def _timed(self, flow: str, method: str, path: str, **kwargs) -> None:
+        start = time.perf_counter()
+        response = self.client.open(path, method=method, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        self.samples[flow].append(elapsed)
+        if response.status_code >= 400:
+            self.errors += 1
+        response.close()
+
+    def run_iteration(self, n: int) -> None:
+        # Mirrors static/js/app.js: list and tab views are page loads, while
+        # add/update/toggle/delete go through the JSON API and patch the DOM.
+        json_headers = {"Accept": "application/json"}
+        self._timed("list", "GET", "/")
+        self._timed("add", "POST", "/api/todos", json={"name": f"Load test task {n}"}, headers=json_headers)
+        todo_id = max(self.env.dab.ids_for(self.client.oid))
+        self._timed("edit", "GET", f"/edit/{todo_id}")
+        self._timed("update", "PATCH", f"/api/todos/{todo_id}", json={
+            "name": f"Load test task {n} (edited)",
+            "due_date": "2026-12-31",
+            "notes": "Updated by the load test",
+            "priority": "2",
+            "completed": False,
+        }, headers=json_headers)
+        self._timed("toggle", "POST", f"/completed/{todo_id}/true", headers=json_headers)
+        self._timed("recommend", "GET", f"/recommend/{todo_id}")
+        self._timed("delete", "DELETE", f"/api/todos/{todo_id}", headers=json_headers)
+
+
+def run_level(env, concurrency: int, iterations: int, seed_todos: int, warmup: int) -> Dict:
+    users = [VirtualUser(env, seed_todos) for _ in range(concurrency)]
+    for user in users:
+        for n in range(warmup):
+            user.run_iteration(-1 - n)
+        user.samples = {flow: [] for flow in FLOWS}
+        user.errors = 0
+
+    env.reset_counters()
+    barrier = threading.Barrier(concurrency)
+
+    def drive(user: VirtualUser) -> None:
+        barrier.wait()
+        for n in range(iterations):
+            user.run_iteration(n)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(drive, users))
+    duration = time.perf_counter() - start
+
+    per_flow = {flow: [s for u in users for s in u.samples[flow]] for flow in FLOWS}
+    all_samples = [s for samples in per_flow.values() for s in samples]
+    requests_made = len(all_samples)
+    per_request = (lambda value: round(value / requests_made, 3)) if requests_made else (lambda value: 0.0)
+    return {
+        "concurrency": concurrency,
+        "requests": requests_made,
+        "errors": sum(u.errors for u in users),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(requests_made / duration, 2) if duration else 0.0,
+        "latency": {
+            "all": summarize(all_samples),
+            "per_flow": {flow: summarize(samples) for flow, samples in per_flow.items()},
+        },
+        "upstream_calls_per_request": {
+            "dab": per_request(env.dab.calls),
+            "openai": per_request(env.openai.calls),
+            "total": per_request(env.dab.calls + env.openai.calls),
+        },
+        "dab_response_bytes_per_request": per_request(env.dab.bytes_out),
+        "redis_bytes_per_request": {
+            "read": per_request(env.redis.bytes_read),
+            "written": per_request(env.redis.bytes_written),
+            "total": per_request(env.redis.bytes_read + env.redis.bytes_written),
+        },
+        "redis_commands_per_request": per_request(env.redis.commands),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels to sweep")
+    parser.add_argument("--iterations", type=int, default=5, help="Flow iterations per virtual user per level")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed iterations per virtual user before measuring")
+    parser.add_argument("--seed-todos", type=int, default=50, help="Pre-existing todos per virtual user")
+    parser.add_argument("--dab-latency-ms", type=float, default=2.0, help="Simulated DAB round-trip latency")
+    parser.add_argument("--openai-latency-ms", type=float, default=50.0, help="Simulated OpenAI latency")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    env = load_app(dab_latency_ms=args.dab_latency_ms, openai_latency_ms=args.openai_latency_ms)
+    report = {
+        "benchmark": "load_test",
+        "config": {
+            "concurrency": levels,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "seed_todos": args.seed_todos,
+            "dab_latency_ms": args.dab_latency_ms,
+            "openai_latency_ms": args.openai_latency_ms,
+            "python": sys.version.split()[0],
+        },
+        "levels": [],
+    }
+    try:
+        for concurrency in levels:
+            with silenced():
+                result = run_level(env, concurrency, args.iterations, args.seed_todos, args.warmup)
+            report["levels"].append(result)
+            print(
+                f"[load_test] c={concurrency:<3} rps={result['throughput_rps']:<8} "
+                f"p50={result['latency']['all']['p50_ms']}ms p95={result['latency']['all']['p95_ms']}ms "
+                f"p99={result['latency']['all']['p99_ms']}ms upstream/req={result['upstream_calls_per_request']['total']} "
+                f"redis B/req={result['redis_bytes_per_request']['total']} errors={result['errors']}",
+                file=sys.stderr,
+            )
+    finally:
+        env.close()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
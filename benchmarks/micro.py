@@ -0,0 +1,400 @@
+"""Microbenchmarks for the app's hot helpers, compared against a stored baseline.
+
+Covers input validation (``utils.validate_*`` / ``sanitize_string``), the
+``TodoCache`` under thread contention, the custom Redis session interface
+(``save_session`` / ``open_session``) with realistic payloads, list row
+rendering with and without the fragment cache,
+``GraphQLClient.update_todo`` query construction and ``TodoSearchIndex``
+queries over a 10k item list.
+
+Usage (from the repository root):
+
+    python benchmarks/micro.py                    # run and compare with baseline.json
+    python benchmarks/micro.py --save-baseline    # record a new baseline
+    python benchmarks/micro.py --filter cache     # only benchmarks whose name contains "cache"
+    python benchmarks/micro.py --fail-threshold 15  # exit 1 if anything is >15% slower
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from harness import APP_DIR, load_app, silenced
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+_BENCHMARKS: Dict[str, Callable[[], Callable[[int], None]]] = {}
+
+
+def benchmark(name: str):
+    """Register a setup function returning ``run(loops)``."""
+    def decorator(setup):
+        _BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def measure(run: Callable[[int], None], repeats: int, min_time: float) -> Dict[str, float]:
+    """Time ``run`` like ``timeit``: calibrate loops, then take ``repeats`` samples."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        run(loops)
+        if time.perf_counter() - start >= min_time or loops >= 1 << 24:
+            break
+        loops *= 2
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run(loops)
+            samples.append((time.perf_counter() - start) / loops * 1e9)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "min_ns": round(min(samples), 1),
+        "median_ns": round(statistics.median(samples), 1),
+        "stdev_ns": round(statistics.pstdev(samples), 1),
+        "loops": loops,
+    }
+
+
+# --------------------------------------------------
+# Validation helpers
+# --------------------------------------------------
+def _import_utils():
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    import utils
+    return utils
+
+
+def _loop(fn, *args):
+    def run(loops: int) -> None:
+        for _ in range(loops):
+            fn(*args)
+    return run
+
+
+@benchmark("utils.sanitize_string")
+def _bench_sanitize():
+    return _loop(_import_utils().sanitize_string, "   Buy a birthday gift for mom\x00  ", 200)
+
+
+@benchmark("utils.validate_todo_name")
+def _bench_validate_name():
+    return _loop(_import_utils().validate_todo_name, "Buy a birthday gift for mom")
+
+
+@benchmark("utils.validate_priority")
+def _bench_validate_priority():
+    return _loop(_import_utils().validate_priority, "2")
+
+
+@benchmark("utils.validate_due_date")
+def _bench_validate_due_date():
+    return _loop(_import_utils().validate_due_date, "2026-11-05")
+
+
+@benchmark("utils.validate_notes")
+def _bench_validate_notes():
+    return _loop(_import_utils().validate_notes, "Remember to check the sale at the mall first. " * 20)
+
+
+@benchmark("utils.validate_todo_id")
+def _bench_validate_id():
+    return _loop(_import_utils().validate_todo_id, "12345")
+
+
+# --------------------------------------------------
+# TodoCache under contention
+# --------------------------------------------------
+def _sample_todos(count: int) -> List[dict]:
+    recs = json.dumps([{"title": f"Resource {i}", "link": f"https://example.com/{i}"} for i in range(5)])
+    return [
+        {
+            "id": n + 1,
+            "name": f"Task number {n}",
+            "recommendations_json": recs if n % 3 == 0 else None,
+            "notes": "Some notes about the task" if n % 2 == 0 else None,
+            "priority": n % 4,
+            "completed": n % 5 == 0,
+            "due_date": "2026-11-05" if n % 4 else None,
+            "oid": "00000000-0000-0000-0000-000000000000",
+        }
+        for n in range(count)
+    ]
+
+
+def _contended_cache(threads: int):
+    _import_utils()
+    from services.cache import TodoCache
+
+    cache = TodoCache(ttl_seconds=3600)
+    todos = _sample_todos(50)
+    keys = [f"user-{n}" for n in range(64)]
+
+    def worker(ops: int, offset: int) -> None:
+        for i in range(ops):
+            key = keys[(i + offset) % len(keys)]
+            step = i % 10
+            if step < 7:
+                cache.get(key)
+            elif step < 9:
+                cache.set(key, todos)
+            else:
+                cache.invalidate(key)
+
+    def run(loops: int) -> None:
+        per_thread = max(1, loops // threads)
+        pool = [threading.Thread(target=worker, args=(per_thread, t * 7)) for t in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+    return run
+
+
+@benchmark("cache.get_set_invalidate.1_thread")
+def _bench_cache_1():
+    return _contended_cache(1)
+
+
+@benchmark("cache.get_set_invalidate.8_threads")
+def _bench_cache_8():
+    return _contended_cache(8)
+
+
+# --------------------------------------------------
+# Session interface
+# --------------------------------------------------
+def _session_payload() -> dict:
+    return {
+        "todos": _sample_todos(50),
+        "todo": None,
+        "name": "Bench User",
+        "token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJSUzI1NiJ9." + "x" * 1400,
+        "_token_cache": json.dumps({"AccessToken": {"k": {"secret": "s" * 1500}}, "IdToken": {"k": {"secret": "i" * 1200}}}),
+        "_logged_in_user": {"oid": "00000000-0000-0000-0000-000000000000", "name": "Bench User"},
+    }
+
+
+def _session_env():
+    env = load_app()
+    module = env.module
+    app = module.app
+    interface = app.session_interface
+    if not hasattr(interface, "serializer"):
+        raise RuntimeError("Custom Redis session interface is not installed")
+    return app, interface, module._RedisStoreSession
+
+
+@benchmark("session.save_session")
+def _bench_session_save():
+    app, interface, session_class = _session_env()
+    sess = session_class(initial=_session_payload(), sid="f" * 32, new=False)
+    response_class = app.response_class
+
+    def run(loops: int) -> None:
+        for _ in range(loops):
+            interface.save_session(app, sess, response_class())
+    return run
+
+
+@benchmark("session.open_session")
+def _bench_session_open():
+    app, interface, session_class = _session_env()
+    sid = "e" * 32
+    sess = session_class(initial=_session_payload(), sid=sid, new=False)
+    interface.save_session(app, sess, app.response_class())
+    cookie_name = app.config.get("SESSION_COOKIE_NAME", "session")
+    ctx = app.test_request_context("/", headers={"Cookie": f"{cookie_name}={sid}"})
+
+    def run(loops: int) -> None:
+        request = ctx.request
+        for _ in range(loops):
+            interface.open_session(app, request)
+    return run
+
+
+# --------------------------------------------------
+# List rendering
+# --------------------------------------------------
+def _rows_env(cached: bool):
+    env = load_app()
+    module = env.module
+    oid = "r" * 32
+    todos = _sample_todos(module.TODO_PAGE_SIZE)
+    cache = module.get_cache()
+    if cached:
+        cache.set_page(oid, None, todos, None, False)
+    ctx = module.app.test_request_context("/")
+    ctx.push()
+    return module, oid if cached else None, todos
+
+
+@benchmark("render.todo_rows.fragment")
+def _bench_rows_fragment():
+    module, oid, todos = _rows_env(cached=True)
+
+    def run(loops: int) -> None:
+        for _ in range(loops):
+            module._todo_rows_html(oid, None, todos)
+    return run
+
+
+@benchmark("render.todo_rows.full")
+def _bench_rows_full():
+    module, oid, todos = _rows_env(cached=False)
+
+    def run(loops: int) -> None:
+        for _ in range(loops):
+            module._todo_rows_html(oid, None, todos)
+    return run
+
+
+# --------------------------------------------------
+# GraphQL payload building
+# --------------------------------------------------
+@benchmark("api_client.update_todo.build")
+def _bench_update_todo():
+    _import_utils()
+    from services.api_client import GraphQLClient
+
+    client = GraphQLClient("http://127.0.0.1:1/graphql", lambda: "token")
+    client.execute_query = lambda query, variables=None: {"data": {"updatetodo": variables}}
+
+    def run(loops: int) -> None:
+        for _ in range(loops):
+            client.update_todo(
+                42,
+                name="Buy a birthday gift for mom",
+                due_date="2026-11-05",
+                notes="Check the sale first",
+                priority=2,
+                completed=False,
+            )
+    return run
+
+
+# --------------------------------------------------
+# Search index
+# --------------------------------------------------
+_SEARCH_WORDS = (
+    "buy milk call mom birthday gift report quarterly taxes garden paint fence dentist car wash book flight "
+    "hotel meeting prepare slides review code renew passport insurance plumber groceries laundry"
+).split()
+
+
+def _search_index(count: int = 10000):
+    _import_utils()
+    from services.search import TodoSearchIndex
+
+    todos = _sample_todos(count)
+    for n, todo in enumerate(todos):
+        words = len(_SEARCH_WORDS)
+        todo["name"] = " ".join(_SEARCH_WORDS[(n * k) % words] for k in (1, 3, 7))
+        todo["notes"] = f"{_SEARCH_WORDS[(n * 5) % words]} {_SEARCH_WORDS[(n * 11) % words]} item {n}"
+    return TodoSearchIndex(todos)
+
+
+@benchmark("search.query.word")
+def _bench_search_word():
+    index = _search_index()
+    return _loop(index.search, "passport")
+
+
+@benchmark("search.query.prefix_and")
+def _bench_search_prefix():
+    index = _search_index()
+    return _loop(index.search, "bir gi")
+
+
+@benchmark("search.query.filtered")
+def _bench_search_filtered():
+    index = _search_index()
+
+    def run(loops: int) -> None:
+        for _ in range(loops):
+            index.search("car", priority=1, overdue_before="2026-12-01")
+    return run
+
+
+# --------------------------------------------------
+# Runner
+# --------------------------------------------------
+def compare(results: Dict[str, dict], baseline: Dict[str, dict]) -> Dict[str, Optional[float]]:
+    """Percentage change of ``min_ns`` versus the baseline (positive = slower)."""
+    changes: Dict[str, Optional[float]] = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("min_ns"):
+            changes[name] = None
+            continue
+        changes[name] = round((result["min_ns"] - base["min_ns"]) / base["min_ns"] * 100.0, 1)
+    return changes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=9, help="Timed samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per sample (loop calibration)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to the baseline file")
+    parser.add_argument("--fail-threshold", type=float, help="Exit 1 if any benchmark regresses by more than this percent")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    names = [n for n in _BENCHMARKS if args.filter in n]
+    results: Dict[str, dict] = {}
+    for name in names:
+        with silenced():
+            run = _BENCHMARKS[name]()
+            results[name] = measure(run, args.repeats, args.min_time)
+
+    baseline: Dict[str, dict] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh).get("results", {})
+    changes = compare(results, baseline)
+
+    width = max((len(n) for n in names), default=10)
+    print(f"{'benchmark':<{width}}  {'min':>12}  {'median':>12}  {'vs baseline':>12}")
+    for name in names:
+        r = results[name]
+        change = changes[name]
+        delta = "n/a" if change is None else f"{change:+.1f}%"
+        print(f"{name:<{width}}  {r['min_ns']:>10.1f}ns  {r['median_ns']:>10.1f}ns  {delta:>12}")
+
+    report = {"python": sys.version.split()[0], "results": results}
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump({**report, "change_percent": changes}, fh, indent=2)
+            fh.write("\n")
+    if args.save_baseline:
+        merged = {**baseline, **results}
+        with open(args.baseline, "w") as fh:
+            json.dump({"python": report["python"], "results": merged}, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if args.fail_threshold is not None:
+        regressions = {n: c for n, c in changes.items() if c is not None and c > args.fail_threshold}
+        if regressions:
+            for name, change in regressions.items():
+                print(f"REGRESSION {name}: {change:+.1f}% (threshold {args.fail_threshold}%)", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Benchmark for ``ReminderScheduler`` with a million scheduled reminders.
+
+Fills a scheduler with ``--items`` open todos due over the next
+``--days`` days (through ``schedule`` one at a time, and through ``load``
+as a startup rebuild does), then times single operations against the full
+heap: scheduling a new todo, moving a due date, completing (cancel) and
+firing the next due reminders. A fake clock is used, so nothing waits and
+the sink only counts events.
+
+Usage (from the repository root):
+
+    python benchmarks/reminders.py --items 1000000 --output reminders-report.json
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from harness import APP_DIR
+
+sys.path.insert(0, APP_DIR)
+
+from reminders import ReminderScheduler  # noqa: E402
+
+
+def _todos(count: int, days: int, start: date, rng: random.Random) -> List[Dict[str, Any]]:
+    dates = [(start + timedelta(days=d)).isoformat() for d in range(2, days + 2)]
+    return [
+        {"id": n + 1, "oid": f"user-{n % 5000:05d}", "name": f"Task {n}", "due_date": rng.choice(dates), "completed": False}
+        for n in range(count)
+    ]
+
+
+def _per_op_us(fn: Callable[[int], None], ops: int) -> Dict[str, float]:
+    """Run ``fn(i)`` for ``ops`` values of i; mean, median and p99 microseconds per call."""
+    samples = []
+    for i in range(ops):
+        started = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return {
+        "ops": ops,
+        "mean_us": round(sum(samples) / ops, 3),
+        "p50_us": round(samples[ops // 2], 3),
+        "p99_us": round(samples[int(ops * 0.99)], 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000, help="Reminders scheduled before timing single operations")
+    parser.add_argument("--days", type=int, default=365, help="Due dates are spread over this many days")
+    parser.add_argument("--ops", type=int, default=20000, help="Timed calls per single-operation benchmark")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for due dates and picked ids")
+    parser.add_argument("--memory", action="store_true", help="Also measure the scheduler's memory with tracemalloc")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    today = date(2026, 1, 1)
+    clock = [datetime(today.year, today.month, today.day, 12).timestamp()]
+    fired: List[int] = [0]
+
+    def sink(event: Dict[str, Any]) -> None:
+        fired[0] += 1
+
+    todos = _todos(args.items, args.days, today, rng)
+    report: Dict[str, Any] = {
+        "benchmark": "reminders",
+        "config": {"items": args.items, "days": args.days, "ops": args.ops, "seed": args.seed},
+    }
+    gc.collect()
+
+    # Startup rebuild: one load() over every page
+    scheduler = ReminderScheduler(sink, clock=lambda: clock[0])
+    started = time.perf_counter()
+    scheduler.begin_load()
+    loaded = scheduler.load(todos)
+    report["load"] = {"seconds": round(time.perf_counter() - started, 3), "scheduled": loaded}
+    if args.memory:
+        # A second, traced load: tracemalloc slows it down, so it is not timed
+        traced = ReminderScheduler(sink, clock=lambda: clock[0])
+        tracemalloc.start()
+        traced.load(todos)
+        report["load"]["traced_mb"] = round(tracemalloc.get_traced_memory()[0] / 1e6, 1)
+        tracemalloc.stop()
+        del traced
+
+    # The same fill through the write path, one schedule() per todo
+    incremental = ReminderScheduler(sink, clock=lambda: clock[0])
+    started = time.perf_counter()
+    for todo in todos:
+        incremental.schedule(todo["id"], todo["oid"], todo["due_date"], todo["name"])
+    elapsed = time.perf_counter() - started
+    report["schedule_fill"] = {"seconds": round(elapsed, 3), "us_per_item": round(elapsed / args.items * 1e6, 3)}
+    del incremental
+    gc.collect()
+
+    dates = [(today + timedelta(days=d)).isoformat() for d in range(2, args.days + 2)]
+    ids = [rng.randint(1, args.items) for _ in range(args.ops)]
+    new_id = args.items + 1
+    report["ops"] = {
+        "schedule_new": _per_op_us(
+            lambda i: scheduler.schedule(new_id + i, "user-x", dates[i % len(dates)], "New task"), args.ops
+        ),
+        "reschedule": _per_op_us(
+            lambda i: scheduler.schedule(ids[i], "user-x", dates[(i * 7) % len(dates)], "Moved task"), args.ops
+        ),
+        "cancel": _per_op_us(lambda i: scheduler.cancel(ids[i]), args.ops),
+        "next_fire_at": _per_op_us(lambda i: scheduler.next_fire_at(), args.ops),
+    }
+
+    # Fire one day's worth of reminders at a time, as the scheduler thread would
+    day_seconds = 86400.0
+    batches = []
+    for _ in range(min(30, args.days)):
+        clock[0] += day_seconds
+        batch_started = time.perf_counter()
+        events = scheduler.pop_due()
+        for event in events:
+            sink(event)
+        batches.append((len(events), time.perf_counter() - batch_started))
+    fired_count = sum(n for n, _ in batches)
+    elapsed = sum(s for _, s in batches)
+    report["pop_due"] = {
+        "days": len(batches),
+        "fired": fired_count,
+        "us_per_event": round(elapsed / fired_count * 1e6, 3) if fired_count else None,
+        "remaining": len(scheduler),
+        "heap_size": scheduler.status()["heap_size"],
+    }
+
+    print(
+        f"[reminders] items={args.items} load={report['load']['seconds']}s "
+        f"schedule_fill={report['schedule_fill']['us_per_item']}us/item "
+        + " ".join(f"{name}={op['mean_us']}us" for name, op in report["ops"].items())
+        + f" pop_due={report['pop_due']['us_per_event']}us/event",
+        file=sys.stderr,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
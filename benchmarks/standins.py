@@ -0,0 +1,760 @@
+"""Local stand-ins for the services the Flask app talks to.
+
+These let the benchmarks drive the real application code without Azure:
+
+- ``FakeDab``: an HTTP GraphQL endpoint that understands the subset of the
+  Data API Builder schema the app uses, backed by an in-memory ``todo`` table.
+- ``FakeOpenAI``: an HTTP endpoint answering Azure OpenAI chat completions.
+- ``InMemoryRedis``: a byte-counting substitute for the session Redis client.
+- ``FakeAuth`` / ``FakeConfidentialClient`` / ``FakeCredential``: auth stubs.
+"""
+import base64
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# --------------------------------------------------
+# Minimal GraphQL parser (subset used by the app)
+# --------------------------------------------------
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>[\s,]+|\#[^\n]*)
+  | (?P<punct>\.\.\.|[{}()\[\]:!=$@])
+  | (?P<string>"(?:\\.|[^"\\])*")
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+    """,
+    re.VERBOSE,
+)
+
+
+class GraphQLSyntaxError(ValueError):
+    """Raised when a document is outside the supported GraphQL subset."""
+
+
+class _Field:
+    __slots__ = ("alias", "name", "args", "selections")
+
+    def __init__(self, alias: str, name: str, args: Dict[str, Any], selections: List["_Field"]):
+        self.alias = alias
+        self.name = name
+        self.args = args
+        self.selections = selections
+
+
+class _Var:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class _Enum(str):
+    pass
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens: List[Tuple[str, str]] = []
+        pos = 0
+        while pos < len(text):
+            m = _TOKEN_RE.match(text, pos)
+            if not m:
+                raise GraphQLSyntaxError(f"Unexpected character at {pos}: {text[pos:pos + 20]!r}")
+            pos = m.end()
+            kind = m.lastgroup
+            if kind != "ws":
+                self.tokens.append((kind, m.group(kind)))
+        self.i = 0
+        # Declared variable types, e.g. {"id": "Int!"}
+        self.variable_types: Dict[str, str] = {}
+
+    def peek(self) -> Tuple[Optional[str], Optional[str]]:
+        return self.tokens[self.i] if self.i < len(self.tokens) else (None, None)
+
+    def take(self, value: Optional[str] = None) -> str:
+        kind, tok = self.peek()
+        if tok is None or (value is not None and tok != value):
+            raise GraphQLSyntaxError(f"Expected {value or 'token'}, got {tok!r}")
+        self.i += 1
+        return tok
+
+    def document(self) -> Tuple[str, List[_Field]]:
+        op = "query"
+        kind, tok = self.peek()
+        if kind == "name" and tok in ("query", "mutation"):
+            op = self.take()
+            if self.peek()[0] == "name":
+                self.take()
+            if self.peek()[1] == "(":
+                self._variable_definitions()
+        selections = self.selection_set()
+        return op, selections
+
+    def _variable_definitions(self) -> None:
+        self.take("(")
+        while self.peek()[1] != ")":
+            self.take("$")
+            name = self.take()
+            self.take(":")
+            self.variable_types[name] = self._type()
+            if self.peek()[1] == "=":
+                self.take("=")
+                self.value()
+        self.take(")")
+
+    def _type(self) -> str:
+        if self.peek()[1] == "[":
+            self.take("[")
+            type_name = f"[{self._type()}]"
+            self.take("]")
+        else:
+            type_name = self.take()
+        if self.peek()[1] == "!":
+            self.take("!")
+            type_name += "!"
+        return type_name
+
+    def selection_set(self) -> List[_Field]:
+        self.take("{")
+        fields = []
+        while self.peek()[1] != "}":
+            fields.append(self.field())
+        self.take("}")
+        return fields
+
+    def field(self) -> _Field:
+        name = self.take()
+        alias = name
+        if self.peek()[1] == ":":
+            self.take(":")
+            name = self.take()
+        args: Dict[str, Any] = {}
+        if self.peek()[1] == "(":
+            self.take("(")
+            while self.peek()[1] != ")":
+                arg_name = self.take()
+                self.take(":")
+                args[arg_name] = self.value()
+            self.take(")")
+        selections: List[_Field] = []
+        if self.peek()[1] == "{":
+            selections = self.selection_set()
+        return _Field(alias, name, args, selections)
+
+    def value(self) -> Any:
+        kind, tok = self.peek()
+        if tok == "$":
+            self.take("$")
+            return _Var(self.take())
+        if tok == "{":
+            self.take("{")
+            obj = {}
+            while self.peek()[1] != "}":
+                key = self.take()
+                self.take(":")
+                obj[key] = self.value()
+            self.take("}")
+            return obj
+        if tok == "[":
+            self.take("[")
+            items = []
+            while self.peek()[1] != "]":
+                items.append(self.value())
+            self.take("]")
+            return items
+        self.take()
+        if kind == "string":
+            return json.loads(tok)
+        if kind == "number":
+            return float(tok) if any(c in tok for c in ".eE") else int(tok)
+        if tok == "true":
+            return True
+        if tok == "false":
+            return False
+        if tok == "null":
+            return None
+        return _Enum(tok)
+
+
+def _variable_uses(value: Any, path: str = "") -> List[Tuple[str, _Var]]:
+    """``(argument path, variable)`` for every variable in an argument tree, e.g. ``("item.name", $name)``."""
+    if isinstance(value, _Var):
+        return [(path, value)]
+    if isinstance(value, dict):
+        return [use for k, v in value.items() for use in _variable_uses(v, f"{path}.{k}" if path else k)]
+    if isinstance(value, list):
+        return [use for v in value for use in _variable_uses(v, path)]
+    return []
+
+
+def _resolve_vars(value: Any, variables: Dict[str, Any]) -> Any:
+    if isinstance(value, _Var):
+        return variables.get(value.name)
+    if isinstance(value, dict):
+        return {k: _resolve_vars(v, variables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve_vars(v, variables) for v in value]
+    return value
+
+
+# --------------------------------------------------
+# Data API Builder stand-in
+# --------------------------------------------------
+TODO_COLUMNS = ("id", "name", "recommendations_json", "notes", "priority", "completed", "due_date", "oid")
+
+# Input types of the arguments the app passes as variables, as DAB generates
+# them from scripts/create-tables.sql: on create only the NOT NULL column
+# without a default (name) is required; every update field is optional
+_ITEM_TYPES = {
+    "name": "String", "recommendations_json": "String", "notes": "String", "priority": "Int",
+    "completed": "Boolean", "due_date": "String", "oid": "String",
+}
+ARGUMENT_TYPES: Dict[str, Dict[str, str]] = {
+    "todos": {"first": "Int", "after": "String"},
+    "todo_by_pk": {"id": "Int!"},
+    "createtodo": {**{f"item.{k}": v for k, v in _ITEM_TYPES.items()}, "item.name": "String!"},
+    "updatetodo": {"id": "Int!", **{f"item.{k}": v for k, v in _ITEM_TYPES.items()}},
+    "deletetodo": {"id": "Int!"},
+    "todo_version_by_pk": {"oid": "String!"},
+    "executeset_todo_completed": {"id": "Int", "oid": "String", "completed": "Boolean"},
+    "executetodo_group_counts": {"oid": "String", "today": "String"},
+}
+
+
+def _check_variables(fields: List[_Field], declared: Dict[str, str], variables: Dict[str, Any]) -> Optional[str]:
+    """Validate variable declarations and usage like HotChocolate; an error message or None.
+
+    Every used variable must be declared, a non-null variable needs a value,
+    and a variable used where the schema requires a non-null value must be
+    declared non-null with the same base type. Filter arguments are not
+    checked.
+    """
+    for name, type_name in declared.items():
+        if type_name.endswith("!") and variables.get(name) is None:
+            return f"Variable `{name}` of type `{type_name}` is required"
+    for f in fields:
+        expected_types = ARGUMENT_TYPES.get(f.name, {})
+        for path, var in _variable_uses(f.args):
+            declared_type = declared.get(var.name)
+            if declared_type is None:
+                return f"The variable `{var.name}` is not declared"
+            expected = expected_types.get(path)
+            if expected is None:
+                continue
+            if declared_type.rstrip("!") != expected.rstrip("!") or (expected.endswith("!") and not declared_type.endswith("!")):
+                return f"The variable `{var.name}` of type `{declared_type}` is not compatible with the type `{expected}` of `{f.name}.{path}`"
+    return None
+
+
+def _matches(row: Dict[str, Any], flt: Optional[Dict[str, Any]]) -> bool:
+    if not flt:
+        return True
+    for key, cond in flt.items():
+        if key == "and":
+            if not all(_matches(row, c) for c in cond):
+                return False
+            continue
+        if key == "or":
+            if not any(_matches(row, c) for c in cond):
+                return False
+            continue
+        value = row.get(key)
+        for op, expected in cond.items():
+            if op == "eq" and value != expected:
+                return False
+            if op == "neq" and value == expected:
+                return False
+            if op == "isNull" and (value is None) != bool(expected):
+                return False
+            if op in ("gt", "gte", "lt", "lte"):
+                if value is None:
+                    return False
+                if op == "gt" and not value > expected:
+                    return False
+                if op == "gte" and not value >= expected:
+                    return False
+                if op == "lt" and not value < expected:
+                    return False
+                if op == "lte" and not value <= expected:
+                    return False
+            if op == "contains" and (value is None or str(expected).lower() not in str(value).lower()):
+                return False
+            if op == "in" and value not in expected:
+                return False
+    return True
+
+
+def _order(rows: List[Dict[str, Any]], order_by: Optional[Dict[str, str]]) -> None:
+    """Sort ``rows`` in place like SQL Server: NULLs first for ASC, id as tiebreaker."""
+    rows.sort(key=lambda r: r["id"])
+    for name, direction in reversed(list((order_by or {}).items())):
+        rows.sort(
+            key=lambda r: (r.get(name) is not None, r.get(name) if r.get(name) is not None else 0),
+            reverse=str(direction).upper() == "DESC",
+        )
+
+
+class FakeDab:
+    """In-memory Data API Builder GraphQL endpoint.
+
+    Supports the root fields the app issues (``todos``, ``todo_by_pk``,
+    ``createtodo``, ``updatetodo``, ``deletetodo``, the ``todo_version_by_pk``
+    view lookup and the ``set_todo_completed`` and ``todo_group_counts`` procedures) including aliases, filters, ``first``/``after`` cursors,
+    ``orderBy`` and field projection. Variable declarations are checked
+    against the argument types DAB generates (``ARGUMENT_TYPES``). Like DAB,
+    a ``todos`` query without ``first`` returns ``default_page_size`` rows and
+    ``first: -1`` returns everything.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, default_page_size: int = 100):
+        self.latency_ms = latency_ms
+        self.default_page_size = default_page_size
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 1
+        self._row_version = 0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.bytes_out = 0
+        self.root_fields = 0
+
+    # -------- data helpers --------
+    def seed(self, oid: str, count: int, with_recommendations: bool = True) -> None:
+        """Insert ``count`` todos for ``oid`` with realistic field sizes."""
+        recs = json.dumps([
+            {"title": f"Helpful resource {i} for this task", "link": f"https://example.com/resource/{i}"}
+            for i in range(5)
+        ])
+        with self._lock:
+            for n in range(count):
+                self._insert({
+                    "name": f"Seeded task {n} for {oid[:8]}",
+                    "recommendations_json": recs if with_recommendations and n % 3 == 0 else None,
+                    "notes": "Some notes about the task" if n % 2 == 0 else None,
+                    "priority": n % 4,
+                    "completed": n % 5 == 0,
+                    "due_date": f"2026-{(n % 12) + 1:02d}-{(n % 28) + 1:02d}" if n % 4 else None,
+                    "oid": oid,
+                })
+
+    def ids_for(self, oid: str) -> List[int]:
+        with self._lock:
+            return [r["id"] for r in self._rows.values() if r["oid"] == oid]
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.bytes_out = 0
+            self.root_fields = 0
+
+    def _insert(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        row = {c: None for c in TODO_COLUMNS}
+        row.update({"priority": 0, "completed": False})
+        row.update({k: v for k, v in item.items() if k in TODO_COLUMNS})
+        row["id"] = self._next_id
+        self._next_id += 1
+        self._computed(row)
+        self._bump_version(row)
+        self._rows[row["id"]] = row
+        return row
+
+    @staticmethod
+    def _computed(row: Dict[str, Any]) -> None:
+        # Persisted computed columns from scripts/create-indexes.sql: no priority sorts
+        # after LOW, no due date sorts first as '' (never NULL in a cursor)
+        row["priority_rank"] = row["priority"] or 4
+        row["due_date_sort"] = row["due_date"] or ""
+
+    def _bump_version(self, row: Dict[str, Any]) -> None:
+        # Like SQL Server rowversion: one database-wide counter, stamped on insert and update
+        self._row_version += 1
+        row["row_version"] = self._row_version
+
+    # -------- GraphQL execution --------
+    def execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        variables = variables or {}
+        try:
+            parser = _Parser(query)
+            op, fields = parser.document()
+        except GraphQLSyntaxError as e:
+            return {"errors": [{"message": f"Syntax error: {e}"}]}
+        # Like DAB, an invalid document is rejected as a whole before any field runs
+        error = _check_variables(fields, parser.variable_types, variables)
+        if error is not None:
+            return {"errors": [{"message": error}]}
+        data: Dict[str, Any] = {}
+        with self._lock:
+            self.root_fields += len(fields)
+            for f in fields:
+                args = _resolve_vars(f.args, variables)
+                resolver = getattr(self, f"_resolve_{f.name}", None)
+                if resolver is None:
+                    return {"errors": [{"message": f"Unknown field '{f.name}' on {op}"}]}
+                data[f.alias] = resolver(args, f.selections)
+        return {"data": data}
+
+    @staticmethod
+    def _project(row: Optional[Dict[str, Any]], selections: List[_Field]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        return {s.alias: row.get(s.name) for s in selections}
+
+    def _resolve_todos(self, args, selections):
+        rows = [r for r in self._rows.values() if _matches(r, args.get("filter"))]
+        order_by = args.get("orderBy")
+        _order(rows, order_by)
+        after = args.get("after")
+        if after:
+            # Like DAB, the cursor holds the ordering columns and the id of the last row;
+            # continue after where that row sorts now, even if it was changed or deleted
+            marker = dict(json.loads(base64.b64decode(after)), _cursor=True)
+            rows.append(marker)
+            _order(rows, order_by)
+            rows = [r for r in rows[rows.index(marker) + 1:] if r is not marker]
+        first = args.get("first")
+        if first is None:
+            first = self.default_page_size
+        has_next = False
+        if first >= 0 and len(rows) > first:
+            rows = rows[:first]
+            has_next = True
+        result: Dict[str, Any] = {}
+        for s in selections:
+            if s.name == "items":
+                result[s.alias] = [self._project(r, s.selections) for r in rows]
+            elif s.name == "hasNextPage":
+                result[s.alias] = has_next
+            elif s.name == "endCursor":
+                cursor = None
+                if rows and has_next:
+                    last = {name: rows[-1].get(name) for name in (order_by or {})}
+                    last["id"] = rows[-1]["id"]
+                    cursor = base64.b64encode(json.dumps(last).encode()).decode()
+                result[s.alias] = cursor
+        return result
+
+    def _resolve_todo_by_pk(self, args, selections):
+        return self._project(self._rows.get(args.get("id")), selections)
+
+    def _resolve_createtodo(self, args, selections):
+        return self._project(self._insert(args.get("item") or {}), selections)
+
+    def _resolve_updatetodo(self, args, selections):
+        row = self._rows.get(args.get("id"))
+        if row is None:
+            return None
+        row.update({k: v for k, v in (args.get("item") or {}).items() if k in TODO_COLUMNS and k != "id"})
+        self._computed(row)
+        self._bump_version(row)
+        return self._project(row, selections)
+
+    def _resolve_executeset_todo_completed(self, args, selections):
+        # dbo.set_todo_completed: an UPDATE filtered by id and oid, returning the
+        # updated rows joined with the owner's todo_version row
+        row = self._rows.get(args.get("id"))
+        if row is None or row["oid"] != args.get("oid"):
+            return []
+        row["completed"] = bool(args.get("completed"))
+        self._bump_version(row)
+        version = self._version_row(row["oid"])
+        return [self._project({**row, "max_version": version["max_version"], "todo_count": version["todo_count"]}, selections)]
+
+    def _resolve_deletetodo(self, args, selections):
+        row = self._rows.pop(args.get("id"), None)
+        return self._project(row, selections)
+
+    def _version_row(self, oid: Optional[str]) -> Optional[Dict[str, Any]]:
+        # dbo.todo_version: one row per owner with rows
+        versions = [r["row_version"] for r in self._rows.values() if r["oid"] == oid]
+        if not versions:
+            return None
+        return {"oid": oid, "max_version": max(versions), "todo_count": len(versions)}
+
+    def _resolve_todo_version_by_pk(self, args, selections):
+        return self._project(self._version_row(args.get("oid")), selections)
+
+    def _resolve_executetodo_group_counts(self, args, selections):
+        # dbo.todo_group_counts: one row of counts, grouped like services/views.py todo_group
+        today = args.get("today") or ""
+        counts = {"overdue": 0, "today": 0, "upcoming": 0, "no_date": 0, "completed": 0}
+        for row in self._rows.values():
+            if row["oid"] != args.get("oid"):
+                continue
+            due_date = row.get("due_date")
+            if row.get("completed"):
+                counts["completed"] += 1
+            elif not due_date:
+                counts["no_date"] += 1
+            elif due_date < today:
+                counts["overdue"] += 1
+            else:
+                counts["today" if due_date == today else "upcoming"] += 1
+        return [self._project(counts, selections)]
+
+    # -------- HTTP --------
+    def handle_http(self, body: bytes) -> Tuple[int, bytes]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, b'{"errors":[{"message":"Invalid JSON"}]}'
+        result = self.execute(payload.get("query", ""), payload.get("variables"))
+        out = json.dumps(result).encode()
+        with self._lock:
+            self.calls += 1
+            self.bytes_out += len(out)
+        return 200, out
+
+
+# --------------------------------------------------
+# Azure OpenAI stand-in
+# --------------------------------------------------
+class FakeOpenAI:
+    """Answers ``/openai/deployments/<name>/chat/completions`` with canned JSON."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls = 0
+
+    def handle_http(self, body: bytes) -> Tuple[int, bytes]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        content = json.dumps([
+            {"title": f"Recommendation {i} (call {n})", "link": f"https://example.com/rec/{n}/{i}"}
+            for i in range(5)
+        ])
+        out = {
+            "id": f"chatcmpl-{n}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "bench",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+        return 200, json.dumps(out).encode()
+
+
+class StandInServer:
+    """Serves a stand-in's ``handle_http`` over HTTP on a background thread."""
+
+    def __init__(self, target):
+        handler_target = target
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):  # noqa: N802 (http.server naming)
+                length = int(self.headers.get("Content-Length") or 0)
+                status, body = handler_target.handle_http(self.rfile.read(length))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # noqa: N802
+                # Health check (DAB answers GET / with its status); not counted
+                body = b'{"status":"Healthy"}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# --------------------------------------------------
+# Redis stand-in
+# --------------------------------------------------
+class InMemoryRedis:
+    """Thread-safe subset of the ``redis.Redis`` API used for sessions, leases and the reminder changes list."""
+
+    def __init__(self, *args, **kwargs):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lists: Dict[str, List[bytes]] = {}
+        self._lock = threading.Lock()
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.commands = 0
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.bytes_read = 0
+            self.bytes_written = 0
+            self.commands = 0
+
+    @staticmethod
+    def _to_bytes(value) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def ping(self) -> bool:
+        with self._lock:
+            self.commands += 1
+        return True
+
+    def get(self, key):
+        with self._lock:
+            self.commands += 1
+            entry = self._data.get(str(key))
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and time.time() > expires:
+                del self._data[str(key)]
+                return None
+            self.bytes_read += len(value)
+            return value
+
+    def set(self, key, value, ex=None, nx=False, **kwargs):
+        payload = self._to_bytes(value)
+        with self._lock:
+            self.commands += 1
+            if nx:
+                entry = self._data.get(str(key))
+                if entry is not None and (entry[1] is None or time.time() <= entry[1]):
+                    return None
+            self.bytes_written += len(payload)
+            self._data[str(key)] = (payload, time.time() + ex if ex else None)
+        return True
+
+    def setex(self, key, ttl, value):
+        ttl_seconds = ttl.total_seconds() if hasattr(ttl, "total_seconds") else ttl
+        return self.set(key, value, ex=ttl_seconds)
+
+    def expire(self, key, ttl):
+        with self._lock:
+            self.commands += 1
+            entry = self._data.get(str(key))
+            if entry is None:
+                return False
+            ttl_seconds = ttl.total_seconds() if hasattr(ttl, "total_seconds") else ttl
+            self._data[str(key)] = (entry[0], time.time() + ttl_seconds)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            self.commands += 1
+            removed = 0
+            for key in keys:
+                if self._data.pop(str(key), None) is not None:
+                    removed += 1
+            return removed
+
+    def rpush(self, key, *values):
+        payloads = [self._to_bytes(value) for value in values]
+        with self._lock:
+            self.commands += 1
+            self.bytes_written += sum(len(payload) for payload in payloads)
+            items = self._lists.setdefault(str(key), [])
+            items.extend(payloads)
+            return len(items)
+
+    def lpop(self, key, count=None):
+        with self._lock:
+            self.commands += 1
+            items = self._lists.get(str(key))
+            if not items:
+                return None
+            taken = items[:count or 1]
+            del items[:len(taken)]
+            self.bytes_read += sum(len(payload) for payload in taken)
+            return taken if count is not None else taken[0]
+
+    def exists(self, *keys):
+        with self._lock:
+            self.commands += 1
+            return sum(1 for k in keys if str(k) in self._data)
+
+
+# --------------------------------------------------
+# Auth stand-ins
+# --------------------------------------------------
+BENCH_USER_HEADER = "X-Bench-User"
+
+
+class FakeAuth:
+    """Replacement for ``identity.web.Auth`` keyed off a request header."""
+
+    def __init__(self, *, session=None, authority=None, client_id=None, client_credential=None, http_cache=None):
+        self._session = session
+
+    def get_user(self):
+        from flask import request
+        oid = request.headers.get(BENCH_USER_HEADER)
+        if not oid:
+            return None
+        return {"oid": oid, "name": f"Bench User {oid[:8]}"}
+
+    def get_token_for_user(self, scopes):
+        return {"access_token": "bench-user-token", "expires_in": 3600}
+
+    def log_in(self, scopes=None, redirect_uri=None, state=None, prompt=None):
+        return {"auth_uri": "https://login.invalid/authorize"}
+
+    def complete_log_in(self, auth_response=None):
+        return {}
+
+    def log_out(self, homepage):
+        return homepage
+
+
+class FakeConfidentialClient:
+    """Replacement for ``msal.ConfidentialClientApplication``."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def acquire_token_for_client(self, scopes):
+        return {"access_token": "bench-app-token", "expires_in": 3600}
+
+
+class FakeCredential:
+    """Replacement for azure-identity credentials returning a static token."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_token(self, *scopes, **kwargs):
+        from azure.core.credentials import AccessToken
+        return AccessToken("bench-credential-token", int(time.time()) + 3600)
+
+    def close(self):
+        pass
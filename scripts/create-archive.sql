@@ -0,0 +1,114 @@
+-- Archive tier for completed todos (idempotent; safe to re-run)
+-- Completed todos older than a cutoff move from dbo.todo to dbo.todo_archive, so
+-- list queries, the app's per-user cache and the list version only cover active
+-- work. dbo.todo.completed_at records when an item was completed (kept by a
+-- trigger, so every writer is covered), and dbo.archive_completed_todos moves
+-- the rows in batches. DAB exposes the archive read-only and the procedure as
+-- the executearchive_completed_todos mutation.
+
+IF COL_LENGTH('dbo.todo', 'completed_at') IS NULL
+BEGIN
+    PRINT 'Adding column dbo.todo.completed_at';
+    ALTER TABLE dbo.todo ADD completed_at DATETIME2 NULL;
+END
+ELSE
+BEGIN
+    PRINT 'Column dbo.todo.completed_at already exists – skipping add.';
+END
+
+-- Statements that reference completed_at run through EXEC so they compile after
+-- the column exists and the script stays a single batch
+
+-- Items completed before completed_at existed start ageing from now
+EXEC('UPDATE dbo.todo SET completed_at = SYSUTCDATETIME() WHERE completed = 1 AND completed_at IS NULL');
+
+PRINT 'Creating or altering trigger dbo.TR_todo_completed_at';
+EXEC('CREATE OR ALTER TRIGGER dbo.TR_todo_completed_at ON dbo.todo AFTER INSERT, UPDATE AS
+BEGIN
+    SET NOCOUNT ON;
+    IF NOT UPDATE(completed) RETURN;
+    -- Only rows whose completed flag actually changed; re-saving a completed item keeps its date
+    UPDATE t
+    SET completed_at = CASE WHEN i.completed = 1 THEN SYSUTCDATETIME() END
+    FROM dbo.todo t
+    JOIN inserted i ON i.id = t.id
+    LEFT JOIN deleted d ON d.id = i.id
+    WHERE i.completed <> ISNULL(d.completed, 0);
+END');
+
+-- The archive job reads only completed rows, oldest completion first
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_todo_completed_at' AND object_id = OBJECT_ID('dbo.todo'))
+BEGIN
+    PRINT 'Creating index IX_todo_completed_at';
+    EXEC('CREATE NONCLUSTERED INDEX IX_todo_completed_at ON dbo.todo (completed_at, oid) WHERE completed = 1 WITH (ONLINE = ON)');
+END
+ELSE
+BEGIN
+    PRINT 'Index IX_todo_completed_at already exists – skipping create.';
+END
+
+-- Archived rows keep their original id; there is no IDENTITY, trigger or foreign
+-- key, so the procedure can OUTPUT deleted rows straight into it
+IF NOT EXISTS (SELECT 1 FROM sys.tables t JOIN sys.schemas s ON t.schema_id = s.schema_id WHERE t.name = 'todo_archive' AND s.name = 'dbo')
+BEGIN
+    PRINT 'Creating table dbo.todo_archive';
+    CREATE TABLE dbo.todo_archive (
+        id INT NOT NULL PRIMARY KEY,
+        name NVARCHAR(100) NOT NULL,
+        recommendations_json NVARCHAR(MAX) NULL,
+        notes NVARCHAR(100) NULL,
+        priority INT NOT NULL,
+        completed BIT NOT NULL,
+        due_date NVARCHAR(50) NULL,
+        oid NVARCHAR(50) NULL,
+        completed_at DATETIME2 NULL,
+        archived_at DATETIME2 NOT NULL CONSTRAINT DF_todo_archive_archived_at DEFAULT(SYSUTCDATETIME())
+    );
+END
+ELSE
+BEGIN
+    PRINT 'Table dbo.todo_archive already exists – skipping create.';
+END
+
+-- Archived view pages: one user's rows, most recently completed first
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_todo_archive_oid_completed_at' AND object_id = OBJECT_ID('dbo.todo_archive'))
+BEGIN
+    PRINT 'Creating index IX_todo_archive_oid_completed_at';
+    CREATE NONCLUSTERED INDEX IX_todo_archive_oid_completed_at
+        ON dbo.todo_archive (oid, completed_at DESC, id)
+        INCLUDE (name, notes, priority, due_date, archived_at)
+        WITH (ONLINE = ON);
+END
+ELSE
+BEGIN
+    PRINT 'Index IX_todo_archive_oid_completed_at already exists – skipping create.';
+END
+
+-- Moves completed todos older than @older_than_days (one user's, or everyone's
+-- when @oid is NULL) in transactions of @batch_size rows, so a large backlog
+-- never holds long locks on dbo.todo. Returns one row with the number moved.
+PRINT 'Creating or altering procedure dbo.archive_completed_todos';
+EXEC('CREATE OR ALTER PROCEDURE dbo.archive_completed_todos
+    @older_than_days INT,
+    @oid NVARCHAR(50) = NULL,
+    @batch_size INT = 1000
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @cutoff DATETIME2 = DATEADD(DAY, -@older_than_days, SYSUTCDATETIME());
+    DECLARE @archived INT = 0, @moved INT = 1;
+    WHILE @moved > 0
+    BEGIN
+        BEGIN TRANSACTION;
+        DELETE TOP (@batch_size) FROM dbo.todo
+        OUTPUT deleted.id, deleted.name, deleted.recommendations_json, deleted.notes, deleted.priority,
+               deleted.completed, deleted.due_date, deleted.oid, deleted.completed_at
+        INTO dbo.todo_archive (id, name, recommendations_json, notes, priority, completed, due_date, oid, completed_at)
+        WHERE completed = 1 AND completed_at < @cutoff AND (@oid IS NULL OR oid = @oid)
+        OPTION (RECOMPILE);
+        SET @moved = @@ROWCOUNT;
+        COMMIT TRANSACTION;
+        SET @archived += @moved;
+    END
+    SELECT @archived AS archived;
+END');
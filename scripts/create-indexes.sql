@@ -0,0 +1,93 @@
+-- Indexes for per-user todo queries (idempotent; safe to re-run)
+-- Every list query from the app filters on oid and pages with DAB keyset
+-- cursors ordered by completed, priority_rank, due_date_sort and then id. Without an
+-- index on oid each of those queries scans the whole dbo.todo table.
+-- recommendations_json and notes are deliberately not included: list pages
+-- never select them (see TODO_FIELD_SETS in app/services/api_client.py).
+
+-- Seek on oid for queries in primary key order (DAB's default order)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_todo_oid' AND object_id = OBJECT_ID('dbo.todo'))
+BEGIN
+    PRINT 'Creating index IX_todo_oid';
+    CREATE NONCLUSTERED INDEX IX_todo_oid
+        ON dbo.todo (oid, id)
+        INCLUDE (name, priority, completed, due_date)
+        WITH (ONLINE = ON);
+END
+ELSE
+BEGIN
+    PRINT 'Index IX_todo_oid already exists – skipping create.';
+END
+
+-- priority 0 means "no priority" and sorts after LOW (3): the list orders by
+-- this persisted rank instead of priority itself. DAB exposes it read-only.
+-- app/services/views.py priority_rank() must compute the same value.
+IF COL_LENGTH('dbo.todo', 'priority_rank') IS NULL
+BEGIN
+    PRINT 'Adding column dbo.todo.priority_rank';
+    ALTER TABLE dbo.todo ADD priority_rank AS (CASE WHEN priority = 0 THEN 4 ELSE priority END) PERSISTED;
+END
+ELSE
+BEGIN
+    PRINT 'Column dbo.todo.priority_rank already exists – skipping add.';
+END
+
+-- due_date is nullable, and DAB encodes the last row's value of every
+-- ordering column in its after cursor. Ordering on this NOT NULL copy instead
+-- (a missing date becomes '', which still sorts first) keeps NULL out of the
+-- cursor, so a page boundary between undated and dated todos can neither
+-- repeat nor skip rows. app/services/views.py sort_key() uses the same value.
+IF COL_LENGTH('dbo.todo', 'due_date_sort') IS NULL
+BEGIN
+    PRINT 'Adding column dbo.todo.due_date_sort';
+    ALTER TABLE dbo.todo ADD due_date_sort AS (ISNULL(due_date, N'')) PERSISTED NOT NULL;
+END
+ELSE
+BEGIN
+    PRINT 'Column dbo.todo.due_date_sort already exists – skipping add.';
+END
+
+-- Replaced by the priority_rank index below
+IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_todo_oid_completed_priority_due_date' AND object_id = OBJECT_ID('dbo.todo'))
+BEGIN
+    PRINT 'Dropping index IX_todo_oid_completed_priority_due_date';
+    DROP INDEX IX_todo_oid_completed_priority_due_date ON dbo.todo;
+END
+
+-- Replaced by the due_date_sort index below
+IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_todo_oid_completed_priority_rank_due_date' AND object_id = OBJECT_ID('dbo.todo'))
+BEGIN
+    PRINT 'Dropping index IX_todo_oid_completed_priority_rank_due_date';
+    DROP INDEX IX_todo_oid_completed_priority_rank_due_date ON dbo.todo;
+END
+
+-- Seek on oid already sorted for the list order, so a page reads only its own rows.
+-- Run through EXEC so it compiles after priority_rank and due_date_sort exist.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_todo_oid_completed_priority_rank_due_date_sort' AND object_id = OBJECT_ID('dbo.todo'))
+BEGIN
+    PRINT 'Creating index IX_todo_oid_completed_priority_rank_due_date_sort';
+    EXEC('CREATE NONCLUSTERED INDEX IX_todo_oid_completed_priority_rank_due_date_sort
+        ON dbo.todo (oid, completed, priority_rank, due_date_sort, id)
+        INCLUDE (name, priority, due_date)
+        WITH (ONLINE = ON)');
+END
+ELSE
+BEGIN
+    PRINT 'Index IX_todo_oid_completed_priority_rank_due_date_sort already exists – skipping create.';
+END
+
+-- Reminder loads (app/reminders.py) read open todos of every user in id
+-- order, filtered on due_date: seek on completed and walk the keyset in id
+-- order without touching the clustered index
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_todo_completed_id' AND object_id = OBJECT_ID('dbo.todo'))
+BEGIN
+    PRINT 'Creating index IX_todo_completed_id';
+    CREATE NONCLUSTERED INDEX IX_todo_completed_id
+        ON dbo.todo (completed, id)
+        INCLUDE (due_date, oid, name)
+        WITH (ONLINE = ON);
+END
+ELSE
+BEGIN
+    PRINT 'Index IX_todo_completed_id already exists – skipping create.';
+END
@@ -0,0 +1,49 @@
+-- Stored procedures the app calls through DAB (idempotent; safe to re-run)
+
+-- Sets a todo's completed flag only if it belongs to @oid, so the checkbox is a
+-- single owner-scoped write with no read beforehand. Returns the updated row
+-- (the list columns) together with the owner's list version after the update
+-- (dbo.todo_version, see create-version-view.sql), so the app's cache can stay
+-- current without another read; no row when the id does not exist or is not
+-- the caller's. OUTPUT goes through a table variable because a plain OUTPUT clause
+-- is not allowed on a table with triggers (see create-archive.sql).
+PRINT 'Creating or altering procedure dbo.set_todo_completed';
+EXEC('CREATE OR ALTER PROCEDURE dbo.set_todo_completed
+    @id INT,
+    @oid NVARCHAR(50),
+    @completed BIT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @updated TABLE (id INT, name NVARCHAR(100), priority INT, completed BIT, due_date NVARCHAR(50));
+    UPDATE dbo.todo
+    SET completed = @completed
+    OUTPUT inserted.id, inserted.name, inserted.priority, inserted.completed, inserted.due_date INTO @updated
+    WHERE id = @id AND oid = @oid;
+    SELECT u.id, u.name, u.priority, u.completed, u.due_date, v.max_version, v.todo_count
+    FROM @updated u
+    CROSS JOIN dbo.todo_version v
+    WHERE v.oid = @oid;
+END');
+
+-- Number of @oid's todos in each list group on @today (YYYY-MM-DD), with the
+-- same rules as app/services/views.py todo_group: completed first, then no due
+-- date, overdue, due today and upcoming. The list is loaded a page at a time,
+-- so the group headings take their counts from here rather than from the rows
+-- loaded so far. Reads the IX_todo_oid_completed_priority_rank_due_date_sort index.
+PRINT 'Creating or altering procedure dbo.todo_group_counts';
+EXEC('CREATE OR ALTER PROCEDURE dbo.todo_group_counts
+    @oid NVARCHAR(50),
+    @today NVARCHAR(10)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SELECT
+        COUNT(CASE WHEN completed = 0 AND due_date <> '''' AND due_date < @today THEN 1 END) AS overdue,
+        COUNT(CASE WHEN completed = 0 AND due_date = @today THEN 1 END) AS today,
+        COUNT(CASE WHEN completed = 0 AND due_date > @today THEN 1 END) AS upcoming,
+        COUNT(CASE WHEN completed = 0 AND (due_date IS NULL OR due_date = '''') THEN 1 END) AS no_date,
+        COUNT(CASE WHEN completed = 1 THEN 1 END) AS completed
+    FROM dbo.todo
+    WHERE oid = @oid;
+END');
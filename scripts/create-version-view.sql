@@ -0,0 +1,39 @@
+-- Change detection for per-user todo lists (idempotent; safe to re-run)
+-- row_version changes on every insert and update of a row and the row count
+-- changes on delete, so (max version, count) for an oid changes whenever that
+-- user's list does. The dbo.todo_version view exposes both through DAB so the
+-- app can revalidate a cached list with one small query instead of refetching it.
+
+IF COL_LENGTH('dbo.todo', 'row_version') IS NULL
+BEGIN
+    PRINT 'Adding column dbo.todo.row_version';
+    ALTER TABLE dbo.todo ADD row_version ROWVERSION NOT NULL;
+END
+ELSE
+BEGIN
+    PRINT 'Column dbo.todo.row_version already exists – skipping add.';
+END
+
+-- Statements that reference row_version or create the view run through EXEC so
+-- they compile after the column exists and the script stays a single batch
+
+-- MAX and COUNT for one oid read only this index's range for that oid
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_todo_oid_row_version' AND object_id = OBJECT_ID('dbo.todo'))
+BEGIN
+    PRINT 'Creating index IX_todo_oid_row_version';
+    EXEC('CREATE NONCLUSTERED INDEX IX_todo_oid_row_version ON dbo.todo (oid, row_version) WITH (ONLINE = ON)');
+END
+ELSE
+BEGIN
+    PRINT 'Index IX_todo_oid_row_version already exists – skipping create.';
+END
+
+PRINT 'Creating or altering view dbo.todo_version';
+EXEC('CREATE OR ALTER VIEW dbo.todo_version AS
+    SELECT
+        oid,
+        CONVERT(BIGINT, MAX(row_version)) AS max_version,
+        COUNT_BIG(*) AS todo_count
+    FROM dbo.todo
+    WHERE oid IS NOT NULL
+    GROUP BY oid');
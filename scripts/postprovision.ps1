@@ -197,8 +197,70 @@ try {
     $tableSql = Get-Content -Path $createTableSqlPath -Raw
     $cmd.CommandText = $tableSql
     $null = $cmd.ExecuteNonQuery()
-    $conn.Close()
     Write-Output "Created tables."
+
+    # ---------------------------------------------------------------------
+    # Load and execute SQL to create indexes (idempotent migration)
+    # ---------------------------------------------------------------------
+    $createIndexSqlPath = Join-Path $PSScriptRoot 'create-indexes.sql'
+    if (-not (Test-Path $createIndexSqlPath)) {
+        Write-Error "SQL script not found: $createIndexSqlPath"
+        $conn.Close()
+        exit 1
+    }
+
+    $indexSql = Get-Content -Path $createIndexSqlPath -Raw
+    $cmd.CommandText = $indexSql
+    # Online index builds on a large table can outlast the 30 second default
+    $cmd.CommandTimeout = 600
+    $null = $cmd.ExecuteNonQuery()
+    Write-Output "Created indexes."
+
+    # ---------------------------------------------------------------------
+    # Load and execute SQL for list change detection (row_version + view)
+    # ---------------------------------------------------------------------
+    $versionSqlPath = Join-Path $PSScriptRoot 'create-version-view.sql'
+    if (-not (Test-Path $versionSqlPath)) {
+        Write-Error "SQL script not found: $versionSqlPath"
+        $conn.Close()
+        exit 1
+    }
+
+    $versionSql = Get-Content -Path $versionSqlPath -Raw
+    $cmd.CommandText = $versionSql
+    $null = $cmd.ExecuteNonQuery()
+    Write-Output "Created version view."
+
+    # ---------------------------------------------------------------------
+    # Load and execute SQL for the stored procedures the app calls
+    # ---------------------------------------------------------------------
+    $proceduresSqlPath = Join-Path $PSScriptRoot 'create-procedures.sql'
+    if (-not (Test-Path $proceduresSqlPath)) {
+        Write-Error "SQL script not found: $proceduresSqlPath"
+        $conn.Close()
+        exit 1
+    }
+
+    $proceduresSql = Get-Content -Path $proceduresSqlPath -Raw
+    $cmd.CommandText = $proceduresSql
+    $null = $cmd.ExecuteNonQuery()
+    Write-Output "Created stored procedures."
+
+    # ---------------------------------------------------------------------
+    # Load and execute SQL for the archive tier (table, trigger, procedure)
+    # ---------------------------------------------------------------------
+    $archiveSqlPath = Join-Path $PSScriptRoot 'create-archive.sql'
+    if (-not (Test-Path $archiveSqlPath)) {
+        Write-Error "SQL script not found: $archiveSqlPath"
+        $conn.Close()
+        exit 1
+    }
+
+    $archiveSql = Get-Content -Path $archiveSqlPath -Raw
+    $cmd.CommandText = $archiveSql
+    $null = $cmd.ExecuteNonQuery()
+    $conn.Close()
+    Write-Output "Created archive table and procedure."
 }
 catch {
     Write-Error "Failed to execute T-SQL for managed identity via ADO.NET: $($_.Exception.Message)"